@@ -0,0 +1,317 @@
+"""
+Page render benchmarks for dashboard/app.py at several synthetic dataset sizes, driven through AppTest.
+
+Usage:
+    python benchmarks/bench.py run --out benchmarks/baselines/local.json
+    python benchmarks/bench.py compare benchmarks/baselines/local.json /tmp/current.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DASHBOARD_DIR = REPO_ROOT / "dashboard"
+APP_PATH = DASHBOARD_DIR / "app.py"
+BASELINE_DIR = REPO_ROOT / "benchmarks" / "baselines"
+SYNTHETIC_DIR = Path(tempfile.gettempdir()) / "ci-bench-data"
+
+DEFAULT_SIZES = [3, 300, 30000]
+SYNTHETIC_YEARS = [2022, 2023, 2024]
+SYNTHETIC_REGIONS = ["North America", "Europe", "Asia Pacific", "Latin America"]
+# Bumped whenever the generated columns change, so cached datasets are rewritten
+SYNTHETIC_FORMAT = 2
+TRACKED_FIRMS = ["BlackRock", "State Street", "Invesco"]
+RISK_COLUMNS = ["Regulatory", "Market", "Interest Rate", "Operational/Tech", "Fee Pressure"]
+
+# Changes smaller than these absolute amounts are noise, whatever the relative change
+NOISE_FLOOR = {"cold_ms": 10.0, "warm_ms": 5.0, "peak_kb": 256.0, "payload_bytes": 1024.0}
+
+
+# ----------------------------------------------------
+# SYNTHETIC DATASETS
+# ----------------------------------------------------
+def synthetic_dataset(n_firms, seed=0):
+    """Write facts/companies/risk_scores parquet files for n firms, reused across runs."""
+    out_dir = SYNTHETIC_DIR / f"{n_firms}-{seed}-v{SYNTHETIC_FORMAT}"
+    if (out_dir / "facts.parquet").exists():
+        return out_dir
+    rng = np.random.default_rng(seed)
+    names = (TRACKED_FIRMS + [f"Firm {i:05d}" for i in range(len(TRACKED_FIRMS), n_firms)])[:n_firms]
+
+    # USD millions, AUM is lognormal around $100bn and grows a few % a year
+    aum = rng.lognormal(np.log(1e5), 1.2, n_firms)
+    mix = rng.dirichlet([5, 4, 1, 2, 1], n_firms)  # equity, fixed income, multi-asset, cash, alternatives
+    frames = []
+    for i, year in enumerate(SYNTHETIC_YEARS):
+        total = aum * (1 + rng.normal(0.05, 0.08, n_firms)) ** i
+        revenue = total * rng.uniform(0.001, 0.006, n_firms)
+        net_income = revenue * rng.uniform(0.05, 0.35, n_firms)
+        total_assets = revenue * rng.uniform(3, 8, n_firms)
+        metrics = {
+            "aum_total": total,
+            "aum_etf": total * rng.uniform(0, 0.4, n_firms),
+            "aum_equity": total * mix[:, 0],
+            "aum_fixed_income": total * mix[:, 1],
+            "aum_multi_asset": total * mix[:, 2],
+            "aum_cash": total * mix[:, 3],
+            "aum_alternatives": total * mix[:, 4],
+            "revenue": revenue,
+            "operating_income": revenue * rng.uniform(0.1, 0.45, n_firms),
+            "net_income": net_income,
+            "total_assets": total_assets,
+            "equity": total_assets * rng.uniform(0.2, 0.6, n_firms),
+        }
+        for metric, values in metrics.items():
+            frames.append(
+                pd.DataFrame({"company": names, "fiscal_year": year, "metric": metric, "value": values})
+            )
+    facts = pd.concat(frames, ignore_index=True)
+    facts["fiscal_year"] = facts["fiscal_year"].astype("int32")
+    facts["unit"] = "USD millions"
+    facts["source"] = "synthetic"
+    facts["page"] = pd.array([None] * len(facts), dtype="Int32")
+
+    companies = pd.DataFrame(
+        {
+            "Company": names,
+            "Tech_Score": rng.integers(1, 11, n_firms),
+            "Fee_Level": rng.choice(["Low–Mid", "Competitive", "Mid-range"], n_firms),
+            "Model": "Asset manager",
+        }
+    )
+    risk_scores = pd.DataFrame(rng.integers(1, 6, (n_firms, len(RISK_COLUMNS))), columns=RISK_COLUMNS)
+    risk_scores.insert(0, "Company", names)
+    # Drawn last so the other columns match datasets written before regions existed
+    companies["Region"] = rng.choice(SYNTHETIC_REGIONS, n_firms)
+
+    tmp_dir = out_dir.with_name(out_dir.name + ".tmp")
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    facts.to_parquet(tmp_dir / "facts.parquet", index=False)
+    companies.to_parquet(tmp_dir / "companies.parquet", index=False)
+    risk_scores.to_parquet(tmp_dir / "risk_scores.parquet", index=False)
+    tmp_dir.rename(out_dir)
+    return out_dir
+
+
+# ----------------------------------------------------
+# RUNNING ONE DATASET SIZE
+# ----------------------------------------------------
+def _payload_bytes(at):
+    return sum(len(el.proto.figure.spec) for el in at.get("plotly_chart"))
+
+
+class StepTimeout(Exception):
+    pass
+
+
+def _bench_size(n_firms, repeat, max_options, step_timeout):
+    os.environ["CI_PROCESSED_DIR"] = str(synthetic_dataset(n_firms))
+    sys.path.insert(0, str(DASHBOARD_DIR))
+    from streamlit.testing.v1 import AppTest
+
+    import loader
+    from sharedcache import CACHE
+
+    at = AppTest.from_file(str(APP_PATH), default_timeout=step_timeout)
+    results = {}
+
+    def step(name, action, cold_datasets=False):
+        try:
+            measure(name, action, cold_datasets)
+        except RuntimeError as exc:
+            if "timed out" not in str(exc):
+                raise
+            # The script thread cannot be stopped and would skew every later step
+            results[name] = {"error": f"timed out after {step_timeout:g}s"}
+            print(f"  {name}: timed out after {step_timeout:g}s, skipping the remaining steps", file=sys.stderr)
+            raise StepTimeout from exc
+
+    def measure(name, action, cold_datasets):
+        def reset():
+            if cold_datasets:
+                loader.clear_caches()
+            # Views, frames, figures, tables, indexes and simulations are all rebuilt
+            CACHE.discard_unpinned()
+
+        reset()
+        started = time.perf_counter()
+        action()
+        cold_ms = (time.perf_counter() - started) * 1000
+        if at.exception:
+            results[name] = {"error": str(at.exception[0].message)}
+            print(f"  {name}: ERROR {at.exception[0].message}", file=sys.stderr)
+            return
+        payload = _payload_bytes(at)
+
+        warm = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            at.run()
+            warm.append((time.perf_counter() - started) * 1000)
+
+        reset()
+        tracemalloc.start()
+        try:
+            at.run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        results[name] = {
+            "cold_ms": round(cold_ms, 2),
+            "warm_ms": round(statistics.median(warm), 2),
+            "peak_kb": round(peak / 1024, 1),
+            "payload_bytes": payload,
+        }
+        print(f"  {name}: {cold_ms:.0f} ms cold, {results[name]['warm_ms']:.0f} ms warm", file=sys.stderr)
+
+    try:
+        step("startup", at.run, cold_datasets=True)
+        pages = list(at.sidebar.radio[0].options)
+        for page in pages:
+            step(page, lambda: at.sidebar.radio[0].set_value(page).run())
+            for i in range(len(at.main.selectbox)):
+                box = at.main.selectbox[i]
+                label, options = box.label, list(box.options)
+                # By position: options are display strings, which set_value rejects with a format_func
+                for j, option in enumerate(options[1:max_options], start=1):
+                    step(f"{page} › {label} = {option}", lambda: at.main.selectbox[i].select_index(j).run())
+                if len(options) > 1:
+                    at.main.selectbox[i].select_index(0).run()
+
+        at.sidebar.radio[0].set_value(pages[0]).run()
+        years = list(at.sidebar.selectbox[0].options)
+        for year in years[:-1]:
+            step(f"Fiscal year = {year}", lambda: at.sidebar.selectbox[0].set_value(year).run())
+    except StepTimeout:
+        pass
+
+    return {
+        "firms": n_firms,
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "steps": results,
+    }
+
+
+def run(sizes, repeat, max_options, step_timeout):
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "repeat": repeat,
+            "max_options": max_options,
+            "step_timeout": step_timeout,
+        },
+        "sizes": {},
+    }
+    for n_firms in sizes:
+        print(f"{n_firms} firms", file=sys.stderr)
+        cmd = [
+            sys.executable, str(Path(__file__).resolve()), "_size", str(n_firms),
+            "--repeat", str(repeat), "--max-options", str(max_options), "--step-timeout", str(step_timeout),
+        ]
+        out = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, text=True).stdout
+        report["sizes"][str(n_firms)] = json.loads(out.strip().splitlines()[-1])
+    return report
+
+
+# ----------------------------------------------------
+# COMPARING AGAINST A BASELINE
+# ----------------------------------------------------
+def compare(baseline, current, threshold):
+    """(size, step, metric, old, new) for every metric that got worse by more than threshold,
+    every step that now fails and every baseline size or step missing from current."""
+    regressions = []
+    for size, base in baseline["sizes"].items():
+        cur = current["sizes"].get(size)
+        if cur is None:
+            regressions.append((size, "(all steps)", "missing", None, None))
+            continue
+        for name, old in base["steps"].items():
+            new = cur["steps"].get(name)
+            if "error" in old:
+                continue
+            # A renamed or crashed page must not pass the gate
+            if new is None:
+                regressions.append((size, name, "missing", None, None))
+                continue
+            if "error" in new:
+                regressions.append((size, name, "error", None, new["error"]))
+                continue
+            for metric, floor in NOISE_FLOOR.items():
+                if new[metric] - old[metric] > max(floor, old[metric] * threshold):
+                    regressions.append((size, name, metric, old[metric], new[metric]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard page renders on synthetic datasets.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_cmd = sub.add_parser("run", help="run the suite and write a JSON report")
+    run_cmd.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    run_cmd.add_argument("--repeat", type=int, default=3, help="warm reruns per step (default: %(default)s)")
+    run_cmd.add_argument("--max-options", type=int, default=3, help="selectbox options per box (default: %(default)s)")
+    run_cmd.add_argument("--step-timeout", type=float, default=120, help="seconds per render (default: %(default)s)")
+    run_cmd.add_argument("--out", type=Path, default=BASELINE_DIR / "local.json")
+
+    cmp_cmd = sub.add_parser("compare", help="flag regressions of a report against a baseline")
+    cmp_cmd.add_argument("baseline", type=Path)
+    cmp_cmd.add_argument("current", type=Path)
+    cmp_cmd.add_argument("--threshold", type=float, default=0.25, help="relative slowdown to flag (default: %(default)s)")
+
+    size_cmd = sub.add_parser("_size")
+    size_cmd.add_argument("firms", type=int)
+    size_cmd.add_argument("--repeat", type=int, default=3)
+    size_cmd.add_argument("--max-options", type=int, default=3)
+    size_cmd.add_argument("--step-timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    if args.command == "_size":
+        print(json.dumps(_bench_size(args.firms, args.repeat, args.max_options, args.step_timeout)), flush=True)
+        # A timed-out script thread may still be running
+        os._exit(0)
+
+    if args.command == "run":
+        report = run(args.sizes, args.repeat, args.max_options, args.step_timeout)
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote {args.out}")
+        return
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    current = json.loads(args.current.read_text(encoding="utf-8"))
+    regressions = compare(baseline, current, args.threshold)
+    for size, name, metric, old, new in regressions:
+        if metric == "error":
+            print(f"REGRESSION {size} firms · {name}: now fails ({new})")
+        elif metric == "missing":
+            print(f"REGRESSION {size} firms · {name}: missing from {args.current}")
+        elif old == 0:
+            print(f"REGRESSION {size} firms · {name}: {metric} {old:g} -> {new:g} ({new - old:+g})")
+        else:
+            print(f"REGRESSION {size} firms · {name}: {metric} {old:g} -> {new:g} ({(new / old - 1) * 100:+.0f}%)")
+    if regressions:
+        sys.exit(1)
+    print(f"No regressions above {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Heatmap ordering and k-means peer groups for large firms x categories matrices.
+"""
+
+import hashlib
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from sharedcache import cached
+
+
+# Rows drawn one by one; larger matrices are shown as peer-group tiles
+HEATMAP_MAX_ROWS = 60
+PEER_GROUPS = 24
+# Above this many rows, hierarchical clustering (O(n^3)) is replaced by ordering
+# along the first principal component
+MAX_LINKAGE_ROWS = 1000
+
+
+def _pairwise_distances(x):
+    sq = np.einsum("ij,ij->i", x, x)
+    d2 = sq[:, None] + sq[None, :] - 2 * x @ x.T
+    return np.sqrt(np.maximum(d2, 0))
+
+
+def linkage_order(x):
+    """Leaf order of average-linkage agglomerative clustering of the rows of x."""
+    n = len(x)
+    if n <= 2:
+        return np.arange(n)
+    if n > MAX_LINKAGE_ROWS:
+        return principal_order(x)
+    dist = _pairwise_distances(x)
+    np.fill_diagonal(dist, np.inf)
+    sizes = np.ones(n)
+    leaves = [[i] for i in range(n)]
+    for _ in range(n - 1):
+        i, j = divmod(int(np.argmin(dist)), n)
+        # Lance-Williams update for average linkage: the merged cluster keeps slot i
+        merged = (sizes[i] * dist[i] + sizes[j] * dist[j]) / (sizes[i] + sizes[j])
+        dist[i, :] = merged
+        dist[:, i] = merged
+        dist[i, i] = np.inf
+        dist[j, :] = np.inf
+        dist[:, j] = np.inf
+        sizes[i] += sizes[j]
+        leaves[i] = leaves[i] + leaves[j]
+        leaves[j] = None
+    return np.asarray(next(leaf for leaf in leaves if leaf is not None))
+
+
+def principal_order(x):
+    """Rows sorted by their projection on the first principal component."""
+    centered = x - x.mean(axis=0)
+    _, _, vt = np.linalg.svd(centered, full_matrices=False)
+    return np.argsort(centered @ vt[0], kind="stable")
+
+
+def kmeans(x, k, iterations=25, seed=0):
+    """(labels, centroids) of Lloyd's k-means with k-means++ seeding, deterministic per seed."""
+    n = len(x)
+    k = min(k, n)
+    rng = np.random.default_rng(seed)
+    centroids = np.empty((k, x.shape[1]))
+    centroids[0] = x[rng.integers(n)]
+    closest = ((x - centroids[0]) ** 2).sum(axis=1)
+    for c in range(1, k):
+        total = closest.sum()
+        pick = rng.choice(n, p=closest / total) if total > 0 else rng.integers(n)
+        centroids[c] = x[pick]
+        closest = np.minimum(closest, ((x - centroids[c]) ** 2).sum(axis=1))
+
+    labels = np.zeros(n, dtype=np.int64)
+    for step in range(iterations):
+        d2 = (x**2).sum(axis=1)[:, None] - 2 * x @ centroids.T + (centroids**2).sum(axis=1)[None, :]
+        new_labels = np.argmin(d2, axis=1)
+        if step and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, x)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+
+    # Drop empty groups and renumber by size, largest first
+    counts = np.bincount(labels, minlength=k)
+    by_size = [g for g in np.argsort(-counts, kind="stable") if counts[g] > 0]
+    remap = np.full(k, -1)
+    remap[by_size] = np.arange(len(by_size))
+    return remap[labels], centroids[by_size]
+
+
+# ----------------------------------------------------
+# HEATMAP LAYOUT
+# ----------------------------------------------------
+@dataclass(frozen=True)
+class HeatmapLayout:
+    """Display order of a score matrix, optionally aggregated into peer groups."""
+
+    version: str
+    col_order: np.ndarray
+    # Row positions in display order when the matrix is shown row by row
+    row_order: np.ndarray = None
+    # Peer group of every row and the group ids in display order, when aggregated
+    groups: np.ndarray = None
+    group_order: np.ndarray = None
+    group_means: np.ndarray = None
+
+    @property
+    def aggregated(self):
+        return self.groups is not None
+
+    @property
+    def group_sizes(self):
+        return np.bincount(self.groups)
+
+    def members(self, group, values):
+        """Row positions of a peer group, clustered on first access and cached with the layout."""
+
+        def build():
+            rows = np.flatnonzero(self.groups == group)
+            return rows[linkage_order(values[rows])]
+
+        return cached("layouts", (self.version, "members", int(group)), build)
+
+
+def peer_group_label(group, size):
+    return f"Peer group {group + 1} ({size:,} firms)"
+
+
+def matrix_version(matrix):
+    digest = hashlib.sha1(pd.util.hash_pandas_object(matrix, index=True).values.tobytes())
+    digest.update("\x1f".join(map(str, matrix.columns)).encode())
+    return digest.hexdigest()[:12]
+
+
+def filled_values(matrix):
+    # Missing scores take the category mean so they do not dominate distances
+    values = matrix.to_numpy(dtype=float)
+    means = np.nanmean(values, axis=0) if len(values) else np.zeros(values.shape[1])
+    return np.where(np.isnan(values), np.nan_to_num(means)[None, :], values)
+
+
+def _build_layout(version, matrix):
+    values = filled_values(matrix)
+    if len(values) <= HEATMAP_MAX_ROWS:
+        col_order = linkage_order(values.T) if len(values) else np.arange(values.shape[1])
+        return HeatmapLayout(version=version, col_order=col_order, row_order=linkage_order(values))
+
+    groups, centroids = kmeans(values, PEER_GROUPS)
+    return HeatmapLayout(
+        version=version,
+        col_order=linkage_order(centroids.T),
+        groups=groups,
+        group_order=linkage_order(centroids),
+        group_means=centroids,
+    )
+
+
+def heatmap_layout(matrix):
+    """Clustered layout of a firms x categories matrix, cached per content hash."""
+    version = matrix_version(matrix)
+    return cached("layouts", version, lambda: _build_layout(version, matrix))
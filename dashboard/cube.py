@@ -0,0 +1,150 @@
+"""
+Dense AUM cube by firm, asset class and fiscal year, with region as a firm attribute.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Fact-store metric: display name, in stacking order
+ASSET_CLASSES = {
+    "aum_equity": "Equity",
+    "aum_fixed_income": "Fixed Income",
+    "aum_multi_asset": "Multi-Asset",
+    "aum_cash": "Cash / Money Market",
+    "aum_alternatives": "Alternatives",
+}
+
+# Firms without a Region in companies.csv
+UNASSIGNED_REGION = "Unassigned"
+
+
+def _group_sum(codes, n_groups, values):
+    """Sum of values along the first axis per group code."""
+    out = np.zeros((n_groups,) + values.shape[1:])
+    np.add.at(out, codes, values)
+    return out
+
+
+class AumCube:
+    def __init__(self, values, companies, years, regions, region_codes, asset_classes=None):
+        self.values = values
+        self.companies = np.asarray(companies, dtype=object)
+        self.asset_classes = np.asarray(
+            list(ASSET_CLASSES.values()) if asset_classes is None else asset_classes, dtype=object
+        )
+        self.years = np.asarray(years)
+        self.regions = np.asarray(regions, dtype=object)
+        self.region_codes = np.asarray(region_codes, dtype=np.intp)
+        self.company_index = pd.Index(self.companies)
+        self.values.flags.writeable = False
+
+        # Marginals: every roll-up of the whole universe is a lookup
+        self.firm_totals = values.sum(axis=1)
+        self.asset_totals = values.sum(axis=0)
+        self.region_totals = _group_sum(self.region_codes, len(self.regions), values)
+        self.year_totals = self.asset_totals.sum(axis=0)
+
+    @classmethod
+    def from_store(cls, store, company_info):
+        """Cube over every firm and year of a fact store; missing AUM facts count as zero."""
+        metrics = list(ASSET_CLASSES)
+        codes = store.metric_index.get_indexer(metrics)
+        values = np.zeros((len(store.companies), len(metrics), len(store.years)))
+        present = codes >= 0
+        # (companies, years, metrics) -> (companies, metrics, years)
+        values[:, present] = np.nan_to_num(store.values[:, :, codes[present]]).transpose(0, 2, 1)
+
+        region = pd.Series(UNASSIGNED_REGION, index=store.companies, dtype=object)
+        if "Region" in company_info:
+            info = company_info["Region"]
+            info = info[~info.index.duplicated(keep="last")].reindex(store.companies)
+            region = info.fillna(UNASSIGNED_REGION).astype(str)
+        region_codes, regions = pd.factorize(region.to_numpy(), sort=True)
+        return cls(values, store.companies, store.years, regions, region_codes)
+
+    def __len__(self):
+        """Number of firm-years with any AUM."""
+        return int((self.firm_totals > 0).sum())
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    # ----------------------------------------------------
+    # AXIS LOOKUPS
+    # ----------------------------------------------------
+    def year_position(self, year):
+        y = int(np.searchsorted(self.years, year))
+        if y >= len(self.years) or self.years[y] != year:
+            raise KeyError(f"Fiscal year {year} is not in the cube")
+        return y
+
+    def company_codes(self, companies):
+        codes = self.company_index.get_indexer(list(companies))
+        return codes[codes >= 0]
+
+    def _members(self, labels, selected):
+        if selected is None:
+            return slice(None)
+        return pd.Index(labels).get_indexer(list(selected))
+
+    # ----------------------------------------------------
+    # SLICE / DICE / ROLL-UP
+    # ----------------------------------------------------
+    def slice_year(self, year):
+        """(firms, asset classes) view of one fiscal year, no copy."""
+        return self.values[:, :, self.year_position(year)]
+
+    def dice(self, companies=None, asset_classes=None, years=None):
+        """Sub-cube restricted to the given members of each dimension."""
+        c = slice(None) if companies is None else self.company_codes(companies)
+        a = self._members(self.asset_classes, asset_classes)
+        y = self._members(self.years, years)
+        if any(isinstance(axis, np.ndarray) and (axis < 0).any() for axis in (a, y)):
+            raise KeyError("Unknown asset class or fiscal year")
+        # Basic slices stay views, only selected member lists are gathered
+        values = self.values[c][:, a][:, :, y]
+        return AumCube(
+            values,
+            self.companies[c],
+            self.years[y],
+            self.regions,
+            self.region_codes[c],
+            asset_classes=self.asset_classes[a],
+        )
+
+    def roll_up(self, by, year=None, companies=None):
+        """(labels, matrix of labels x asset classes) of AUM totals.
+
+        by is "company", "region" or "year"; company and region roll-ups are for one
+        fiscal year. companies restricts the roll-up to a firm set; without it the
+        precomputed marginals of the whole universe are used.
+        """
+        if by not in ("company", "region", "year"):
+            raise ValueError(f"Cannot roll up by {by!r}, expected company, region or year")
+        codes = None if companies is None else self.company_codes(companies)
+        if by == "year":
+            if codes is None:
+                return self.years, self.asset_totals.T
+            return self.years, self.values[codes].sum(axis=0).T
+
+        y = self.year_position(year)
+        if by == "company":
+            if codes is None:
+                return self.companies, self.values[:, :, y]
+            return self.companies[codes], self.values[codes, :, y]
+        if codes is None:
+            return self.regions, self.region_totals[:, :, y]
+        totals = _group_sum(self.region_codes[codes], len(self.regions), self.values[codes, :, y])
+        used = np.bincount(self.region_codes[codes], minlength=len(self.regions)) > 0
+        return self.regions[used], totals[used]
+
+    def top_companies(self, year, n, companies=None):
+        """Codes of the n largest firms by total AUM in a year, largest first."""
+        codes = np.arange(len(self.companies)) if companies is None else self.company_codes(companies)
+        totals = self.firm_totals[codes, self.year_position(year)]
+        if len(codes) > n:
+            keep = np.argpartition(-totals, n - 1)[:n]
+            codes, totals = codes[keep], totals[keep]
+        return codes[np.argsort(-totals, kind="stable")]
@@ -0,0 +1,138 @@
+"""
+Dependency graph from raw dataset columns to derived metrics, page frames and figures.
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+
+# Tables whose columns are source nodes; facts and derived are fact stores
+SOURCE_TABLES = ("facts", "derived", "company_info", "risk_scores")
+
+# node: direct inputs, filled by metrics.py, the loader's view frames and figure builders
+GRAPH = {}
+# Nodes reading every fiscal year of their sources rather than the view's year
+ALL_YEARS = set()
+
+_sources = {}
+
+
+def table_of(node):
+    return node.partition(":")[0]
+
+
+def add_node(name, inputs, all_years=False):
+    """Declare a node and its direct inputs; inputs may be declared later."""
+    GRAPH[name] = tuple(inputs)
+    if all_years:
+        ALL_YEARS.add(name)
+    _sources.clear()
+
+
+def sources(node):
+    """Source columns a node is computed from, stopping at content-versioned nodes."""
+    found = _sources.get(node)
+    if found is None:
+        if table_of(node) in SOURCE_TABLES:
+            found = (node,)
+        elif node in GRAPH:
+            found = tuple(sorted({s for i in GRAPH[node] for s in sources(i)}))
+        else:
+            raise KeyError(f"Unknown dependency-graph node {node!r}")
+        _sources[node] = found
+    return found
+
+
+def inputs_closure(node):
+    """Every node a node depends on, directly or not."""
+    seen = set()
+    stack = list(GRAPH.get(node, ()))
+    while stack:
+        n = stack.pop()
+        if n not in seen:
+            seen.add(n)
+            stack.extend(GRAPH.get(n, ()))
+    return seen
+
+
+def downstream(changed):
+    """Nodes to recompute after the changed source columns: everything depending on one of them."""
+    # A changed column also changes its table, for nodes reading the whole table
+    changed = set(changed) | {table_of(node) for node in changed}
+    return {node for node in GRAPH if changed & inputs_closure(node)}
+
+
+# ----------------------------------------------------
+# CONTENT FINGERPRINTS
+# ----------------------------------------------------
+def column_hashes(frame, companies):
+    """(companies x columns) uint64 hashes of a company-indexed frame, 0 where a firm is missing."""
+    frame = frame[~frame.index.duplicated(keep="last")].reindex(companies)
+    hashes = {c: pd.util.hash_pandas_object(frame[c], index=False).to_numpy() for c in frame.columns}
+    return pd.DataFrame(hashes, index=frame.index)
+
+
+def changed_rows(old, new):
+    """Positions along the first axis where two equally shaped arrays differ, NaN-aware."""
+    same = (old == new) | (pd.isna(old) & pd.isna(new))
+    return np.flatnonzero(~same.reshape(len(same), -1).all(axis=1))
+
+
+class Fingerprints:
+    """Content of every source node: fact-store values and hashed attribute columns."""
+
+    def __init__(self, stores, tables, companies):
+        self.stores = stores
+        self.hashes = {name: column_hashes(frame, companies) for name, frame in tables.items()}
+
+    def content(self, node, codes, year_pos):
+        """Bytes identifying a source node's content for the firms and year position (or slice)."""
+        table, _, column = node.partition(":")
+        store = self.stores.get(table)
+        if store is not None:
+            if year_pos is None or column not in store.metric_index:
+                return b"-"
+            block = store.values[codes, year_pos, store.metric_index.get_loc(column)]
+            return np.ascontiguousarray(block).tobytes()
+        hashes = self.hashes[table]
+        if not column:
+            return np.ascontiguousarray(hashes.to_numpy()[codes]).tobytes()
+        if column not in hashes:
+            return b"-"
+        return hashes[column].to_numpy()[codes].tobytes()
+
+    def changes(self, previous):
+        """{source node: firm positions} that differ from a Fingerprints over the same firms."""
+        out = {}
+        for table, store in self.stores.items():
+            old = previous.stores[table]
+            for m, metric in enumerate(store.metrics):
+                rows = changed_rows(old.values[:, :, m], store.values[:, :, m])
+                if len(rows):
+                    out[f"{table}:{metric}"] = rows
+        for table, hashes in self.hashes.items():
+            old = previous.hashes[table]
+            for column in hashes.columns.union(old.columns):
+                if column not in hashes or column not in old:
+                    out[f"{table}:{column}"] = np.arange(len(hashes))
+                    continue
+                rows = changed_rows(old[column].to_numpy(), hashes[column].to_numpy())
+                if len(rows):
+                    out[f"{table}:{column}"] = rows
+        return out
+
+
+def node_version(node, fingerprints, codes, year_pos, label):
+    """Version of a node for firms (store codes) and a fiscal year (position on the year axis).
+
+    label identifies the selection itself, e.g. the fiscal year and firm-set hash.
+    """
+    if node in ALL_YEARS:
+        year_pos = slice(None)
+    digest = hashlib.sha1(f"{node}:{label}".encode())
+    for source in sources(node):
+        digest.update(source.encode())
+        digest.update(fingerprints.content(source, codes, year_pos))
+    return digest.hexdigest()[:16]
@@ -0,0 +1,224 @@
+"""
+Report files and dataset exports for the Downloads page.
+"""
+
+import hashlib
+import io
+import json
+import mmap
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from perf import timed
+from sharedcache import CACHE, cached
+
+
+# Files above this size are only loaded once a user asks for them
+EAGER_LOAD_MB = float(os.environ.get("CI_DOWNLOAD_EAGER_MB", "25"))
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+REPORT_DIR = REPO_ROOT / "report"
+# SHA-256 and fingerprint of every report file, written by ingest.py
+ARTIFACTS_PATH = REPO_ROOT / "data" / "processed" / "artifacts.json"
+# Bytes read at each end of a file for its fingerprint
+FINGERPRINT_EDGE = 1 << 20
+
+
+@dataclass(frozen=True)
+class Artifact:
+    path: Path
+    size: int
+    mtime_ns: int
+    etag: str
+
+    @property
+    def version(self):
+        return (self.size, self.mtime_ns)
+
+    @property
+    def eager(self):
+        return self.size <= EAGER_LOAD_MB * 1024 * 1024
+
+    @property
+    def size_label(self):
+        size = float(self.size)
+        for unit in ("B", "KB", "MB", "GB"):
+            if size < 1024 or unit == "GB":
+                return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+            size /= 1024
+
+
+_lock = threading.Lock()
+_artifacts_lock = threading.Lock()
+_artifacts = {}
+# Files larger than the cache budget: path -> (version, bytes), latest version only. A shown
+# download button keeps the same bytes object in Streamlit's media store, so this adds no copy
+_oversized = {}
+
+
+def file_etag(path):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha256(b"").hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.sha256(mapped).hexdigest()
+
+
+def file_fingerprint(path):
+    """SHA-256 of a file's size and its first and last FINGERPRINT_EDGE bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        digest.update(str(size).encode())
+        digest.update(f.read(FINGERPRINT_EDGE))
+        if size > FINGERPRINT_EDGE:
+            f.seek(max(FINGERPRINT_EDGE, size - FINGERPRINT_EDGE))
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def artifact_key(path):
+    return Path(path).resolve().relative_to(REPO_ROOT).as_posix()
+
+
+def recorded_etag(path):
+    """SHA-256 recorded by ingest.py, if the file still has the recorded fingerprint."""
+    try:
+        recorded = json.loads(ARTIFACTS_PATH.read_text(encoding="utf-8")).get(artifact_key(path))
+    except (FileNotFoundError, ValueError):
+        return None
+    if recorded is None or recorded["fingerprint"] != file_fingerprint(path):
+        return None
+    return recorded["sha256"]
+
+
+def get_artifact(path):
+    """Metadata for a file, recomputed only when its size or mtime changes; None if missing."""
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    with _artifacts_lock:
+        cached = _artifacts.get(path)
+    if cached is not None and cached.version == (stat.st_size, stat.st_mtime_ns):
+        return cached
+    # A full hash here would run on the render thread: files ingest.py has not seen are the exception
+    etag = recorded_etag(path) or file_etag(path)
+    artifact = Artifact(path, stat.st_size, stat.st_mtime_ns, etag)
+    with _artifacts_lock:
+        _artifacts[path] = artifact
+    return artifact
+
+
+def artifact_bytes(artifact):
+    """File content, read once per artifact version."""
+    key = (artifact.path, artifact.version)
+    content = CACHE.get("files", key)
+    if content is not None:
+        return content
+    with _lock:
+        content = CACHE.get("files", key)
+        if content is None and artifact.size > CACHE.max_bytes:
+            # The cache would reject the file and it would be read again on every rerun
+            version, content = _oversized.get(artifact.path, (None, None))
+            if version != artifact.version:
+                _oversized.pop(artifact.path, None)
+                with timed("data_load", f"artifact:{artifact.path.name}"):
+                    content = artifact.path.read_bytes()
+                _oversized[artifact.path] = (artifact.version, content)
+        elif content is None:
+            # Drop the stale version before reading the new one to keep RSS flat
+            CACHE.discard("files", keep=lambda k: k[0] != artifact.path)
+            started = time.perf_counter()
+            with timed("data_load", f"artifact:{artifact.path.name}"):
+                content = artifact.path.read_bytes()
+            CACHE.put("files", key, content, cost=time.perf_counter() - started)
+        return content
+
+
+def is_loaded(artifact):
+    if ("files", (artifact.path, artifact.version)) in CACHE:
+        return True
+    with _lock:
+        return _oversized.get(artifact.path, (None,))[0] == artifact.version
+
+
+# ----------------------------------------------------
+# DATASET EXPORTS
+# ----------------------------------------------------
+# Dataset: view frame it is exported from
+EXPORT_DATASETS = {
+    "overview": "overview",
+    "financials": "financials",
+    "product_mix": "product_mix",
+    "risk_matrix": "risk_matrix",
+}
+# Format: (file extension, MIME type)
+EXPORT_FORMATS = {
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Arrow IPC": ("arrow", "application/vnd.apache.arrow.file"),
+    "CSV": ("csv", "text/csv"),
+}
+# Rows per record batch when streaming CSV
+CSV_BATCH_ROWS = 8192
+
+
+def export_hash(view, dataset):
+    """Hash of what an export contains: dataset, fiscal year, firm set and content version."""
+    key = f"{dataset}:{view.fiscal_year}:{view.selection}:{view.node_version(EXPORT_DATASETS[dataset])}"
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def export_name(view, dataset, fmt):
+    return f"{dataset}_{view.fiscal_year}_{export_hash(view, dataset)}.{EXPORT_FORMATS[fmt][0]}"
+
+
+def _export_table(view, dataset):
+    import pyarrow as pa
+
+    frame = getattr(view, EXPORT_DATASETS[dataset])
+    if dataset == "risk_matrix":
+        frame = frame.rename_axis("Company").reset_index()
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    return table.replace_schema_metadata({"fiscal_year": str(view.fiscal_year), "dataset": dataset})
+
+
+def _write_export(table, fmt):
+    import pyarrow as pa
+
+    # Written straight into a BytesIO, whose getvalue() hands over its buffer without copying;
+    # the download button takes the bytes object as is
+    sink = io.BytesIO()
+    if fmt == "Parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, sink, compression="zstd")
+    elif fmt == "Arrow IPC":
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        import pyarrow.csv as pcsv
+
+        with pcsv.CSVWriter(sink, table.schema) as writer:
+            for batch in table.to_batches(max_chunksize=CSV_BATCH_ROWS):
+                writer.write_batch(batch)
+    return sink.getvalue()
+
+
+def export_bytes(view, dataset, fmt):
+    """Export file content, built once per filter hash and format."""
+    key = (export_hash(view, dataset), fmt)
+
+    def build():
+        with timed("data_load", f"export:{dataset}.{EXPORT_FORMATS[fmt][0]}"):
+            return _write_export(_export_table(view, dataset), fmt)
+
+    return cached("exports", key, build)
+
+
+def is_export_ready(view, dataset, fmt):
+    return ("exports", (export_hash(view, dataset), fmt)) in CACHE
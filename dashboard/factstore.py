@@ -0,0 +1,155 @@
+"""
+Columnar fact store indexed by (company, fiscal year, metric).
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class FactStore:
+    def __init__(self, facts):
+        company_codes, companies = pd.factorize(facts["company"], sort=True)
+        year_codes, years = pd.factorize(facts["fiscal_year"], sort=True)
+        metric_codes, metrics = pd.factorize(facts["metric"], sort=True)
+        source_codes, sources = pd.factorize(facts["source"], sort=True)
+
+        shape = (len(companies), len(years), len(metrics))
+        values = np.full(shape, np.nan)
+        pages = np.full(shape, -1, dtype=np.int32)
+        source_grid = np.full(shape, -1, dtype=np.int32)
+
+        where = (company_codes, year_codes, metric_codes)
+        values[where] = facts["value"].to_numpy(dtype=float)
+        pages[where] = facts["page"].fillna(-1).to_numpy(dtype=np.int32)
+        source_grid[where] = source_codes
+
+        self._set_arrays(companies, years, metrics, values, pages, sources, source_grid)
+
+    @classmethod
+    def from_arrays(cls, companies, years, metrics, values):
+        """Store over an existing (companies, years, metrics) array, without provenance."""
+        store = cls.__new__(cls)
+        pages = np.full(values.shape, -1, dtype=np.int32)
+        store._set_arrays(companies, years, metrics, values, pages, [], pages)
+        return store
+
+    def _set_arrays(self, companies, years, metrics, values, pages, sources, source_codes):
+        self.companies = np.asarray(companies, dtype=object)
+        self.years = np.asarray(years, dtype=np.int32)
+        self.metrics = np.asarray(metrics, dtype=object)
+        self.sources = np.asarray(sources, dtype=object)
+        self.values = values
+        self.pages = pages
+        self.source_codes = source_codes
+
+        self.company_index = pd.Index(self.companies)
+        self.metric_index = pd.Index(self.metrics)
+        for arr in (self.values, self.pages, self.source_codes):
+            arr.flags.writeable = False
+
+    @classmethod
+    def from_parquet(cls, path):
+        return cls(pd.read_parquet(path))
+
+    def __len__(self):
+        """Number of firm-years with at least one fact."""
+        return int((~np.isnan(self.values)).any(axis=2).sum())
+
+    @property
+    def latest_year(self):
+        return int(self.years[-1])
+
+    # ----------------------------------------------------
+    # AXIS LOOKUPS
+    # ----------------------------------------------------
+    def company_codes(self, companies=None):
+        if companies is None:
+            return np.arange(len(self.companies))
+        codes = self.company_index.get_indexer(list(companies))
+        return codes[codes >= 0]
+
+    def metric_codes(self, metrics=None):
+        if metrics is None:
+            return np.arange(len(self.metrics))
+        codes = self.metric_index.get_indexer(list(metrics))
+        if (codes < 0).any():
+            missing = [m for m, c in zip(metrics, codes) if c < 0]
+            raise KeyError(f"Unknown metrics: {missing}")
+        return codes
+
+    def year_slice(self, first=None, last=None):
+        start = 0 if first is None else int(np.searchsorted(self.years, first, side="left"))
+        stop = len(self.years) if last is None else int(np.searchsorted(self.years, last, side="right"))
+        return slice(start, stop)
+
+    # ----------------------------------------------------
+    # SLICING
+    # ----------------------------------------------------
+    def cube(self, companies=None, years=(None, None), metrics=None):
+        """Sub-array (companies, years, metrics) plus its axis labels."""
+        c = self.company_codes(companies)
+        y = np.arange(len(self.years))[self.year_slice(*years)]
+        m = self.metric_codes(metrics)
+        block = self.values[np.ix_(c, y, m)]
+        return block, self.companies[c], self.years[y], self.metrics[m]
+
+    def wide(self, year, metrics=None, companies=None):
+        """One fiscal year as a company x metric frame, rows in the requested order."""
+        c = self.company_codes(companies)
+        m = self.metric_codes(metrics)
+        y = int(np.searchsorted(self.years, year))
+        if y >= len(self.years) or self.years[y] != year:
+            block = np.full((len(c), len(m)), np.nan)
+        else:
+            block = self.values[c, y][:, m]
+        return pd.DataFrame(block, index=pd.Index(self.companies[c], name="company"), columns=self.metrics[m])
+
+    def panel(self, metrics=None, companies=None, years=(None, None)):
+        """Long frame of present facts for a firm set and year range."""
+        block, comps, yrs, mets = self.cube(companies, years, metrics)
+        ci, yi, mi = np.nonzero(~np.isnan(block))
+        return pd.DataFrame(
+            {
+                "company": comps[ci],
+                "fiscal_year": yrs[yi],
+                "metric": mets[mi],
+                "value": block[ci, yi, mi],
+            }
+        )
+
+    def aggregate(self, metric, companies=None, years=(None, None), how="sum", by="year"):
+        """NaN-aware sum/mean/min/max of one metric, per year or per company."""
+        block, comps, yrs, _ = self.cube(companies, years, [metric])
+        block = block[:, :, 0]
+        func = {"sum": np.nansum, "mean": np.nanmean, "min": np.nanmin, "max": np.nanmax}[how]
+        present = ~np.isnan(block)
+        if by == "year":
+            out = func(block[:, present.any(axis=0)], axis=0)
+            return pd.Series(out, index=yrs[present.any(axis=0)], name=metric)
+        out = func(block[present.any(axis=1)], axis=1)
+        return pd.Series(out, index=comps[present.any(axis=1)], name=metric)
+
+    def provenance(self, company, year, metric):
+        """(source file, page) behind a value, page is None for manual entries."""
+        c = self.company_index.get_loc(company)
+        y = int(np.searchsorted(self.years, year))
+        m = self.metric_index.get_loc(metric)
+        code = self.source_codes[c, y, m]
+        if code < 0:
+            return None
+        page = int(self.pages[c, y, m])
+        return self.sources[code], (page if page >= 0 else None)
+
+    def sourced_companies(self, year, metric, companies=None):
+        """Companies whose value of a metric in a year was read from a filing page."""
+        y = int(np.searchsorted(self.years, year))
+        if metric not in self.metric_index or y >= len(self.years) or self.years[y] != year:
+            return []
+        codes = self.company_codes(companies)
+        codes = codes[self.pages[codes, y, self.metric_index.get_loc(metric)] >= 0]
+        return self.companies[codes].tolist()
+
+    def companies_with(self, year, metrics):
+        """Companies that report every one of the given metrics for the year."""
+        frame = self.wide(year, metrics)
+        return frame.index[frame.notna().all(axis=1)].tolist()
@@ -0,0 +1,511 @@
+"""
+Plotly figure builders for the dashboard pages, plus the figure cache.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+import depgraph
+from perf import timed
+from sharedcache import cached
+
+
+FIGURE_BUILDERS = {}
+
+
+def figure_builder(name, inputs, all_years=False):
+    """Register a builder drawing from the given view frames (dependency-graph nodes).
+
+    all_years marks figures that read every fiscal year, not just the view's.
+    """
+
+    def register(func):
+        depgraph.add_node(name, inputs, all_years=all_years)
+        FIGURE_BUILDERS[name] = func
+        return func
+
+    return register
+
+
+def dark_layout(fig, height, margin=None, **layout):
+    fig.update_layout(
+        template="plotly_dark",
+        height=height,
+        margin=margin or dict(t=50, b=40, l=40, r=20),
+        **layout,
+    )
+    return fig
+
+
+# ----------------------------------------------------
+# FIGURE CACHE
+# ----------------------------------------------------
+def figure_spec(name, view, **params):
+    """Serialized JSON spec of a figure, built at most once per node version and params."""
+    key = (name, view.node_version(name), tuple(sorted(params.items())))
+
+    def build():
+        with timed("figure_build", name):
+            return FIGURE_BUILDERS[name](view, **params).to_json()
+
+    return cached("figures", key, build)
+
+
+def get_figure(name, view, **params):
+    return pio.from_json(figure_spec(name, view, **params))
+
+
+# ----------------------------------------------------
+# LARGE UNIVERSES
+# ----------------------------------------------------
+# Scatters switch from SVG to WebGL at this many points
+WEBGL_MIN_POINTS = 1000
+# Points drawn at most; larger sets are thinned per cell of a DENSITY_BINS grid
+SCATTER_MAX_POINTS = 10_000
+DENSITY_BINS = 64
+# Bars drawn at most in per-firm bar charts, largest first
+BAR_MAX_FIRMS = 50
+
+
+def top_firms(frame, column, n=BAR_MAX_FIRMS):
+    """(rows, title suffix): the n firms with the largest values of a column when there are more."""
+    if len(frame) <= n:
+        return frame, ""
+    return frame.nlargest(n, column), f" · top {n} of {len(frame):,} firms"
+
+
+def density_sample(x, y, budget, bins=DENSITY_BINS, seed=0):
+    """Positions of about budget points, thinned at the same rate in every cell of a bins x bins grid.
+
+    Dense cells keep their share of the points, so the density reads the same; every occupied
+    cell keeps at least one point, so outliers and the extent of the cloud survive.
+    """
+    n = len(x)
+    if n <= budget:
+        return np.arange(n)
+    cells = np.zeros(n, dtype=np.int64)
+    for values in (x, y):
+        lo, hi = values.min(), values.max()
+        span = hi - lo if hi > lo else 1.0
+        cells = cells * bins + np.minimum(((values - lo) / span * bins).astype(np.int64), bins - 1)
+    _, inverse, counts = np.unique(cells, return_inverse=True, return_counts=True)
+
+    # Largest sampling rate whose per-cell ceilings fit the budget
+    lo, hi = 0.0, 1.0
+    for _ in range(30):
+        rate = (lo + hi) / 2
+        if np.ceil(counts * rate).sum() > budget:
+            hi = rate
+        else:
+            lo = rate
+    keep = np.maximum(np.ceil(counts * lo), 1).astype(np.int64)
+
+    # A random order grouped by cell; each cell keeps its first keep[cell] points
+    order = np.random.default_rng(seed).permutation(n)
+    order = order[np.argsort(inverse[order], kind="stable")]
+    starts = np.cumsum(counts) - counts
+    rank = np.arange(n) - np.repeat(starts, counts)
+    return np.sort(order[rank < np.repeat(keep, counts)])
+
+
+# name: view -> (points, x column, y column)
+SCATTER_POINTS = {
+    "financials_roe_roa": lambda view: (view.financials, "ROE_%", "ROA_%"),
+    "business_positioning": lambda view: (positioning_frame(view), "Fee_Level_Score", "Tech_Score"),
+}
+
+
+def scatter_extent(name, view):
+    """(number of points, x extent, y extent) of a scatter figure; an extent is None when empty or flat."""
+    frame, x, y = SCATTER_POINTS[name](view)
+    extents = []
+    for column in (x, y):
+        values = frame[column].to_numpy(dtype=float)
+        values = values[np.isfinite(values)]
+        lo, hi = (float(values.min()), float(values.max())) if len(values) else (0.0, 0.0)
+        extents.append((lo, hi) if hi > lo else None)
+    return len(frame), *extents
+
+
+def point_cloud(
+    frame, x, y, title, x_title, y_title, size=None, hover="Company", x_range=None, y_range=None, height=360
+):
+    """Single-trace scatter for large universes: WebGL, density-sampled, optionally zoomed.
+
+    A zoom range restricts the points before sampling, so zooming in shows every point once
+    few enough are left.
+    """
+    xs, ys = frame[x].to_numpy(dtype=float), frame[y].to_numpy(dtype=float)
+    inside = np.isfinite(xs) & np.isfinite(ys)
+    for values, bounds in ((xs, x_range), (ys, y_range)):
+        if bounds is not None:
+            inside &= (values >= bounds[0]) & (values <= bounds[1])
+    rows = np.flatnonzero(inside)
+    total = len(rows)
+    rows = rows[density_sample(xs[rows], ys[rows], SCATTER_MAX_POINTS)]
+
+    marker = dict(opacity=0.6, line=dict(width=0))
+    if size is not None:
+        sizes = np.nan_to_num(frame[size].to_numpy(dtype=float)).clip(min=0)
+        # Same area scaling as plotly.express, against the largest value of the whole set
+        marker.update(size=sizes[rows], sizemode="area", sizeref=2 * max(sizes.max(), 1e-9) / 24**2, sizemin=2)
+    else:
+        marker.update(size=5)
+    trace = go.Scattergl if len(rows) >= WEBGL_MIN_POINTS else go.Scatter
+    fig = go.Figure(
+        trace(
+            x=xs[rows],
+            y=ys[rows],
+            mode="markers",
+            hovertext=frame[hover].to_numpy()[rows],
+            hovertemplate=f"%{{hovertext}}<br>{x_title}: %{{x:.2f}}<br>{y_title}: %{{y:.2f}}<extra></extra>",
+            marker=marker,
+        )
+    )
+    if len(rows) < total:
+        title += f" · {len(rows):,} of {total:,} points, zoom for full detail"
+    dark_layout(fig, height, title=title, xaxis_title=x_title, yaxis_title=y_title)
+    if x_range is not None:
+        fig.update_xaxes(range=list(x_range))
+    if y_range is not None:
+        fig.update_yaxes(range=list(y_range))
+    return fig
+
+
+# ----------------------------------------------------
+# OVERVIEW
+# ----------------------------------------------------
+@figure_builder("overview_aum", inputs=("overview",))
+def build_overview_aum(view):
+    import plotly.express as px
+
+    rows, suffix = top_firms(view.overview, "AUM_Tn")
+    fig = px.bar(
+        rows,
+        x="Company",
+        y="AUM_Tn",
+        title=f"Total AUM {view.fiscal_year}{suffix}",
+        labels={"AUM_Tn": "AUM ($ Trillions)"},
+        text_auto=".2f",
+    )
+    return dark_layout(fig, 360)
+
+
+@figure_builder("overview_etf_share", inputs=("overview",))
+def build_overview_etf_share(view):
+    import plotly.express as px
+
+    rows, suffix = top_firms(view.overview, "ETF_Share_%")
+    fig = px.bar(
+        rows,
+        x="Company",
+        y="ETF_Share_%",
+        title=f"ETF AUM as % of Total AUM{suffix}",
+        labels={"ETF_Share_%": "ETF Share of AUM (%)"},
+        text_auto=".1f",
+    )
+    return dark_layout(fig, 360)
+
+
+# ----------------------------------------------------
+# FINANCIALS
+# ----------------------------------------------------
+@figure_builder("financials_revenue", inputs=("financials",))
+def build_financials_revenue(view):
+    import plotly.express as px
+
+    rows, suffix = top_firms(view.financials, "Revenue_Bn")
+    fig = px.bar(
+        rows,
+        x="Company",
+        y="Revenue_Bn",
+        title=f"Total Revenue ({view.fiscal_year}, $Bn){suffix}",
+        text_auto=".1f",
+    )
+    return dark_layout(fig, 360)
+
+
+@figure_builder("financials_margin", inputs=("financials",))
+def build_financials_margin(view):
+    import plotly.express as px
+
+    rows, suffix = top_firms(view.financials, "Op_Margin_%")
+    fig = px.bar(
+        rows,
+        x="Company",
+        y="Op_Margin_%",
+        title=f"Operating Margin (%){suffix}",
+        text_auto=".1f",
+    )
+    return dark_layout(fig, 360)
+
+
+@figure_builder("financials_roe_roa", inputs=("financials",))
+def build_financials_roe_roa(view, x_range=None, y_range=None):
+    import plotly.express as px
+
+    title = "ROE vs ROA (Bubble size = Revenue)"
+    financials_df = view.financials
+    if len(financials_df) >= WEBGL_MIN_POINTS:
+        # One WebGL trace instead of one SVG trace per firm
+        return point_cloud(
+            financials_df,
+            "ROE_%",
+            "ROA_%",
+            title,
+            "ROE %",
+            "ROA %",
+            size="Revenue_Bn",
+            x_range=x_range,
+            y_range=y_range,
+        )
+
+    fig = px.scatter(
+        financials_df,
+        x="ROE_%",
+        y="ROA_%",
+        size="Revenue_Bn",
+        color="Company",
+        hover_name="Company",
+        title=title,
+    )
+    return dark_layout(fig, 360)
+
+
+@figure_builder("financials_net_income", inputs=("financials",))
+def build_financials_net_income(view):
+    import plotly.express as px
+
+    rows, suffix = top_firms(view.financials, "Net_Income_Bn")
+    fig = px.bar(
+        rows,
+        x="Company",
+        y="Net_Income_Bn",
+        title=f"Net Income ({view.fiscal_year}, $Bn){suffix}",
+        text_auto=".2f",
+    )
+    return dark_layout(fig, 360)
+
+
+# ----------------------------------------------------
+# BUSINESS MODEL
+# ----------------------------------------------------
+depgraph.add_node("positioning", ("overview",))
+
+
+def positioning_frame(view):
+    """Overview with a fee score column, built once per version of the positioning node."""
+
+    def build():
+        # Build a small positioning scatter using tech score + a fee proxy
+        fee_map = {"Low–Mid": 3, "Competitive": 4, "Mid-range": 5}
+        position_df = view.overview.copy()
+        # Unknown or missing fee levels score NaN and are left off the chart
+        position_df["Fee_Level_Score"] = position_df["Fee_Level"].map(fee_map).astype(float)
+        return position_df
+
+    return cached("frames", ("positioning", view.node_version("positioning")), build)
+
+
+@figure_builder("business_positioning", inputs=("positioning",))
+def build_business_positioning(view, x_range=None, y_range=None):
+    import plotly.express as px
+
+    position_df = positioning_frame(view)
+    fee_axis = dict(tickvals=[3, 4, 5], ticktext=["Low–Mid", "Competitive", "Mid-range"])
+
+    if len(position_df) >= WEBGL_MIN_POINTS:
+        fig = point_cloud(
+            position_df,
+            "Fee_Level_Score",
+            "Tech_Score",
+            "Competitive Positioning: Fees vs Technology",
+            "Relative Fee Level",
+            "Technology / Platform Strength (1–10)",
+            x_range=x_range,
+            y_range=y_range,
+            height=420,
+        )
+        return fig.update_xaxes(**fee_axis)
+
+    fig = px.scatter(
+        position_df.dropna(subset=["Fee_Level_Score", "Tech_Score"]),
+        x="Fee_Level_Score",
+        y="Tech_Score",
+        text="Company",
+        labels={
+            "Fee_Level_Score": "Relative Fee Level (Higher = More Expensive)",
+            "Tech_Score": "Technology / Platform Strength (1–10)",
+        },
+        title="Competitive Positioning: Fees vs Technology",
+    )
+    fig.update_traces(textposition="top center")
+    return dark_layout(
+        fig,
+        420,
+        margin=dict(t=60, b=40, l=40, r=40),
+        xaxis=fee_axis,
+    )
+
+
+# ----------------------------------------------------
+# PRODUCT MIX
+# ----------------------------------------------------
+# Bars drawn at most when stacking by firm; smaller firms are summed into one bar
+PRODUCT_MIX_MAX_FIRMS = 50
+PRODUCT_MIX_GROUPINGS = {"company": "Firm", "region": "Region"}
+
+
+def stacked_asset_classes(labels, matrix, asset_classes, title, height=420):
+    """Stacked bar with one trace per asset class, straight from a labels x asset classes matrix."""
+    fig = go.Figure(
+        [go.Bar(x=labels, y=matrix[:, a], name=name) for a, name in enumerate(asset_classes)]
+    )
+    return dark_layout(
+        fig,
+        height,
+        margin=dict(t=60, b=40, l=40, r=40),
+        barmode="stack",
+        title=title,
+        yaxis_title="AUM ($ Trillions)",
+        legend_title_text="Asset Class",
+    )
+
+
+@figure_builder("product_mix_stack", inputs=("product_mix", "company_info:Region"))
+def build_product_mix_stack(view, by="company"):
+    cube = view.data.aum_cube
+    year = view.fiscal_year
+    title = f"AUM by Asset Class ({year}, $Trillions)"
+    if year not in cube.years:
+        labels, matrix = [], np.zeros((0, len(cube.asset_classes)))
+    elif by == "company":
+        y = cube.year_position(year)
+        selected = cube.company_codes(view.companies)
+        codes = selected
+        if len(selected) > PRODUCT_MIX_MAX_FIRMS:
+            codes = cube.top_companies(year, PRODUCT_MIX_MAX_FIRMS, view.companies)
+        labels, matrix = list(cube.companies[codes]), cube.values[codes, :, y]
+        if len(selected) > len(codes):
+            labels.append(f"Other {len(selected) - len(codes):,} firms")
+            matrix = np.vstack([matrix, cube.values[selected, :, y].sum(axis=0) - matrix.sum(axis=0)])
+    else:
+        labels, matrix = cube.roll_up(by, year, view.companies)
+        title = f"AUM by {PRODUCT_MIX_GROUPINGS[by]} and Asset Class ({year}, $Trillions)"
+    return stacked_asset_classes(labels, matrix / 1e6, cube.asset_classes, title)
+
+
+@figure_builder("product_mix_history", inputs=("product_mix",), all_years=True)
+def build_product_mix_history(view):
+    cube = view.data.aum_cube
+    years, matrix = cube.roll_up("year", companies=view.companies)
+    return stacked_asset_classes(
+        [str(y) for y in years],
+        matrix / 1e6,
+        cube.asset_classes,
+        "AUM by Fiscal Year and Asset Class ($Trillions)",
+    )
+
+
+# ----------------------------------------------------
+# TECHNOLOGY
+# ----------------------------------------------------
+@figure_builder("technology_score", inputs=("overview",))
+def build_technology_score(view):
+    import plotly.express as px
+
+    rows, suffix = top_firms(view.overview, "Tech_Score")
+    fig = px.bar(
+        rows,
+        x="Company",
+        y="Tech_Score",
+        title=f"Technology / Platform Strength (1–10){suffix}",
+        text_auto=".0f",
+    )
+    return dark_layout(fig, 400, margin=dict(t=60, b=40, l=40, r=40))
+
+
+# ----------------------------------------------------
+# RISK
+# ----------------------------------------------------
+@figure_builder("risk_heatmap", inputs=("risk_matrix",))
+def build_risk_heatmap(view, clustered=False, group=None):
+    from clustering import filled_values, heatmap_layout, peer_group_label
+
+    risk_matrix = view.risk_matrix
+    title = "Relative Risk Exposure Heatmap"
+    if not clustered:
+        z, x, y = risk_matrix.values, risk_matrix.columns, risk_matrix.index
+    else:
+        layout = heatmap_layout(risk_matrix)
+        x = risk_matrix.columns[layout.col_order]
+        if not layout.aggregated:
+            block = risk_matrix.iloc[layout.row_order, layout.col_order]
+            z, y = block.values, block.index
+        elif group is None:
+            # One tile row per peer group: mean score of its firms
+            sizes = layout.group_sizes
+            z = layout.group_means[layout.group_order][:, layout.col_order]
+            y = [peer_group_label(g, sizes[g]) for g in layout.group_order]
+            title += f" – {len(risk_matrix):,} firms in {len(sizes)} peer groups"
+        else:
+            rows = layout.members(group, filled_values(risk_matrix))
+            block = risk_matrix.iloc[rows, layout.col_order]
+            z, y = block.values, block.index
+            title += f" – {peer_group_label(group, len(rows))}"
+
+    fig = go.Figure(
+        data=go.Heatmap(
+            z=z,
+            x=x,
+            y=y,
+            colorscale="Viridis",
+            colorbar=dict(title="Risk Level (1–5)"),
+        )
+    )
+    return dark_layout(
+        fig,
+        min(max(420, 18 * len(y) + 140), 1800),
+        margin=dict(t=60, b=40, l=60, r=40),
+        title=title,
+    )
+
+
+# ----------------------------------------------------
+# SCENARIOS
+# ----------------------------------------------------
+# Distributions drawn at most; the largest firms by AUM are shown
+SCENARIO_MAX_FIRMS = 8
+
+
+@figure_builder("scenario_distribution", inputs=("product_mix", "financials"))
+def build_scenario_distribution(view, scenario):
+    from scenarios import simulate
+
+    result = simulate(view, scenario)
+    summary = result.summary
+    centers = (result.edges[:-1] + result.edges[1:]) / 2
+    width = result.edges[1] - result.edges[0]
+    fig = go.Figure()
+    for i in summary["AUM_Tn"].to_numpy().argsort()[::-1][:SCENARIO_MAX_FIRMS]:
+        hist = result.histograms[i]
+        # Trim empty tails so the payload only carries the populated range
+        nonzero = hist.nonzero()[0]
+        lo, hi = (nonzero[0], nonzero[-1] + 1) if len(nonzero) else (0, 0)
+        fig.add_trace(
+            go.Scatter(
+                x=centers[lo:hi],
+                y=hist[lo:hi] / max(hist.sum(), 1) / width * 100,
+                mode="lines",
+                name=summary["Company"].iloc[i],
+            )
+        )
+    return dark_layout(
+        fig,
+        420,
+        margin=dict(t=60, b=40, l=60, r=40),
+        title=f"Distribution of AUM change across {result.paths:,} paths",
+        xaxis_title="AUM change (%)",
+        yaxis_title="Density (% of paths per pp)",
+    )
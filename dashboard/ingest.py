@@ -0,0 +1,401 @@
+"""
+Filing ingestion: pulls KPI facts out of the PDFs in data/raw.
+
+Usage:
+    python dashboard/ingest.py [--force] [--workers N] [--chunk-pages N]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+from pypdf import PdfReader
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = REPO_ROOT / "data"
+MANIFEST_PATH = DATA_DIR / "filings.json"
+REFERENCE_DIR = DATA_DIR / "reference"
+PROCESSED_DIR = DATA_DIR / "processed"
+EXTRACT_CACHE_DIR = PROCESSED_DIR / "extracted"
+# Full page texts per filing content hash, shared with the search index
+PAGES_CACHE_DIR = PROCESSED_DIR / "pages"
+# Page-range chunks of filings whose text extraction has not finished yet
+CHECKPOINT_DIR = PAGES_CACHE_DIR / "partial"
+DEFAULT_CHUNK_PAGES = 16
+
+FACTS_PATH = PROCESSED_DIR / "facts.parquet"
+
+# Analyst-maintained tables copied into the columnar store as-is
+REFERENCE_TABLES = {
+    "companies.csv": PROCESSED_DIR / "companies.parquet",
+    "risk_scores.csv": PROCESSED_DIR / "risk_scores.parquet",
+}
+
+FACT_COLUMNS = ["company", "fiscal_year", "metric", "value", "unit", "source", "page"]
+
+# Footnote markers glued to a label, e.g. "Operating income(1)"
+FOOTNOTE_RE = re.compile(r"(?<=[A-Za-z.])\(\d{1,2}\)")
+# "$ 20,407", "(434.8)", "—" (an em dash is a reported zero)
+NUMBER_RE = re.compile(r"\(\s*[\d,]+(?:\.\d+)?\s*\)|[\d,]*\d(?:\.\d+)?|—")
+
+
+# ----------------------------------------------------
+# FILE HELPERS
+# ----------------------------------------------------
+def atomic_write(path, write):
+    """Call write(tmp_path), then move the result into place in one rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def write_json(path, obj, compress=False):
+    def write(tmp):
+        opener = gzip.open if compress else open
+        with opener(tmp, "wt", encoding="utf-8") as f:
+            json.dump(obj, f, indent=None if compress else 2)
+
+    atomic_write(path, write)
+
+
+# ----------------------------------------------------
+# PARSING HELPERS
+# ----------------------------------------------------
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_number(token):
+    if token == "—":
+        return 0.0
+    negative = token.startswith("(")
+    value = float(token.strip("() ").replace(",", ""))
+    return -value if negative else value
+
+
+def match_row(line, label_re):
+    """Return the numbers on a table row starting with the label, or None."""
+    line = FOOTNOTE_RE.sub("", line.strip())
+    m = label_re.match(line)
+    if not m:
+        return None
+    rest = line[m.end():]
+    # A label that is only a prefix of a longer caption ("Total" vs "Total net flows")
+    if re.search(r"[A-Za-z]", rest):
+        return None
+    numbers = [parse_number(tok) for tok in NUMBER_RE.findall(rest)]
+    return numbers or None
+
+
+def find_metric(pages, spec):
+    """Locate one metric described by a layout spec; returns (value, page) or None."""
+    anchor_re = re.compile(spec["anchor"]) if spec.get("anchor") else None
+    label_re = re.compile(spec["label"])
+    column = spec.get("column", 0)
+    first, last = spec.get("pages", [1, None])
+
+    for page_no, text in pages.iter_pages(first, last):
+        if anchor_re is not None:
+            anchor = anchor_re.search(text)
+            if not anchor:
+                continue
+            text = text[anchor.end():]
+        for line in text.splitlines():
+            numbers = match_row(line, label_re)
+            if numbers and len(numbers) > column:
+                return numbers[column] * spec.get("scale", 1), page_no
+    return None
+
+
+class LazyPages:
+    """Page texts of a PDF, extracted on first access unless already cached."""
+
+    def __init__(self, path, texts=None):
+        self.reader = PdfReader(path)
+        self.texts = {} if texts is None else {i + 1: text for i, text in enumerate(texts)}
+
+    def iter_pages(self, first=1, last=None):
+        last = min(last or len(self.reader.pages), len(self.reader.pages))
+        for page_no in range(first, last + 1):
+            if page_no not in self.texts:
+                self.texts[page_no] = self.reader.pages[page_no - 1].extract_text() or ""
+            yield page_no, self.texts[page_no]
+
+
+def page_texts_cache_path(sha):
+    return PAGES_CACHE_DIR / f"{sha}.json.gz"
+
+
+def cached_page_texts(sha):
+    path = page_texts_cache_path(sha)
+    if not path.exists():
+        return None
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_page_texts(path, sha=None):
+    """Text of every page of a PDF, cached on disk by content hash."""
+    sha = sha or file_sha256(path)
+    texts = cached_page_texts(sha)
+    if texts is None:
+        texts = [page.extract_text() or "" for page in PdfReader(path).pages]
+        write_json(page_texts_cache_path(sha), texts, compress=True)
+    return texts
+
+
+# ----------------------------------------------------
+# PARALLEL TEXT EXTRACTION
+# ----------------------------------------------------
+def chunk_path(sha, first, last):
+    return CHECKPOINT_DIR / sha / f"{first:05d}-{last:05d}.json"
+
+
+def checkpointed_pages(sha):
+    """Page numbers already extracted by earlier (possibly interrupted) runs."""
+    done = set()
+    for chunk in (CHECKPOINT_DIR / sha).glob("*.json"):
+        first, last = (int(n) for n in chunk.stem.split("-"))
+        done.update(range(first, last + 1))
+    return done
+
+
+def extract_page_range(path, sha, first, last):
+    """Worker: extract pages first..last (1-based, inclusive) and checkpoint them."""
+    reader = PdfReader(path)
+    texts = [reader.pages[i - 1].extract_text() or "" for i in range(first, last + 1)]
+    write_json(chunk_path(sha, first, last), texts)
+    return sha, len(texts)
+
+
+def pending_ranges(n_pages, done, chunk_pages):
+    todo = [p for p in range(1, n_pages + 1) if p not in done]
+    ranges = []
+    for page in todo:
+        if ranges and page == ranges[-1][1] + 1 and page - ranges[-1][0] < chunk_pages:
+            ranges[-1][1] = page
+        else:
+            ranges.append([page, page])
+    return [tuple(r) for r in ranges]
+
+
+def assemble_page_texts(sha, n_pages):
+    texts = [None] * n_pages
+    for chunk in sorted((CHECKPOINT_DIR / sha).glob("*.json")):
+        first = int(chunk.stem.split("-")[0])
+        with open(chunk, encoding="utf-8") as f:
+            for offset, text in enumerate(json.load(f)):
+                texts[first - 1 + offset] = text
+    write_json(page_texts_cache_path(sha), texts, compress=True)
+    shutil.rmtree(CHECKPOINT_DIR / sha)
+
+
+def extract_texts_parallel(digests, workers=None, chunk_pages=DEFAULT_CHUNK_PAGES, force=False):
+    """Fill the page-text cache for every PDF in digests ({path: SHA-256}), fanning page ranges
+    out over a process pool."""
+    workers = workers or os.cpu_count() or 1
+    jobs = {}
+    tasks = []
+    for path, sha in digests.items():
+        if force:
+            page_texts_cache_path(sha).unlink(missing_ok=True)
+            shutil.rmtree(CHECKPOINT_DIR / sha, ignore_errors=True)
+        elif page_texts_cache_path(sha).exists():
+            continue
+        n_pages = len(PdfReader(path).pages)
+        done = checkpointed_pages(sha)
+        jobs[sha] = (path, n_pages)
+        if done:
+            print(f"~ {path.name}: resuming, {len(done)}/{n_pages} pages already extracted")
+        tasks.extend((str(path), sha, first, last) for first, last in pending_ranges(n_pages, done, chunk_pages))
+
+    if not jobs:
+        return
+    total = sum(last - first + 1 for _, _, first, last in tasks)
+    print(f"Extracting {total} pages from {len(jobs)} filings with {workers} workers")
+
+    started = time.perf_counter()
+    extracted = 0
+    remaining = {sha: 0 for sha in jobs}
+    for task in tasks:
+        remaining[task[1]] += 1
+
+    def assemble(sha):
+        path, n_pages = jobs[sha]
+        assemble_page_texts(sha, n_pages)
+        rate = extracted / max(time.perf_counter() - started, 1e-9)
+        print(f"  {path.name}: {n_pages} pages extracted ({rate:.1f} pages/s so far)")
+
+    def finished(sha, n):
+        nonlocal extracted
+        extracted += n
+        remaining[sha] -= 1
+        if remaining[sha] == 0:
+            assemble(sha)
+
+    # Fully checkpointed by an interrupted run, only the final write is missing
+    for sha in [sha for sha, count in remaining.items() if count == 0]:
+        assemble(sha)
+    if workers == 1:
+        for task in tasks:
+            finished(*extract_page_range(*task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for future in as_completed([pool.submit(extract_page_range, *task) for task in tasks]):
+                finished(*future.result())
+    if CHECKPOINT_DIR.exists() and not any(CHECKPOINT_DIR.iterdir()):
+        CHECKPOINT_DIR.rmdir()
+
+    elapsed = time.perf_counter() - started
+    print(f"Extracted {extracted} pages in {elapsed:.1f}s ({extracted / max(elapsed, 1e-9):.1f} pages/s)")
+
+
+# ----------------------------------------------------
+# PIPELINE
+# ----------------------------------------------------
+def load_manifest(path=MANIFEST_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def extract_filing(path, layout, texts=None):
+    pages = LazyPages(path, texts)
+    facts = []
+    for metric, spec in layout.items():
+        found = find_metric(pages, spec)
+        if found is None:
+            print(f"  ! {metric}: not found in {path.name}")
+            continue
+        value, page_no = found
+        facts.append({"metric": metric, "value": value, "page": page_no})
+    return facts
+
+
+def ingest_filing(filing, layout, units, force=False, sha=None):
+    path = DATA_DIR / filing["file"]
+    sha = sha or file_sha256(path)
+    # The layout is part of the key so a corrected pattern triggers a re-parse.
+    layout_key = hashlib.sha256(json.dumps(layout, sort_keys=True).encode()).hexdigest()[:12]
+    cache_path = EXTRACT_CACHE_DIR / f"{sha}-{layout_key}.json"
+
+    if cache_path.exists() and not force:
+        print(f"= {path.name}: unchanged, using cached extraction")
+        with open(cache_path, encoding="utf-8") as f:
+            extracted = json.load(f)
+    else:
+        print(f"+ {path.name}: parsing")
+        extracted = extract_filing(path, layout, cached_page_texts(sha))
+        write_json(cache_path, extracted)
+
+    return [
+        {
+            "company": filing["company"],
+            "fiscal_year": int(filing["fiscal_year"]),
+            "metric": item["metric"],
+            "value": float(item["value"]),
+            "unit": units,
+            "source": path.name,
+            "page": item["page"],
+        }
+        for item in extracted
+    ]
+
+
+def load_manual_facts(units):
+    path = REFERENCE_DIR / "manual_facts.csv"
+    if not path.exists():
+        return pd.DataFrame(columns=FACT_COLUMNS)
+    manual = pd.read_csv(path)
+    manual["unit"] = units
+    return manual[FACT_COLUMNS]
+
+
+def write_parquet(df, path):
+    """Write only when the content changed, so the dashboard's version key stays put."""
+    if path.exists() and pd.read_parquet(path).equals(df):
+        return False
+    atomic_write(path, lambda tmp: df.to_parquet(tmp, index=False))
+    return True
+
+
+def index_artifacts():
+    """Record the SHA-256 of every report file, so the dashboard does not hash them while rendering."""
+    from downloads import ARTIFACTS_PATH, REPORT_DIR, artifact_key, file_fingerprint
+
+    artifacts = {
+        artifact_key(path): {"sha256": file_sha256(path), "fingerprint": file_fingerprint(path)}
+        for path in sorted(REPORT_DIR.iterdir())
+        if path.is_file()
+    }
+    if not ARTIFACTS_PATH.exists() or json.loads(ARTIFACTS_PATH.read_text(encoding="utf-8")) != artifacts:
+        write_json(ARTIFACTS_PATH, artifacts)
+    return artifacts
+
+
+def run(force=False, workers=None, chunk_pages=DEFAULT_CHUNK_PAGES):
+    manifest = load_manifest()
+    units = manifest.get("units", "USD millions")
+
+    registered = {(DATA_DIR / filing["file"]).resolve() for filing in manifest["filings"]}
+    for path in sorted((DATA_DIR / "raw").glob("*.pdf")):
+        if path.resolve() not in registered:
+            print(f"? {path.name}: not listed in data/filings.json, skipped")
+    # Each filing is hashed once, the digest keys both the page-text and the extraction cache
+    digests = {path: file_sha256(path) for path in sorted(registered)}
+    extract_texts_parallel(digests, workers=workers, chunk_pages=chunk_pages, force=force)
+
+    rows = []
+    for filing in manifest["filings"]:
+        layout = manifest["layouts"][filing["layout"]]
+        sha = digests[(DATA_DIR / filing["file"]).resolve()]
+        rows.extend(ingest_filing(filing, layout, units, force=force, sha=sha))
+    extracted = pd.DataFrame(rows, columns=FACT_COLUMNS)
+
+    # Manually entered facts only fill gaps the filings do not cover.
+    manual = load_manual_facts(units)
+    key = ["company", "fiscal_year", "metric"]
+    covered = manual.set_index(key).index.isin(extracted.set_index(key).index)
+    facts = pd.concat([extracted, manual[~covered]], ignore_index=True)
+    facts["fiscal_year"] = facts["fiscal_year"].astype("int32")
+    facts["page"] = facts["page"].astype("Int32")
+
+    PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
+    write_parquet(facts, FACTS_PATH)
+    for name, target in REFERENCE_TABLES.items():
+        write_parquet(pd.read_csv(REFERENCE_DIR / name), target)
+    print(f"Wrote {len(facts)} facts to {FACTS_PATH.relative_to(REPO_ROOT)}")
+    index_artifacts()
+    return facts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract KPI facts from the filings in data/raw.")
+    parser.add_argument("--force", action="store_true", help="re-parse every filing, ignoring the cache")
+    parser.add_argument("--workers", type=int, default=None, help="parser processes (default: all cores)")
+    parser.add_argument(
+        "--chunk-pages", type=int, default=DEFAULT_CHUNK_PAGES, help="pages per work unit (default: %(default)s)"
+    )
+    args = parser.parse_args()
+    run(force=args.force, workers=args.workers, chunk_pages=args.chunk_pages)
+
+
+if __name__ == "__main__":
+    main()
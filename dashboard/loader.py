@@ -0,0 +1,322 @@
+"""
+Versioned, process-wide access to the processed datasets and their views.
+"""
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import depgraph
+from cube import AumCube
+from factstore import FactStore
+from metrics import DERIVED_INPUTS, derive_metrics, update_metrics
+from perf import instrument
+from sharedcache import CACHE, cached
+
+
+DASHBOARD_DIR = Path(__file__).resolve().parent
+# Overridable so benchmarks can point the app at synthetic datasets
+PROCESSED_DIR = Path(os.environ.get("CI_PROCESSED_DIR", DASHBOARD_DIR.parent / "data" / "processed"))
+THEME_CSS_PATH = DASHBOARD_DIR / "theme.css"
+
+DATASET_FILES = {
+    "facts": PROCESSED_DIR / "facts.parquet",
+    "companies": PROCESSED_DIR / "companies.parquet",
+    "risk_scores": PROCESSED_DIR / "risk_scores.parquet",
+}
+
+KPI_METRICS = [
+    "aum_total", "aum_etf", "aum_equity", "aum_fixed_income", "aum_multi_asset",
+    "aum_cash", "aum_alternatives", "revenue", "operating_income", "net_income",
+    "total_assets", "equity",
+]
+
+@dataclass(frozen=True)
+class Datasets:
+    """Shared by all sessions: treat every frame as read-only."""
+
+    version: str
+    store: FactStore
+    # Ratios and growth rates from metrics.py, same axes as store
+    derived: FactStore
+    company_info: pd.DataFrame
+    risk_scores: pd.DataFrame
+    # Firms listed in data/reference/companies.csv, the default selection
+    tracked_companies: list
+    # Content of the dependency-graph source nodes, for node versions
+    fingerprints: depgraph.Fingerprints = field(repr=False)
+    # Source node: firms that changed since the previous version, None after a full build
+    changed: dict = field(default=None, repr=False)
+
+    @property
+    def stale_nodes(self):
+        """Graph nodes recomputed for views containing the changed firms, None after a full build."""
+        return None if self.changed is None else depgraph.downstream(self.changed)
+
+    @property
+    def years(self):
+        return [int(y) for y in self.store.years]
+
+    @property
+    def latest_year(self):
+        return self.store.latest_year
+
+    @property
+    def all_companies(self):
+        return list(self.store.companies)
+
+    @property
+    def aum_cube(self):
+        """AUM by firm, asset class, fiscal year and region, with precomputed marginals."""
+        build = instrument("data_load", "aum_cube")(AumCube.from_store)
+        return cached("cube", self.version, lambda: build(self.store, self.company_info))
+
+
+def view_frame(*inputs):
+    """Page frame of a View reading the given graph nodes, built on first access and
+    shared by every view where its node version is the same.
+
+    The view does not keep a reference to the frame, so an evicted frame is freed.
+    """
+
+    def wrap(func):
+        name = func.__name__
+        depgraph.add_node(name, inputs)
+        build = instrument("data_load", f"view.{name}")(func)
+
+        @wraps(func)
+        def frame(self):
+            return shared_frame(name, self.node_version(name), lambda: build(self))
+
+        return property(frame)
+
+    return wrap
+
+
+@dataclass(frozen=True)
+class View:
+    """Page frames for one fiscal year and firm selection, each built on first access."""
+
+    version: str
+    fiscal_year: int
+    companies: list
+    # Hash of the firm set, part of every node version
+    selection: str
+    data: Datasets = field(repr=False, compare=False)
+    _node_versions: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def node_version(self, node):
+        """Version of a dependency-graph node for this view, changes only with its inputs."""
+        version = self._node_versions.get(node)
+        if version is None:
+            store = self.data.store
+            y = int(np.searchsorted(store.years, self.fiscal_year))
+            year_pos = y if y < len(store.years) and store.years[y] == self.fiscal_year else None
+            version = depgraph.node_version(
+                node,
+                self.data.fingerprints,
+                store.company_codes(self.companies),
+                year_pos,
+                f"{self.fiscal_year}:{self.selection}",
+            )
+            self._node_versions[node] = version
+        return version
+
+    @view_frame(*(f"facts:{m}" for m in KPI_METRICS))
+    def kpi(self):
+        return self.data.store.wide(self.fiscal_year, KPI_METRICS, self.companies)
+
+    @view_frame(*(f"derived:{m}" for m in DERIVED_INPUTS))
+    def ratios(self):
+        return self.data.derived.wide(self.fiscal_year, companies=self.companies)
+
+    @view_frame(
+        "facts:aum_total", "facts:aum_etf", "facts:aum_alternatives",
+        "derived:etf_share_pct", "derived:alts_share_pct",
+        "company_info:Tech_Score", "company_info:Fee_Level", "company_info:Model",
+    )
+    def overview(self):
+        kpi, ratios = self.kpi, self.ratios
+        info = self.data.company_info.reindex(self.companies)
+        return pd.DataFrame(
+            {
+                "Company": self.companies,
+                "AUM_Tn": (kpi["aum_total"] / 1e6).values,
+                "ETF_AUM_Tn": (kpi["aum_etf"] / 1e6).values,
+                "Alternatives_AUM_Tn": (kpi["aum_alternatives"] / 1e6).values,
+                "ETF_Share_%": ratios["etf_share_pct"].values,
+                "Alts_Share_%": ratios["alts_share_pct"].values,
+                "Tech_Score": info["Tech_Score"].values,
+                "Fee_Level": info["Fee_Level"].values,
+                "Model": info["Model"].values,
+            }
+        )
+
+    @view_frame(
+        "facts:revenue", "facts:net_income", "facts:total_assets", "facts:equity",
+        "derived:op_margin_pct", "derived:roe_pct", "derived:roa_pct", "derived:fee_yield_bps",
+        "derived:revenue_growth_pct", "derived:net_income_growth_pct",
+    )
+    def financials(self):
+        kpi, ratios = self.kpi, self.ratios
+        return pd.DataFrame(
+            {
+                "Company": self.companies,
+                "Revenue_Bn": (kpi["revenue"] / 1e3).values,
+                "Net_Income_Bn": (kpi["net_income"] / 1e3).values,
+                "Op_Margin_%": ratios["op_margin_pct"].values,
+                "ROE_%": ratios["roe_pct"].values,
+                "ROA_%": ratios["roa_pct"].values,
+                "Fee_Yield_bps": ratios["fee_yield_bps"].values,
+                "Revenue_Growth_%": ratios["revenue_growth_pct"].values,
+                "Net_Income_Growth_%": ratios["net_income_growth_pct"].values,
+                "Total_Assets_Bn": (kpi["total_assets"] / 1e3).values,
+                "Equity_Bn": (kpi["equity"] / 1e3).values,
+            }
+        )
+
+    @view_frame(
+        "facts:aum_equity", "facts:aum_fixed_income", "facts:aum_multi_asset",
+        "facts:aum_cash", "facts:aum_alternatives",
+    )
+    def product_mix(self):
+        kpi = self.kpi
+        return pd.DataFrame(
+            {
+                "Company": self.companies,
+                "Equity_Tn": (kpi["aum_equity"] / 1e6).values,
+                "Fixed_Income_Tn": (kpi["aum_fixed_income"] / 1e6).values,
+                "Multi_Asset_Tn": (kpi["aum_multi_asset"] / 1e6).values,
+                "Cash_Tn": (kpi["aum_cash"] / 1e6).values,
+                "Alternatives_Tn": (kpi["aum_alternatives"] / 1e6).values,
+            }
+        )
+
+    @view_frame("risk_scores")
+    def risk_matrix(self):
+        risk_matrix = self.data.risk_scores.reindex(self.companies).dropna(how="all")
+        risk_matrix.index.name = None
+        return risk_matrix
+
+
+_lock = threading.Lock()
+_cached = None
+_theme_css = (None, None)
+
+
+def files_version(paths):
+    """Cheap version key from file sizes and modification times."""
+    digest = hashlib.sha1()
+    for path in paths:
+        stat = path.stat()
+        digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:12]
+
+
+def dataset_version():
+    return files_version(DATASET_FILES.values())
+
+
+def _same_axes(a, b):
+    return all(
+        np.array_equal(getattr(a, axis), getattr(b, axis)) for axis in ("companies", "years", "metrics")
+    )
+
+
+@instrument("data_load", "datasets")
+def _build_datasets(version, previous=None):
+    company_info = pd.read_parquet(DATASET_FILES["companies"]).set_index("Company")
+    risk_scores = pd.read_parquet(DATASET_FILES["risk_scores"]).set_index("Company")
+    store = FactStore.from_parquet(DATASET_FILES["facts"])
+    tables = {"company_info": company_info, "risk_scores": risk_scores}
+
+    # A correction to a few firms only re-derives their metrics
+    changed = None
+    if previous is not None and _same_axes(previous.store, store):
+        rows = depgraph.changed_rows(previous.store.values, store.values)
+        derived = update_metrics(previous.derived, store, rows)
+        fingerprints = depgraph.Fingerprints({"facts": store, "derived": derived}, tables, store.companies)
+        changed = {
+            node: store.companies[r].tolist() for node, r in fingerprints.changes(previous.fingerprints).items()
+        }
+    else:
+        derived = derive_metrics(store)
+        fingerprints = depgraph.Fingerprints({"facts": store, "derived": derived}, tables, store.companies)
+
+    return Datasets(
+        version=version,
+        store=store,
+        derived=derived,
+        company_info=company_info,
+        risk_scores=risk_scores,
+        tracked_companies=company_info.index.tolist(),
+        fingerprints=fingerprints,
+        changed=changed,
+    )
+
+
+def _build_view(data, fiscal_year, companies):
+    # Only resolves the selection, page frames are built when a page first reads them
+    companies = [c for c in companies if c in data.store.company_index]
+    selection = hashlib.sha1("\x1f".join(companies).encode()).hexdigest()[:8]
+    return View(
+        version=f"{data.version}:{fiscal_year}:{selection}",
+        fiscal_year=fiscal_year,
+        companies=companies,
+        selection=selection,
+        data=data,
+    )
+
+
+def shared_frame(node, version, build):
+    """Frame of a graph node, built once per node version and shared by every view."""
+    return cached("frames", (node, version), build)
+
+
+def load_datasets():
+    """Return the shared Datasets, rebuilding only when the files changed."""
+    global _cached
+    version = dataset_version()
+    cached = _cached
+    if cached is not None and cached.version == version:
+        return cached
+    with _lock:
+        # Another session may have rebuilt while we waited for the lock
+        if _cached is None or _cached.version != version:
+            _cached = _build_datasets(version, previous=_cached)
+            # Views and the cube hold the previous datasets, frames are versioned by content
+            for namespace in ("datasets", "views", "cube"):
+                CACHE.discard(namespace)
+            CACHE.put("datasets", version, _cached, pinned=True)
+        return _cached
+
+
+def load_view(data, fiscal_year=None, companies=None):
+    """Page frames for a year and firm set, shared across sessions with the same selection."""
+    fiscal_year = data.latest_year if fiscal_year is None else int(fiscal_year)
+    companies = tuple(data.tracked_companies if companies is None else companies)
+    key = (data.version, fiscal_year, companies)
+    return cached("views", key, lambda: _build_view(data, fiscal_year, list(companies)))
+
+
+def clear_caches():
+    """Drop the shared datasets and views, so the next run builds them from scratch."""
+    global _cached
+    with _lock:
+        _cached = None
+        for namespace in ("datasets", "views", "cube", "frames"):
+            CACHE.discard(namespace)
+
+
+def load_theme_css():
+    global _theme_css
+    version = files_version([THEME_CSS_PATH])
+    if _theme_css[0] != version:
+        _theme_css = (version, THEME_CSS_PATH.read_text(encoding="utf-8"))
+    return _theme_css[1]
@@ -0,0 +1,90 @@
+"""
+Derived metrics computed from raw facts in one batched NumPy pass.
+"""
+
+import numpy as np
+
+import depgraph
+from factstore import FactStore
+
+
+# name: (numerator, denominator, scale)
+RATIO_METRICS = {
+    "op_margin_pct": ("operating_income", "revenue", 100),
+    "roe_pct": ("net_income", "equity", 100),
+    "roa_pct": ("net_income", "total_assets", 100),
+    "etf_share_pct": ("aum_etf", "aum_total", 100),
+    "alts_share_pct": ("aum_alternatives", "aum_total", 100),
+    # Revenue per dollar of AUM, in basis points
+    "fee_yield_bps": ("revenue", "aum_total", 1e4),
+}
+
+# Year-over-year growth in %, only between consecutive fiscal years
+GROWTH_METRICS = {
+    "revenue_growth_pct": "revenue",
+    "net_income_growth_pct": "net_income",
+    "aum_growth_pct": "aum_total",
+}
+
+
+# Raw metrics behind each derived metric, as dependency-graph nodes
+DERIVED_INPUTS = {name: (num, den) for name, (num, den, _) in RATIO_METRICS.items()}
+DERIVED_INPUTS.update({name: (base,) for name, base in GROWTH_METRICS.items()})
+for name, inputs in DERIVED_INPUTS.items():
+    depgraph.add_node(f"derived:{name}", [f"facts:{m}" for m in inputs])
+
+
+def _codes(store, names):
+    """Metric codes for the names, -1 where the raw metric is not in the store."""
+    return store.metric_index.get_indexer(list(names))
+
+
+def _gather(values, codes):
+    # Missing raw metrics become all-NaN planes instead of failing the whole batch
+    out = values[:, :, np.maximum(codes, 0)]
+    out[:, :, codes < 0] = np.nan
+    return out
+
+
+def _derive(store, values):
+    n_companies, n_years, _ = values.shape
+
+    names = list(RATIO_METRICS) + list(GROWTH_METRICS)
+    derived = np.full((n_companies, n_years, len(names)), np.nan)
+
+    # Ratios: one gather for all numerators, one for all denominators
+    num = _gather(values, _codes(store, [v[0] for v in RATIO_METRICS.values()]))
+    den = _gather(values, _codes(store, [v[1] for v in RATIO_METRICS.values()]))
+    scale = np.array([v[2] for v in RATIO_METRICS.values()], dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = num / den * scale
+    ratios[~np.isfinite(ratios)] = np.nan
+    derived[:, :, : len(RATIO_METRICS)] = ratios
+
+    # Growth: compare each year with the previous one where the years are adjacent
+    if n_years > 1:
+        base = _gather(values, _codes(store, GROWTH_METRICS.values()))
+        adjacent = np.diff(store.years) == 1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            growth = (base[:, 1:] / np.abs(base[:, :-1]) - np.sign(base[:, :-1])) * 100
+        growth[:, ~adjacent] = np.nan
+        growth[~np.isfinite(growth)] = np.nan
+        derived[:, 1:, len(RATIO_METRICS):] = growth
+
+    return names, derived
+
+
+def derive_metrics(store):
+    names, derived = _derive(store, store.values)
+    return FactStore.from_arrays(store.companies, store.years, names, derived)
+
+
+def update_metrics(derived, store, rows):
+    """derive_metrics(store) recomputing only the given company rows of a previous result.
+
+    derived must come from a store on the same axes.
+    """
+    values = derived.values.copy()
+    if len(rows):
+        values[rows] = _derive(store, store.values[rows])[1]
+    return FactStore.from_arrays(store.companies, store.years, derived.metrics, values)
@@ -0,0 +1,136 @@
+"""
+Qualitative notes from the written report: technology profiles, SWOT analyses and business models.
+"""
+
+# Technology profiles
+tech_profiles = {
+    "BlackRock": {
+        "Platform": "Aladdin + eFront + Preqin",
+        "Positioning": "Enterprise investment OS / data platform",
+        "Highlights": [
+            "Used by internal teams and external clients",
+            "AI copilots and private markets integration",
+            "Key differentiator and revenue source",
+        ],
+    },
+    "State Street": {
+        "Platform": "State Street Alpha (incl. Charles River Development)",
+        "Positioning": "Front-to-back institutional servicing platform",
+        "Highlights": [
+            "Integrates portfolio mgmt, trading, and servicing",
+            "Deeply embedded with large institutions",
+            "Supports complex multi-asset / alternatives",
+        ],
+    },
+    "Invesco": {
+        "Platform": "Embedded next-gen tech (no standalone platform)",
+        "Positioning": "Tech-enabled global investment manager",
+        "Highlights": [
+            "Quant models and analytics in investment process",
+            "Focus on efficiency and client experience",
+            "No external platform like Aladdin/Alpha (yet)",
+        ],
+    },
+}
+
+# SWOT data
+swot_data = [
+    {
+        "Company": "BlackRock",
+        "Strengths": [
+            "Largest global AUM (> $11.5T)",
+            "Dominant ETF franchise (iShares)",
+            "Aladdin technology and data moat",
+            "Broad product spectrum (active + passive + alts)",
+        ],
+        "Weaknesses": [
+            "High regulatory scrutiny and SIFI risk",
+            "Integration risk from large acquisitions",
+            "Fee pressure in core ETF business",
+        ],
+        "Opportunities": [
+            "Private markets & infrastructure growth",
+            "AI & data monetization via Aladdin + Preqin",
+            "International and wealth channel expansion",
+        ],
+        "Threats": [
+            "ETF fee wars with Vanguard & others",
+            "Regulatory constraints on size and data",
+            "Market downturn impacting AUM and fees",
+        ],
+    },
+    {
+        "Company": "State Street",
+        "Strengths": [
+            "Top-tier global custodian with $46T+ AUC/A",
+            "Alpha platform drives front-to-back stickiness",
+            "Deep institutional relationships",
+        ],
+        "Weaknesses": [
+            "Lower margins vs pure asset managers",
+            "High dependency on interest-rate-sensitive NII",
+            "Limited retail presence",
+        ],
+        "Opportunities": [
+            "Servicing of alternatives and private assets",
+            "Wealth and data-driven services",
+            "More Alpha mandates from large asset owners",
+        ],
+        "Threats": [
+            "Regulatory burden as a G-SIB",
+            "Custody fee pressure and competition",
+            "Operational and cyber risk in complex stack",
+        ],
+    },
+    {
+        "Company": "Invesco",
+        "Strengths": [
+            "Independent global asset manager",
+            "Strong ETF and QQQ franchise",
+            "Diversified product and geography mix",
+        ],
+        "Weaknesses": [
+            "Smaller scale vs mega-managers",
+            "Exposure to fee and margin pressure",
+            "Less differentiated technology platform",
+        ],
+        "Opportunities": [
+            "APAC and ETF expansion",
+            "Scaling private markets and global liquidity",
+            "Cost efficiency and operating leverage",
+        ],
+        "Threats": [
+            "Intense competition from BlackRock/Vanguard",
+            "Market volatility impacting active flows",
+            "Regulation and distribution changes",
+        ],
+    },
+]
+
+# Business model snippets
+business_models = {
+    "BlackRock": {
+        "Model": "Global asset manager focused on Retail, iShares (ETFs) and Institutional",
+        "Key_Pillars": [
+            "Scale-driven AUM model",
+            "Technology & data (Aladdin) as second growth engine",
+            "Strategic push into private markets & infrastructure",
+        ],
+    },
+    "State Street": {
+        "Model": "Custody and investment servicing bank + asset manager (SSGA)",
+        "Key_Pillars": [
+            "Investment Servicing as foundation (custody, FX, lending)",
+            "Alpha platform integrating front-to-back processes",
+            "Institutional client depth and recurring relationships",
+        ],
+    },
+    "Invesco": {
+        "Model": "Independent global investment manager across active, passive, ETFs & alternatives",
+        "Key_Pillars": [
+            "Balanced retail and institutional footprint",
+            "Scaling high-conviction franchises (e.g., QQQ)",
+            "Embedding next-generation technology internally",
+        ],
+    },
+}
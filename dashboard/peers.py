@@ -0,0 +1,133 @@
+"""
+Peer finder: nearest competitors by scale, margins, returns and asset-class mix.
+"""
+
+
+import numpy as np
+import pandas as pd
+
+import depgraph
+from clustering import kmeans
+from sharedcache import cached
+
+
+BRUTE_FORCE_MAX = 50_000
+NPROBE = 8
+
+# feature: (group, source frame, column); scale features are log-transformed
+PEER_FEATURES = {
+    "log_aum": ("scale", "overview", "AUM_Tn"),
+    "log_revenue": ("scale", "financials", "Revenue_Bn"),
+    "op_margin": ("profitability", "financials", "Op_Margin_%"),
+    "fee_yield": ("profitability", "financials", "Fee_Yield_bps"),
+    "roe": ("returns", "financials", "ROE_%"),
+    "roa": ("returns", "financials", "ROA_%"),
+    "etf_share": ("mix", "overview", "ETF_Share_%"),
+    "equity_share": ("mix", "product_mix", "Equity_Tn"),
+    "fixed_income_share": ("mix", "product_mix", "Fixed_Income_Tn"),
+    "multi_asset_share": ("mix", "product_mix", "Multi_Asset_Tn"),
+    "cash_share": ("mix", "product_mix", "Cash_Tn"),
+    "alternatives_share": ("mix", "product_mix", "Alternatives_Tn"),
+}
+
+METRICS = ("cosine", "euclidean")
+
+depgraph.add_node("peers", ("overview", "financials", "product_mix"))
+
+
+def peer_features(view):
+    """Raw feature frame indexed by company, firms without any feature are dropped."""
+    frames = {"overview": view.overview, "financials": view.financials, "product_mix": view.product_mix}
+    mix = view.product_mix.drop(columns="Company")
+    mix_total = mix.sum(axis=1, min_count=1).replace(0, np.nan).to_numpy()
+
+    columns = {}
+    for feature, (_, frame, column) in PEER_FEATURES.items():
+        values = frames[frame][column].to_numpy(dtype=float)
+        if feature.startswith("log_"):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = np.log10(np.where(values > 0, values, np.nan))
+        elif frame == "product_mix":
+            values = values / mix_total * 100
+        columns[feature] = values
+    features = pd.DataFrame(columns, index=pd.Index(view.companies, name="Company"))
+    return features.dropna(how="all")
+
+
+def _normalize(features):
+    values = features.to_numpy(dtype=float)
+    mean = np.nanmean(values, axis=0)
+    std = np.nanstd(values, axis=0)
+    std[~(std > 0)] = 1.0
+    z = np.nan_to_num((values - mean) / std)
+    groups = [PEER_FEATURES[f][0] for f in features.columns]
+    group_sizes = pd.Series(groups).value_counts()
+    weights = np.array([1 / np.sqrt(group_sizes[g]) for g in groups])
+    return z * weights
+
+
+class PeerIndex:
+    def __init__(self, features, metric="cosine"):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}, expected one of {METRICS}")
+        self.metric = metric
+        self.features = features
+        self.companies = features.index
+        vectors = _normalize(features)
+        if metric == "cosine":
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+        self.vectors = vectors
+        self.sq_norms = np.einsum("ij,ij->i", vectors, vectors)
+
+        # Inverted-file partitions: rows sorted by k-means cell, cell c is rows[offsets[c]:offsets[c + 1]]
+        self.centroids = None
+        if len(vectors) > BRUTE_FORCE_MAX:
+            labels, self.centroids = kmeans(vectors, int(np.sqrt(len(vectors))), iterations=10)
+            self.rows = np.argsort(labels, kind="stable")
+            self.offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=len(self.centroids)))])
+
+    def __len__(self):
+        return len(self.vectors)
+
+    @property
+    def partitioned(self):
+        return self.centroids is not None
+
+    def _candidates(self, q):
+        if not self.partitioned:
+            return None
+        d2 = ((self.centroids - q) ** 2).sum(axis=1)
+        cells = np.argpartition(d2, min(NPROBE, len(d2)) - 1)[:NPROBE]
+        return np.concatenate([self.rows[self.offsets[c]:self.offsets[c + 1]] for c in cells])
+
+    def query(self, company, k=10):
+        """Top-k peers of a firm: Company, score (cosine similarity or distance) and raw features."""
+        target = self.companies.get_loc(company)
+        q = self.vectors[target]
+        rows = self._candidates(q)
+        vectors = self.vectors if rows is None else self.vectors[rows]
+        if self.metric == "cosine":
+            scores = vectors @ q
+            rank = -scores
+        else:
+            sq_norms = self.sq_norms if rows is None else self.sq_norms[rows]
+            scores = np.sqrt(np.maximum(sq_norms - 2 * vectors @ q + q @ q, 0))
+            rank = scores
+        positions = np.arange(len(vectors)) if rows is None else rows
+        rank = np.where(positions == target, np.inf, rank)
+
+        k = min(k, len(rank) - 1)
+        if k <= 0:
+            return pd.DataFrame(columns=["Company", "score", *self.features.columns])
+        top = np.argpartition(rank, k - 1)[:k]
+        top = top[np.argsort(rank[top], kind="stable")]
+        result = self.features.iloc[positions[top]].reset_index()
+        result.insert(1, "score", scores[top])
+        return result
+
+
+def peer_index(view, metric="cosine"):
+    """Index over a view's firms, rebuilt only when its input frames change."""
+    key = (view.node_version("peers"), metric)
+    return cached("peers", key, lambda: PeerIndex(peer_features(view), metric))
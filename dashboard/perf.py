@@ -0,0 +1,200 @@
+"""
+Render timings per run and per process, with the Prometheus export.
+"""
+
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+METRICS_FILE = os.environ.get("CI_METRICS_FILE")
+METRICS_PORT = int(os.environ.get("CI_METRICS_PORT", "0"))
+# Minimum seconds between two rewrites of the metrics file
+METRICS_FILE_INTERVAL = 10
+SAMPLE_WINDOW = 2048
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Series:
+    def __init__(self):
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+        self.count = 0
+        self.total = 0.0
+
+
+_lock = threading.Lock()
+_series = defaultdict(Series)
+_local = threading.local()
+_last_file_write = 0.0
+_server = None
+
+
+# ----------------------------------------------------
+# RECORDING
+# ----------------------------------------------------
+def begin_run():
+    """Start a new trace for the script run on this thread and return it."""
+    _local.trace = []
+    return _local.trace
+
+
+def current_trace():
+    return getattr(_local, "trace", None)
+
+
+def record(kind, name, seconds):
+    trace = current_trace()
+    if trace is not None:
+        trace.append((kind, name, seconds))
+    with _lock:
+        series = _series[(kind, name)]
+        series.samples.append(seconds)
+        series.count += 1
+        series.total += seconds
+
+
+@contextmanager
+def timed(kind, name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(kind, name, time.perf_counter() - started)
+
+
+def instrument(kind, name=None):
+    """Decorator recording each call of the function as a span."""
+
+    def wrap(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(kind, label):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return wrap
+
+
+# ----------------------------------------------------
+# AGGREGATES & EXPORT
+# ----------------------------------------------------
+def snapshot():
+    """{(kind, name): (count, total_seconds, quantile values)} over the recent sample window."""
+    with _lock:
+        items = [(key, s.count, s.total, np.asarray(s.samples)) for key, s in _series.items()]
+    return {key: (count, total, np.quantile(samples, QUANTILES)) for key, count, total, samples in items}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text():
+    lines = [
+        "# HELP ci_dashboard_duration_seconds Duration of dashboard pages, renders, figure builds and data loads.",
+        "# TYPE ci_dashboard_duration_seconds summary",
+    ]
+    for (kind, name), (count, total, quantiles) in sorted(snapshot().items()):
+        labels = f'kind="{_escape(kind)}",name="{_escape(name)}"'
+        for q, value in zip(QUANTILES, quantiles):
+            lines.append(f'ci_dashboard_duration_seconds{{{labels},quantile="{q}"}} {value:.6f}')
+        lines.append(f"ci_dashboard_duration_seconds_sum{{{labels}}} {total:.6f}")
+        lines.append(f"ci_dashboard_duration_seconds_count{{{labels}}} {count}")
+    return "\n".join(lines + cache_metrics()) + "\n"
+
+
+def cache_metrics():
+    """Gauges and counters of the shared cache, per namespace and per active session."""
+    from sharedcache import CACHE
+
+    lines = [
+        "# HELP ci_dashboard_cache_budget_bytes Memory budget of the shared cache.",
+        "# TYPE ci_dashboard_cache_budget_bytes gauge",
+        f"ci_dashboard_cache_budget_bytes {CACHE.max_bytes}",
+    ]
+    stats = CACHE.stats()
+    for metric, column, kind, help_text in (
+        ("cache_bytes", "bytes", "gauge", "Bytes held by the shared cache."),
+        ("cache_entries", "entries", "gauge", "Entries in the shared cache."),
+        ("cache_hits_total", "hits", "counter", "Shared cache hits."),
+        ("cache_misses_total", "misses", "counter", "Shared cache misses."),
+        ("cache_evictions_total", "evictions", "counter", "Entries evicted to stay within the budget."),
+    ):
+        lines += [f"# HELP ci_dashboard_{metric} {help_text}", f"# TYPE ci_dashboard_{metric} {kind}"]
+        lines += [f'ci_dashboard_{metric}{{namespace="{_escape(row["namespace"])}"}} {row[column]}' for row in stats]
+    lines += [
+        "# HELP ci_dashboard_session_cache_bytes Shared-cache bytes used by a session, and used by it alone.",
+        "# TYPE ci_dashboard_session_cache_bytes gauge",
+    ]
+    for row in CACHE.session_usage():
+        session = _escape(row["session"])
+        lines.append(f'ci_dashboard_session_cache_bytes{{session="{session}",scope="used"}} {row["bytes"]}')
+        lines.append(
+            f'ci_dashboard_session_cache_bytes{{session="{session}",scope="exclusive"}} {row["exclusive_bytes"]}'
+        )
+    return lines
+
+
+def write_metrics_file(path=None, force=False):
+    """Rewrite the metrics file atomically, at most every METRICS_FILE_INTERVAL seconds."""
+    global _last_file_write
+    path = path or METRICS_FILE
+    if not path:
+        return
+    now = time.monotonic()
+    if not force and now - _last_file_write < METRICS_FILE_INTERVAL:
+        return
+    _last_file_write = now
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_metrics(port=None):
+    """Serve /metrics on localhost from a daemon thread, once per process."""
+    global _server
+    port = port or METRICS_PORT
+    if not port or _server is not None:
+        return
+    with _lock:
+        if _server is not None:
+            return
+        try:
+            _server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+        except OSError as exc:
+            print(f"perf: cannot serve metrics on port {port}: {exc}")
+            _server = False
+            return
+    threading.Thread(target=_server.serve_forever, name="ci-metrics", daemon=True).start()
+
+
+def end_run():
+    """Export the aggregates after a script run, as configured by the environment."""
+    serve_metrics()
+    write_metrics_file()
@@ -0,0 +1,112 @@
+"""
+Startup profile of the dashboard: import time and time to first paint.
+
+Usage:
+    python dashboard/profiler.py [--page Financials] [--runs 3]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+DASHBOARD_DIR = Path(__file__).resolve().parent
+ENABLED = os.environ.get("CI_PROFILE_STARTUP") == "1"
+
+_runs = 0
+LAST_PROFILE = None
+
+
+class StartupProfile:
+    def __init__(self, started):
+        global _runs
+        self.started = started
+        self.cold = _runs == 0
+        _runs += 1
+        self.marks = []
+        self.modules = len(sys.modules)
+
+    def mark(self, label):
+        """Record the time since the run started, and the modules imported since the last mark."""
+        modules = len(sys.modules)
+        self.marks.append((label, (time.perf_counter() - self.started) * 1000, modules - self.modules))
+        self.modules = modules
+
+    def as_dict(self):
+        return {
+            "cold": self.cold,
+            "marks": [{"label": label, "ms": round(ms, 1), "new_modules": new} for label, ms, new in self.marks],
+        }
+
+    def summary(self):
+        steps = " · ".join(f"{label} {ms:.0f} ms" for label, ms, _ in self.marks)
+        return f"startup profile ({'cold' if self.cold else 'warm'}): {steps}"
+
+    def report(self, st, enabled=False):
+        global LAST_PROFILE
+        LAST_PROFILE = self.as_dict()
+        if not (enabled or ENABLED):
+            return
+        print(self.summary(), flush=True)
+        with st.sidebar.expander("⏱ Startup profile", expanded=True):
+            st.caption("cold start" if self.cold else "warm rerun")
+            for label, ms, new in self.marks:
+                st.markdown(f"**{label}**: {ms:.0f} ms" + (f" · {new} modules imported" if new else ""))
+
+
+# ----------------------------------------------------
+# COLD START MEASUREMENT
+# ----------------------------------------------------
+def _child(page):
+    started = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    streamlit_ms = (time.perf_counter() - started) * 1000
+    sys.path.insert(0, str(DASHBOARD_DIR))
+    at = AppTest.from_file(str(DASHBOARD_DIR / "app.py"), default_timeout=120)
+    if page:
+        at.query_params["view"] = page
+    at.run()
+    if at.exception:
+        raise SystemExit(f"app raised: {at.exception}")
+    import profiler
+
+    print(json.dumps({"streamlit_ms": round(streamlit_ms, 1), **profiler.LAST_PROFILE}))
+
+
+def measure(page=None, runs=3):
+    """Run the app once per fresh interpreter and return each run's profile."""
+    results = []
+    for _ in range(runs):
+        cmd = [sys.executable, str(Path(__file__).resolve()), "--child"] + (["--page", page] if page else [])
+        out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the dashboard's cold start in fresh interpreters.")
+    parser.add_argument("--page", default=None, help="page to open, as in ?view= (default: Overview)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.page)
+        return
+
+    results = measure(args.page, args.runs)
+    labels = [m["label"] for m in results[0]["marks"]]
+    print(f"{'step':<14}" + "".join(f"{'run ' + str(i + 1):>10}" for i in range(len(results))) + f"{'best':>10}")
+    rows = [("streamlit", [r["streamlit_ms"] for r in results])]
+    rows += [(label, [r["marks"][i]["ms"] for r in results]) for i, label in enumerate(labels)]
+    for label, values in rows:
+        print(f"{label:<14}" + "".join(f"{v:>8.0f}ms" for v in values) + f"{min(values):>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
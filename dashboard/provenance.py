@@ -0,0 +1,200 @@
+"""
+Page-level random access into the filings, for KPI provenance drill-down.
+
+Usage:
+    python dashboard/provenance.py build
+    python dashboard/provenance.py page blackrock_10k_2024.pdf 45
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from sharedcache import cached
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = REPO_ROOT / "data"
+MANIFEST_PATH = DATA_DIR / "filings.json"
+PROCESSED_DIR = DATA_DIR / "processed"
+PAGE_INDEX_DIR = PROCESSED_DIR / "page_index"
+PREVIEW_DIR = PROCESSED_DIR / "previews"
+
+# Page-tree attributes a page inherits from its ancestors (PDF 1.7, 7.7.3.4)
+INHERITABLE = ("/Resources", "/MediaBox", "/CropBox", "/Rotate")
+
+
+# The lookup path does not import ingest.py, which pulls in pypdf
+def _filing_paths():
+    """{file name: path} of every filing in the manifest."""
+    with open(MANIFEST_PATH, encoding="utf-8") as f:
+        filings = json.load(f)["filings"]
+    return {Path(f["file"]).name: DATA_DIR / f["file"] for f in filings}
+
+
+# ----------------------------------------------------
+# BUILD
+# ----------------------------------------------------
+def build_page_index(path, sha, out_dir=None):
+    from pypdf import PdfReader
+
+    from ingest import atomic_write, load_page_texts
+
+    out_dir = out_dir or PAGE_INDEX_DIR / sha
+    encoded = [text.encode("utf-8") for text in load_page_texts(path, sha)]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    refs = [page.indirect_reference for page in PdfReader(path).pages]
+    objects = np.array([(ref.idnum, ref.generation) for ref in refs], dtype=np.int64).reshape(-1, 2)
+
+    def save(name, array):
+        def write(tmp):
+            with open(tmp, "wb") as f:
+                np.save(f, array)
+
+        atomic_write(out_dir / name, write)
+
+    # offsets.npy is written last: its presence marks a complete index
+    atomic_write(out_dir / "text.bin", lambda tmp: tmp.write_bytes(b"".join(encoded)))
+    save("objects.npy", objects)
+    save("offsets.npy", offsets)
+    return out_dir
+
+
+def build_all(force=False):
+    for name, path in _filing_paths().items():
+        sha = _filing_sha(path)
+        if force or not (PAGE_INDEX_DIR / sha / "offsets.npy").exists():
+            started = time.perf_counter()
+            build_page_index(path, sha)
+            print(f"  {name}: {time.perf_counter() - started:.2f}s")
+
+
+# ----------------------------------------------------
+# RANDOM ACCESS
+# ----------------------------------------------------
+class PageIndex:
+    def __init__(self, path, sha):
+        self.path = path
+        self.sha = sha
+        directory = PAGE_INDEX_DIR / sha
+        if not (directory / "offsets.npy").exists():
+            build_page_index(path, sha, directory)
+        self.offsets = np.load(directory / "offsets.npy")
+        self.objects = np.load(directory / "objects.npy")
+        text_path = directory / "text.bin"
+        self.text = (
+            np.memmap(text_path, dtype=np.uint8, mode="r") if text_path.stat().st_size else np.zeros(0, np.uint8)
+        )
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def _check(self, page):
+        if not 1 <= page <= len(self):
+            raise IndexError(f"{self.path.name} has {len(self)} pages, no page {page}")
+
+    def page_text(self, page):
+        """Text of a 1-based page, read from the memory-mapped blob."""
+        self._check(page)
+        return bytes(self.text[self.offsets[page - 1]:self.offsets[page]]).decode("utf-8")
+
+    def _page_object(self, page):
+        from pypdf import PageObject
+        from pypdf.generic import IndirectObject, NameObject
+
+        if self._reader is None:
+            from pypdf import PdfReader
+
+            # Opening reads the trailer and cross-reference table only
+            self._reader = PdfReader(self.path)
+        reader = self._reader
+        idnum, generation = (int(n) for n in self.objects[page - 1])
+        ref = IndirectObject(idnum, generation, reader)
+        page_object = PageObject(reader, ref)
+        page_object.update(ref.get_object())
+        parent = page_object.get("/Parent")
+        while parent is not None:
+            parent = parent.get_object()
+            for key in INHERITABLE:
+                if key not in page_object and key in parent:
+                    page_object[NameObject(key)] = parent[key]
+            parent = parent.get("/Parent")
+        return page_object
+
+    def preview(self, page):
+        """Single-page PDF of a page, written to the preview cache on first request."""
+        self._check(page)
+        path = PREVIEW_DIR / self.sha / f"{page:05d}.pdf"
+        if not path.exists():
+            from pypdf import PdfWriter
+
+            from ingest import atomic_write
+
+            with self._lock:
+                writer = PdfWriter()
+                writer.add_page(self._page_object(page))
+                buffer = io.BytesIO()
+                writer.write(buffer)
+            atomic_write(path, lambda tmp: tmp.write_bytes(buffer.getvalue()))
+        return path.read_bytes()
+
+
+_shas = {}
+
+
+def _filing_sha(path):
+    # Same content hash as ingest.file_sha256, recomputed only when the file changed
+    stat = path.stat()
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    sha = _shas.get(key)
+    if sha is None:
+        with open(path, "rb") as f:
+            sha = _shas[key] = hashlib.file_digest(f, "sha256").hexdigest()
+    return sha
+
+
+def page_index(source):
+    """Page index of a filing by file name, None when the filing is not in the manifest."""
+    path = _filing_paths().get(source)
+    if path is None or not path.exists():
+        return None
+    sha = _filing_sha(path)
+    return cached("page_index", sha, lambda: PageIndex(path, sha))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or read the per-filing page indexes.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="index every filing in data/filings.json")
+    build.add_argument("--force", action="store_true", help="rebuild existing indexes")
+    page = sub.add_parser("page", help="print one page and time the lookup")
+    page.add_argument("source")
+    page.add_argument("page", type=int)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_all(force=args.force)
+        return
+
+    started = time.perf_counter()
+    index = page_index(args.source)
+    if index is None:
+        parser.error(f"{args.source} is not a filing in data/filings.json")
+    text = index.page_text(args.page)
+    text_ms = (time.perf_counter() - started) * 1000
+    preview = index.preview(args.page)
+    total_ms = (time.perf_counter() - started) * 1000
+    print(text)
+    print(f"page text in {text_ms:.1f} ms, preview ({len(preview):,} bytes) in {total_ms - text_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Monte Carlo market-shock simulator on the product mix.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+import depgraph
+from sharedcache import cached
+
+
+ASSET_CLASSES = {
+    "Equity": "Equity_Tn",
+    "Fixed Income": "Fixed_Income_Tn",
+    "Multi-Asset": "Multi_Asset_Tn",
+    "Cash": "Cash_Tn",
+    "Alternatives": "Alternatives_Tn",
+}
+
+# Mean shock and volatility in %, per asset class
+DEFAULT_SHOCKS = (-20.0, -5.0, -12.0, 0.0, -15.0)
+DEFAULT_VOLS = (15.0, 5.0, 9.0, 1.0, 12.0)
+BASE_CORRELATION = np.array(
+    [
+        [1.00, 0.20, 0.85, 0.00, 0.60],
+        [0.20, 1.00, 0.50, 0.10, 0.15],
+        [0.85, 0.50, 1.00, 0.05, 0.55],
+        [0.00, 0.10, 0.05, 1.00, 0.00],
+        [0.60, 0.15, 0.55, 0.00, 1.00],
+    ]
+)
+
+CHUNK_CELLS = 2_000_000
+# Firm-path cells per simulation: large universes get fewer paths per firm, never below
+# MIN_PATHS. Their histogram bins are wider too, so the extra paths would not show
+SIM_MAX_CELLS = 500_000_000
+MIN_PATHS = 10_000
+# Histograms of the % AUM change over [-100, 100]: 0.1 pp bins for small
+# universes, coarser above HIST_CELLS / 2000 firms so memory stays bounded
+HIST_RANGE = (-100.0, 100.0)
+HIST_MAX_BINS = 2000
+HIST_MIN_BINS = 100
+HIST_CELLS = 4_000_000
+TAIL = 0.05
+
+depgraph.add_node("scenarios", ("product_mix", "financials"))
+
+
+@dataclass(frozen=True)
+class Scenario:
+    shocks: tuple = DEFAULT_SHOCKS
+    vols: tuple = DEFAULT_VOLS
+    # 0 keeps BASE_CORRELATION, 1 makes every asset class perfectly correlated
+    correlation_stress: float = 0.0
+    paths: int = 100_000
+    # Student-t degrees of freedom for fat tails, None for Gaussian
+    tail_df: int = None
+    seed: int = 0
+
+    def cholesky(self):
+        corr = (1 - self.correlation_stress) * BASE_CORRELATION + self.correlation_stress
+        np.fill_diagonal(corr, 1.0)
+        # A tiny ridge keeps the factorization stable at full stress
+        return np.linalg.cholesky(corr + np.eye(len(corr)) * 1e-9)
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    scenario: Scenario
+    # One row per firm: base values, % change quantiles, VaR and expected shortfall
+    summary: pd.DataFrame
+    # (firms, bins) counts of the % AUM change, bin edges in edges
+    histograms: np.ndarray
+    edges: np.ndarray
+    # Paths simulated per firm, at most scenario.paths
+    paths: int
+
+
+def simulated_paths(paths, n_firms):
+    return min(paths, max(MIN_PATHS, SIM_MAX_CELLS // max(n_firms, 1)))
+
+
+def hist_edges(n_firms):
+    bins = int(np.clip(HIST_CELLS // max(n_firms, 1), HIST_MIN_BINS, HIST_MAX_BINS))
+    return np.linspace(*HIST_RANGE, bins + 1)
+
+
+def simulate_returns(scenario, n, rng):
+    """(n, asset classes) correlated returns in %, floored at a total loss."""
+    z = rng.standard_normal((n, len(ASSET_CLASSES))) @ scenario.cholesky().T
+    if scenario.tail_df:
+        z *= np.sqrt(scenario.tail_df / rng.chisquare(scenario.tail_df, (n, 1)))
+    returns = np.asarray(scenario.shocks) + z * np.asarray(scenario.vols)
+    return np.maximum(returns, -100.0)
+
+
+def _quantiles_from_hist(hist, edges, qs):
+    cum = np.cumsum(hist, axis=1)
+    total = cum[:, -1:]
+    out = np.empty((len(hist), len(qs)))
+    for i, q in enumerate(qs):
+        # First bin reaching the quantile, linearly interpolated inside the bin
+        target = q * total
+        b = np.minimum((cum < target).sum(axis=1), hist.shape[1] - 1)
+        before = np.where(b > 0, cum[np.arange(len(hist)), b - 1], 0)
+        inside = hist[np.arange(len(hist)), b]
+        frac = np.divide(target[:, 0] - before, inside, out=np.zeros(len(hist)), where=inside > 0)
+        out[:, i] = edges[b] + frac * (edges[1] - edges[0])
+    return out
+
+
+def _tail_mean_from_hist(hist, edges, q):
+    """Mean of the worst q share of outcomes, from bin centers."""
+    centers = (edges[:-1] + edges[1:]) / 2
+    cum = np.cumsum(hist, axis=1)
+    cutoff = q * cum[:, -1:]
+    before = cum - hist
+    take = np.clip(cutoff - before, 0, hist)
+    return (take * centers).sum(axis=1) / np.maximum(take.sum(axis=1), 1)
+
+
+def run_simulation(view, scenario):
+    mix = view.product_mix.set_index("Company")[list(ASSET_CLASSES.values())].fillna(0.0)
+    mix = mix[mix.sum(axis=1) > 0]
+    aum = mix.sum(axis=1).to_numpy()
+    # float32 halves the memory traffic of the (paths, firms) chunk; bins are 0.1 pp or wider
+    weights = (mix.to_numpy() / aum[:, None]).astype(np.float32)
+    revenue = view.financials.set_index("Company")["Revenue_Bn"].reindex(mix.index).to_numpy()
+
+    n_firms = len(mix)
+    paths = simulated_paths(scenario.paths, n_firms)
+    edges = hist_edges(n_firms)
+    n_bins = len(edges) - 1
+    hist = np.zeros((n_firms, n_bins), dtype=np.int64)
+    total = np.zeros(n_firms)
+    rng = np.random.default_rng(scenario.seed)
+    # At least as many cells as the histogram, which every chunk's bincount writes in full
+    chunk = max(1, max(CHUNK_CELLS, n_firms * n_bins) // max(n_firms, len(ASSET_CLASSES)))
+    offsets = (np.arange(n_firms) * n_bins)[:, None]
+
+    for start in range(0, paths, chunk):
+        n = min(chunk, paths - start)
+        # (firms, n) % change of each firm's AUM on each path; firm-major, so the bincount
+        # below fills one firm's bins at a time instead of jumping across the histogram
+        change = weights @ simulate_returns(scenario, n, rng).astype(np.float32).T
+        total += change.sum(axis=1, dtype=np.float64)
+        # Equal-width bins: the bin index is arithmetic, no search needed
+        change -= np.float32(edges[0])
+        change *= np.float32(n_bins / (edges[-1] - edges[0]))
+        bins = change.astype(np.intp)
+        np.clip(bins, 0, n_bins - 1, out=bins)
+        bins += offsets
+        hist += np.bincount(bins.ravel(), minlength=n_firms * n_bins).reshape(n_firms, n_bins)
+
+    p5, p50, p95 = _quantiles_from_hist(hist, edges, [TAIL, 0.5, 1 - TAIL]).T
+    tail = _tail_mean_from_hist(hist, edges, TAIL)
+    mean = total / max(paths, 1)
+    summary = pd.DataFrame(
+        {
+            "Company": mix.index,
+            "AUM_Tn": aum,
+            "Revenue_Bn": revenue,
+            "Mean_AUM_Change_%": mean,
+            "P5_AUM_Change_%": p5,
+            "Median_AUM_Change_%": p50,
+            "P95_AUM_Change_%": p95,
+            # Losses as positive numbers at the 95% level
+            "AUM_VaR95_Tn": -aum * p5 / 100,
+            "AUM_ES95_Tn": -aum * tail / 100,
+            "Revenue_VaR95_Bn": -revenue * p5 / 100,
+        }
+    )
+    return SimulationResult(scenario=scenario, summary=summary, histograms=hist, edges=edges, paths=paths)
+
+
+def simulate(view, scenario):
+    """Simulation for a view and scenario, shared across reruns and sessions."""
+    key = (view.node_version("scenarios"), scenario)
+    return cached("scenarios", key, lambda: run_simulation(view, scenario))
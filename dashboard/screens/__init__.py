@@ -0,0 +1,36 @@
+"""
+Dashboard pages, one module per sidebar entry, imported when first opened.
+"""
+
+import importlib
+from dataclasses import dataclass
+
+
+# Sidebar entry: module in this package, in sidebar order. (Not a pages/ package: Streamlit
+# would treat pages/ next to app.py as its own multipage app.)
+PAGES = {
+    "Overview": "overview",
+    "Financials": "financials",
+    "Business Model": "business_model",
+    "Product Mix": "product_mix",
+    "Technology": "technology",
+    "Risk & Regulation": "risk",
+    "Peers": "peer_finder",
+    "Scenarios": "shock_scenarios",
+    "SWOT": "swot",
+    "Search": "filing_search",
+    "Outlook": "outlook",
+    "Downloads": "artefacts",
+}
+
+
+@dataclass(frozen=True)
+class PageContext:
+    # Datasets pinned in the shared cache, for pages that look beyond the selection
+    data: object
+    # Cached View for the sidebar's fiscal year and firms
+    view: object
+
+
+def render_page(page, ctx):
+    importlib.import_module(f"{__name__}.{PAGES[page]}").render(ctx)
@@ -0,0 +1,92 @@
+"""
+Downloads page: the report files and dataset exports.
+"""
+
+import streamlit as st
+
+from downloads import (
+    EXPORT_DATASETS,
+    EXPORT_FORMATS,
+    REPORT_DIR,
+    export_bytes,
+    export_name,
+    get_artifact,
+    is_export_ready,
+)
+from perf import instrument
+from screens.common import render_file_download
+
+
+@instrument("render", "render_downloads")
+def render(ctx):
+    view = ctx.view
+    st.markdown('<div class="section-title">Downloads & Artefacts</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="section-subtitle">'
+        "Download the PDF versions of the full report and executive summary used in this analysis, "
+        "or the underlying datasets for the selected firms and fiscal year."
+        "</div>",
+        unsafe_allow_html=True,
+    )
+
+    full_report = get_artifact(REPORT_DIR / "Competitive Intelligence Analysis.pdf")
+    exec_summary = get_artifact(REPORT_DIR / "Executive Summary.pdf")
+
+    col1, col2 = st.columns(2)
+
+    # Full report download
+    with col1:
+        st.markdown("#### 📄 Full Competitive Intelligence Report")
+        if full_report is not None:
+            render_file_download(full_report, "Download Full Report (PDF)", key="full_report")
+        else:
+            st.warning(
+                "Full report PDF not found.\n\n"
+                "Expected at: `report/Competitive Intelligence Analysis.pdf`"
+            )
+
+    # Executive summary download
+    with col2:
+        st.markdown("#### 📄 Executive Summary")
+        if exec_summary is not None:
+            render_file_download(exec_summary, "Download Executive Summary (PDF)", key="exec_summary")
+        else:
+            st.warning(
+                "Executive summary PDF not found.\n\n"
+                "Expected at: `report/Executive Summary.pdf`"
+            )
+
+    st.markdown("---")
+    render_dataset_export(view)
+
+    st.markdown("---")
+    st.markdown("#### 🔗 GitHub Repository")
+    st.write(
+        "View the full project, code and documentation on GitHub. "
+        "Update this text with your actual repo URL, for example:\n\n"
+        "`https://github.com/tommoni98/competitive-intel-asset-mgmt`"
+    )
+
+
+@instrument("render")
+def render_dataset_export(view):
+
+    st.markdown("#### 🧮 Dataset Exports")
+    st.caption(f"{len(view.companies):,} firms · fiscal year {view.fiscal_year}")
+    c1, c2 = st.columns(2)
+    dataset = c1.selectbox("Dataset", list(EXPORT_DATASETS), key="export_dataset")
+    fmt = c2.radio("Format", list(EXPORT_FORMATS), horizontal=True, key="export_format")
+
+    # Built on request, then cached per filter hash
+    file_name = export_name(view, dataset, fmt)
+    if is_export_ready(view, dataset, fmt) or st.session_state.get("prepare_export"):
+        data = export_bytes(view, dataset, fmt)
+        st.download_button(
+            label=f"Download {file_name} ({len(data) / 1024:,.1f} KB)",
+            data=data,
+            file_name=file_name,
+            mime=EXPORT_FORMATS[fmt][1],
+            key="download_export",
+        )
+    else:
+        st.button(f"Prepare {file_name}", key="prepare_export")
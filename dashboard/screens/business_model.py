@@ -0,0 +1,47 @@
+"""
+Business Model page: each firm's model and pillars, and the fee vs technology map.
+"""
+
+import streamlit as st
+
+from notes import business_models
+from perf import instrument
+from screens.common import render_scatter
+
+
+@instrument("render", "render_business_model")
+def render(ctx):
+    view = ctx.view
+    st.markdown('<div class="section-title">Business Model & Strategic Positioning</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="section-subtitle">'
+        "Comparing how each firm creates value through its core model and strategic pillars."
+        "</div>",
+        unsafe_allow_html=True,
+    )
+
+    model_companies = [c for c in view.companies if c in business_models]
+    if not model_companies:
+        st.info("No business model notes for the selected firms.")
+        return
+    company_choice = st.selectbox("Select a company to explore its business model:", model_companies, index=0)
+
+    model_info = business_models[company_choice]
+
+    st.markdown(f"#### {company_choice} – Model Overview")
+    st.write(model_info["Model"])
+
+    st.markdown("#### Strategic Pillars")
+    for p in model_info["Key_Pillars"]:
+        st.write(f"- {p}")
+
+    st.markdown("---")
+    st.markdown("#### Strategic Positioning Map – Price vs Innovation")
+
+    render_scatter("business_positioning", view, "positioning")
+
+    st.write(
+        "- **Top-left quadrant (low fee, high tech)** is the most attractive: BlackRock is closest given its scale and Aladdin.\n"
+        "- **State Street** leans more toward institutional, competitively priced servicing with strong platform capability.\n"
+        "- **Invesco** sits in the middle on fees and somewhat lower on tech, relying on its product franchises rather than a flagship platform."
+    )
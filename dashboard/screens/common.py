@@ -0,0 +1,129 @@
+"""
+Render helpers shared by the pages: figures, KPI cards, paginated tables and file downloads.
+"""
+
+from urllib.parse import quote
+
+import streamlit as st
+
+from figures import SCATTER_MAX_POINTS, get_figure, scatter_extent
+from perf import instrument, timed
+
+
+@instrument("render")
+def render_figure(name, view, **params):
+    with timed("figure", name):
+        fig = get_figure(name, view, **params)
+    with timed("plotly_chart", name):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def render_scatter(name, view, key):
+    """Scatter figure; above SCATTER_MAX_POINTS, range sliders zoom in and re-sample on the server."""
+    params = {}
+    n_points, *extents = scatter_extent(name, view)
+    if n_points > SCATTER_MAX_POINTS:
+        with st.expander("Zoom (full detail)"):
+            for param, axis, extent in zip(("x_range", "y_range"), ("X", "Y"), extents):
+                if extent is None:
+                    continue
+                lo, hi = round(extent[0], 2), round(extent[1], 2)
+                picked = st.slider(f"{axis} range", lo, hi, (lo, hi), step=(hi - lo) / 200, key=f"{key}_{param}")
+                # Round so nearby slider positions share cached figure specs
+                if picked != (lo, hi):
+                    params[param] = (round(picked[0], 2), round(picked[1], 2))
+    render_figure(name, view, **params)
+
+
+SOURCE_LINKS_MAX = 3
+
+
+def source_links(view, page, metric, companies=None):
+    """Deep links to the filing pages behind a metric for the view's year, at most SOURCE_LINKS_MAX."""
+    store = view.data.store
+    sourced = store.sourced_companies(view.fiscal_year, metric, view.companies if companies is None else companies)
+    links = []
+    for company in sourced[:SOURCE_LINKS_MAX]:
+        source, source_page = store.provenance(company, view.fiscal_year, metric)
+        link = f"?view={quote(page)}&filing={quote(source)}&p={source_page}"
+        links.append(f'<a href="{link}" target="_self">{company} p.{source_page}</a>')
+    if len(sourced) > SOURCE_LINKS_MAX:
+        links.append(f"+{len(sourced) - SOURCE_LINKS_MAX:,} more")
+    return links
+
+
+@instrument("render")
+def render_kpi_card(label, value, sublabel="", sources=None):
+    sources_html = f'<div class="metric-source">Source: {" · ".join(sources)}</div>' if sources else ""
+    st.markdown(
+        f"""
+        <div class="metric-card">
+            <div class="metric-label">{label}</div>
+            <div class="metric-value">{value}</div>
+            <div class="metric-sub">{sublabel}</div>
+            {sources_html}
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+
+@instrument("render")
+def render_paged_table(name, view, key, column_config=None):
+    from tables import DEFAULT_PAGE_SIZE, PAGE_SIZES, TableQuery, page_count, page_rows, row_order, view_table
+
+    # Sort, filter and pagination run on the server; only the visible page is sent
+    table = view_table(view, name)
+    years = [str(y) for y in view.data.years]
+    c1, c2, c3, c4, c5 = st.columns([3, 2, 2, 1, 1])
+    search = c1.text_input("Filter firms", key=f"{key}_search", placeholder="Company name contains…")
+    year = c2.selectbox(
+        "Fiscal year", ["All years", *years], index=years.index(str(view.fiscal_year)) + 1, key=f"{key}_year"
+    )
+    sort_by = c3.selectbox("Sort by", table.column_names, key=f"{key}_sort")
+    descending = c4.toggle("Descending", key=f"{key}_desc")
+    page_size = c5.selectbox("Rows", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE), key=f"{key}_rows")
+
+    query = TableQuery(
+        search=search.strip(),
+        year=None if year == "All years" else int(year),
+        sort_by=sort_by,
+        descending=descending,
+    )
+    with timed("table_query", name):
+        order = row_order(name, table, view.node_version(name), query)
+    pages = page_count(len(order), page_size)
+    # A narrower filter can leave the page past the end
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    page = st.number_input("Page", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+
+    start = (page - 1) * page_size
+    st.dataframe(
+        page_rows(table, order, page - 1, page_size),
+        use_container_width=True,
+        hide_index=True,
+        column_config=column_config,
+    )
+    st.caption(
+        f"Rows {min(start + 1, len(order)):,}–{min(start + page_size, len(order)):,} of {len(order):,} "
+        f"· page {page} of {pages}"
+    )
+
+
+@instrument("render")
+def render_file_download(artifact, label, key, mime="application/pdf"):
+    from downloads import artifact_bytes, is_loaded
+
+    # Bytes are shared process-wide; large files are only loaded on request
+    st.caption(f"{artifact.size_label} · SHA-256 {artifact.etag[:12]}")
+    if artifact.eager or is_loaded(artifact) or st.session_state.get(f"prepare_{key}"):
+        st.download_button(
+            label=label,
+            data=artifact_bytes(artifact),
+            file_name=artifact.path.name,
+            mime=mime,
+            key=f"download_{key}",
+        )
+    else:
+        st.button(f"Prepare download ({artifact.size_label})", key=f"prepare_{key}")
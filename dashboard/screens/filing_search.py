@@ -0,0 +1,43 @@
+"""
+Search page: full-text search over the filing pages.
+"""
+
+import time
+from urllib.parse import quote
+
+import streamlit as st
+
+from perf import instrument
+from search import index_available, load_index
+
+
+@instrument("render", "render_search")
+def render(ctx):
+    view = ctx.view
+    st.markdown('<div class="section-title">Filing Search</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="section-subtitle">'
+        'Full-text search across every page of the ingested 10-Ks and annual reports. '
+        'Use quotes for exact phrases, e.g. <code>"private markets" fee</code>.'
+        "</div>",
+        unsafe_allow_html=True,
+    )
+
+    if not index_available():
+        st.info("The search index has not been built yet. Run `python dashboard/search.py build`.")
+        return
+    index = load_index()
+
+    query = st.text_input("Search filings", placeholder='"private markets" fee pressure')
+    only_selected = st.checkbox("Only filings of the selected firms", value=True)
+    if not query.strip():
+        return
+
+    started = time.perf_counter()
+    hits = index.search(query, k=20, companies=view.companies if only_selected else None)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    st.caption(f"{len(hits)} results in {elapsed_ms:.1f} ms across {len(index)} pages")
+
+    for hit in hits:
+        link = f"?view=Search&filing={quote(hit.source)}&p={hit.page}"
+        st.markdown(f"**{hit.company} · {hit.source} · [page {hit.page}]({link})**  \n{hit.snippet}")
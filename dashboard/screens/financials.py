@@ -0,0 +1,72 @@
+"""
+Financials page: revenue, margins and returns, with the paginated key-ratio table.
+"""
+
+import streamlit as st
+
+from perf import instrument
+from screens.common import render_figure, render_scatter, source_links, render_kpi_card, render_paged_table
+
+
+@instrument("render", "render_financials")
+def render(ctx):
+    view = ctx.view
+    st.markdown('<div class="section-title">Financial Performance</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="section-subtitle">'
+        "Comparing revenue, profitability and returns across the three competitors."
+        "</div>",
+        unsafe_allow_html=True,
+    )
+
+    financials_df = view.financials
+    if financials_df.empty:
+        st.info(f"No financials for the selected firms in {view.fiscal_year}.")
+        return
+
+    # (card label, column, value format, metric behind the source link)
+    leaders = [
+        ("Revenue Leader", "Revenue_Bn", "{:.1f} Bn", "revenue"),
+        ("Highest Operating Margin", "Op_Margin_%", "{:.1f}%", "operating_income"),
+        ("ROE Leader", "ROE_%", "{:.1f}%", "net_income"),
+    ]
+    for col, (label, column, value_format, metric) in zip(st.columns(3), leaders):
+        values = financials_df[column].dropna()
+        with col:
+            if values.empty:
+                render_kpi_card(label, "n/a", "Not reported")
+                continue
+            top = financials_df.loc[values.idxmax()]
+            render_kpi_card(
+                label,
+                f"{top['Company']}",
+                value_format.format(top[column]),
+                source_links(view, "Financials", metric, [top["Company"]]),
+            )
+
+    st.markdown("---")
+
+    col_a, col_b = st.columns(2)
+    with col_a:
+        render_figure("financials_revenue", view)
+        render_figure("financials_margin", view)
+
+    with col_b:
+        render_scatter("financials_roe_roa", view, "roe_roa")
+        render_figure("financials_net_income", view)
+
+    st.markdown("### Key Ratios")
+    ratio_cols = ["Op_Margin_%", "ROE_%", "ROA_%", "Fee_Yield_bps", "Revenue_Growth_%", "Net_Income_Growth_%"]
+    render_paged_table(
+        "ratios_table",
+        view,
+        key="ratios_table",
+        column_config={col: st.column_config.NumberColumn(format="%.1f") for col in ratio_cols},
+    )
+
+    st.markdown("### Interpretation")
+    st.write(
+        "- **BlackRock** generates the highest revenue and net income by a wide margin and sustains the best operating margin.\n"
+        "- **State Street** delivers solid profitability within a lower-margin servicing model, with ROE close to BlackRock’s.\n"
+        "- **Invesco** exhibits materially lower margins and returns, highlighting the impact of fee pressure and scale constraints."
+    )
@@ -0,0 +1,54 @@
+"""
+Outlook page: industry themes, firm outlooks and recommendations from the report.
+"""
+
+import streamlit as st
+
+from perf import instrument
+
+
+@instrument("render", "render_outlook")
+def render(ctx):
+    st.markdown('<div class="section-title">Forward Outlook & Strategic Implications</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="section-subtitle">'
+        "How industry trends, technology and private markets shape the next phase of competition."
+        "</div>",
+        unsafe_allow_html=True,
+    )
+
+    st.markdown("### Major Industry Themes")
+    st.write(
+        "- **Private markets & alternatives** are the main growth engine.\n"
+        "- **Integrated technology and data platforms** are becoming the core competitive moat.\n"
+        "- **Fee compression and margin pressure** continue to challenge traditional managers.\n"
+        "- **Regulation and operational resilience** are critical constraints for systemically important firms."
+    )
+
+    st.markdown("### Firm-by-Firm Outlook")
+    st.markdown("**BlackRock**")
+    st.write(
+        "- Best positioned to dominate in private markets and technology, provided it manages integration risk.\n"
+        "- Likely to keep expanding Aladdin’s ecosystem and data capabilities."
+    )
+
+    st.markdown("**State Street**")
+    st.write(
+        "- Expected to reinforce its role as institutional infrastructure through Alpha and alternative servicing.\n"
+        "- Profitability will hinge on balancing regulatory capital, NII and servicing fees."
+    )
+
+    st.markdown("**Invesco**")
+    st.write(
+        "- Must execute on efficiency, scale its winning franchises (e.g., QQQ, ETFs) and continue upgrading tech.\n"
+        "- Success depends on differentiating as an independent, diversified manager in a scale-driven world."
+    )
+
+    st.markdown("---")
+    st.markdown("### High-Level Strategic Recommendations")
+    st.write(
+        "- **Double down on technology**: treating platforms and data as profit centers, not cost centers.\n"
+        "- **Align product strategy with secular flows**: particularly towards private markets, ETFs, and solutions.\n"
+        "- **Strengthen operating leverage**: through automation, simplification and global operating models.\n"
+        "- **Build resilience**: ensuring regulatory, risk and cyber capabilities keep up with business complexity."
+    )
@@ -0,0 +1,70 @@
+"""
+Overview page: total, ETF and alternatives AUM of the selected firms.
+"""
+
+import streamlit as st
+
+from perf import instrument
+from screens.common import render_figure, source_links, render_kpi_card
+
+
+@instrument("render", "render_overview")
+def render(ctx):
+    view = ctx.view
+    st.markdown('<div class="section-title">Overview & Executive Snapshot</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="section-subtitle">'
+        "High-level view of scale, ETF exposure, alternatives and technology strength for BlackRock, State Street and Invesco."
+        "</div>",
+        unsafe_allow_html=True,
+    )
+
+    overview_df = view.overview
+    if overview_df.empty:
+        st.info(f"No AUM data for the selected firms in {view.fiscal_year}.")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    total_aum = overview_df["AUM_Tn"].sum()
+    total_etf = overview_df["ETF_AUM_Tn"].sum()
+    avg_tech = overview_df["Tech_Score"].mean()
+    alts_total = overview_df["Alternatives_AUM_Tn"].sum()
+
+    with col1:
+        render_kpi_card(
+            f"Total AUM ({view.fiscal_year})",
+            f"{total_aum:.2f} Tn",
+            f"Across {len(overview_df)} managers",
+            source_links(view, "Overview", "aum_total"),
+        )
+    with col2:
+        render_kpi_card(
+            "Total ETF AUM", f"{total_etf:.2f} Tn", "ETF platforms", source_links(view, "Overview", "aum_etf")
+        )
+    with col3:
+        render_kpi_card(
+            "Total Alternatives",
+            f"{alts_total:.2f} Tn",
+            "Private markets & alts",
+            source_links(view, "Overview", "aum_alternatives"),
+        )
+    with col4:
+        render_kpi_card("Avg Tech Strength", f"{avg_tech:.1f} / 10", "Tech & platform capability")
+
+    st.markdown("---")
+
+    c1, c2 = st.columns(2)
+    with c1:
+        render_figure("overview_aum", view)
+
+    with c2:
+        render_figure("overview_etf_share", view)
+
+    st.markdown("### Narrative Highlights")
+    st.write(
+        "- **BlackRock**: Clear scale leader with > $11.5T AUM and the highest tech score, reflecting the "
+        "strength of Aladdin and its expansion into private markets.\n"
+        "- **State Street**: Smaller AUM as an asset manager but huge AUC/A as a servicer; strong ETF presence via SPDR and "
+        "a robust Alpha platform.\n"
+        "- **Invesco**: Large independent manager with meaningful ETF and alternatives exposure, but trailing in overall scale and tech score."
+    )
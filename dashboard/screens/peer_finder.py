@@ -0,0 +1,55 @@
+"""
+Peers page: nearest competitors of a firm across the whole universe.
+"""
+
+import time
+
+import streamlit as st
+
+from loader import load_view
+from peers import peer_index
+from perf import instrument
+
+
+@instrument("render", "render_peers")
+def render(ctx):
+    view = ctx.view
+    st.markdown('<div class="section-title">Peer Finder</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="section-subtitle">'
+        "Nearest competitors by scale, margins, returns and asset-class mix, across every firm in the dataset."
+        "</div>",
+        unsafe_allow_html=True,
+    )
+
+    # Peers are searched across the whole universe, not just the sidebar selection
+    universe = load_view(ctx.data, view.fiscal_year, ctx.data.all_companies)
+    c1, c2, c3 = st.columns([2, 1, 1])
+    with c2:
+        metric = st.radio("Similarity", ["cosine", "euclidean"], horizontal=True)
+    index = peer_index(universe, metric)
+    if len(index) < 2:
+        st.info(f"Not enough firms with {view.fiscal_year} data to compare.")
+        return
+    candidates = [c for c in view.companies if c in index.companies] or list(index.companies)
+    with c1:
+        target = st.selectbox("Find peers of", candidates, index=0)
+    with c3:
+        k = st.slider("Peers", 1, min(25, len(index) - 1), min(10, len(index) - 1))
+
+    started = time.perf_counter()
+    result = index.query(target, k)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    how = "partitioned index" if index.partitioned else "brute force"
+    st.caption(f"{len(result)} peers of {target} in {elapsed_ms:.1f} ms across {len(index):,} firms ({how})")
+
+    score_label = "Cosine similarity" if metric == "cosine" else "Distance"
+    st.dataframe(
+        result.rename(columns={"score": score_label}).set_index("Company"),
+        use_container_width=True,
+        column_config={col: st.column_config.NumberColumn(format="%.2f") for col in result.columns[1:]},
+    )
+    st.caption(
+        "Features: log AUM and revenue, operating margin, fee yield (bps), ROE, ROA, ETF share and "
+        "asset-class mix (% of AUM). Each is standardized across the universe; each group weighs the same."
+    )
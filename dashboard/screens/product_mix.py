@@ -0,0 +1,42 @@
+"""
+Product Mix page: AUM by asset class per firm, region or year, with the paginated mix table.
+"""
+
+import streamlit as st
+
+from perf import instrument
+from screens.common import render_figure, render_paged_table
+
+
+@instrument("render", "render_product_mix")
+def render(ctx):
+    view = ctx.view
+    st.markdown('<div class="section-title">Product & AUM Mix</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="section-subtitle">'
+        "Breakdown of AUM across equity, fixed income, multi-asset, cash and alternatives."
+        "</div>",
+        unsafe_allow_html=True,
+    )
+
+    grouping = st.radio("Group by", ["Firm", "Region", "Fiscal year"], horizontal=True, key="product_mix_by")
+    if grouping == "Fiscal year":
+        render_figure("product_mix_history", view)
+    else:
+        render_figure("product_mix_stack", view, by="company" if grouping == "Firm" else "region")
+
+    st.markdown("### Product Mix Table")
+    mix_cols = ["Equity_Tn", "Fixed_Income_Tn", "Multi_Asset_Tn", "Cash_Tn", "Alternatives_Tn"]
+    render_paged_table(
+        "product_mix_table",
+        view,
+        key="product_mix_table",
+        column_config={col: st.column_config.NumberColumn(format="%.3f") for col in mix_cols},
+    )
+
+    st.markdown("### Product Mix Observations")
+    st.write(
+        "- **BlackRock**: Heavily equity-weighted, with substantial fixed income and a meaningful but smaller alternatives book.\n"
+        "- **State Street**: Strong equity and cash presence consistent with its institutional index and ETF heritage.\n"
+        "- **Invesco**: Smaller in absolute terms but diversified across equity, fixed income, cash and growing alternatives."
+    )
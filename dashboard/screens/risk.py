@@ -0,0 +1,41 @@
+"""
+Risk & Regulation page: the risk heatmap, clustered or as peer-group tiles for large universes.
+"""
+
+import streamlit as st
+
+from clustering import HEATMAP_MAX_ROWS, heatmap_layout, peer_group_label
+from perf import instrument
+from screens.common import render_figure
+
+
+@instrument("render", "render_risk")
+def render(ctx):
+    view = ctx.view
+    st.markdown('<div class="section-title">Risk & Regulatory Profile</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="section-subtitle">'
+        "Heatmap of key risk exposures: regulatory, market, interest rate, operational/tech and fee pressure."
+        "</div>",
+        unsafe_allow_html=True,
+    )
+
+    # Large universes are always clustered and shown as peer-group tiles
+    clustered, group = True, None
+    if len(view.risk_matrix) <= HEATMAP_MAX_ROWS:
+        clustered = st.toggle("Cluster similar firms and risk categories", value=False)
+    else:
+        layout = heatmap_layout(view.risk_matrix)
+        sizes = layout.group_sizes
+        # Options are their own labels, so reruns (and AppTest) see the same strings
+        groups = {peer_group_label(g, sizes[g]): int(g) for g in layout.group_order}
+        group = groups.get(st.selectbox("Drill into a peer group", ["All peer groups", *groups]))
+
+    render_figure("risk_heatmap", view, clustered=clustered, group=group)
+
+    st.markdown("### Narrative Interpretation")
+    st.write(
+        "- **State Street** shows the highest regulatory and interest rate risk due to its G-SIB status and NII dependence.\n"
+        "- **BlackRock** faces elevated regulatory and operational/tech risk given its scale and centrality of Aladdin.\n"
+        "- **Invesco** is most exposed to fee pressure and market risk, reflecting its traditional asset management model and smaller scale."
+    )
@@ -0,0 +1,103 @@
+"""
+Parts of every run outside the selected page: the filing page opened from a link and the perf panel.
+"""
+
+import base64
+from pathlib import Path
+
+import streamlit as st
+
+from perf import instrument
+
+
+def close_source_page():
+    for param in ("filing", "p"):
+        st.query_params.pop(param, None)
+
+
+@instrument("render")
+def render_source_page(page_name):
+    # A filing page opened from a KPI source link or a search result, until closed or the user
+    # moves on from the page the link opened
+    linked_page = st.query_params.get("view")
+    if linked_page is not None and linked_page != page_name:
+        close_source_page()
+    source = st.query_params.get("filing")
+    if not source:
+        return
+    from provenance import page_index
+
+    index = page_index(source)
+    try:
+        page = int(st.query_params.get("p", 1))
+    except ValueError:
+        page = 0
+    if index is None or not 1 <= page <= len(index):
+        st.warning(f"Page {st.query_params.get('p')} of {source} is not available.")
+        st.button("Close", key="close_source_page", on_click=close_source_page)
+        return
+    with st.expander(f"📄 {source} · page {page} of {len(index)}", expanded=True):
+        st.button("Close", key="close_source_page", on_click=close_source_page)
+        preview = index.preview(page)
+        text_col, preview_col = st.columns(2)
+        with text_col:
+            st.text(index.page_text(page))
+        with preview_col:
+            encoded = base64.b64encode(preview).decode()
+            st.markdown(
+                f'<iframe class="page-preview" src="data:application/pdf;base64,{encoded}"></iframe>',
+                unsafe_allow_html=True,
+            )
+            st.download_button(
+                "Download page",
+                data=preview,
+                file_name=f"{Path(source).stem}_p{page}.pdf",
+                mime="application/pdf",
+                key="download_source_page",
+            )
+
+
+def render_perf_panel(trace, visible=False):
+    # Session totals are kept on every run, the panel itself is opt-in via ?perf=1
+    totals = st.session_state.setdefault("perf_totals", {})
+    for kind, name, seconds in trace:
+        count, total = totals.get((kind, name), (0, 0.0))
+        totals[(kind, name)] = (count + 1, total + seconds)
+    if not visible:
+        return
+
+    with st.sidebar.expander("🔧 Performance", expanded=True):
+        st.caption("This run")
+        st.dataframe(
+            [{"kind": kind, "name": name, "ms": round(seconds * 1000, 1)} for kind, name, seconds in trace],
+            use_container_width=True,
+            hide_index=True,
+        )
+        st.caption("This session")
+        rows = sorted(totals.items(), key=lambda item: -item[1][1])
+        st.dataframe(
+            [
+                {"kind": kind, "name": name, "calls": count, "total ms": round(total * 1000, 1),
+                 "avg ms": round(total / count * 1000, 1)}
+                for (kind, name), (count, total) in rows
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+
+        from sharedcache import CACHE, current_session
+
+        # Memory of the process-wide cache: what this session uses, and what it alone keeps alive
+        sessions = CACHE.session_usage()
+        mine = next((row for row in sessions if row["session"] == current_session()), None)
+        st.caption(
+            f"Shared cache: {CACHE.size / 2**20:.1f} of {CACHE.max_bytes / 2**20:.0f} MB, "
+            f"{len(sessions)} active sessions"
+        )
+        if mine is not None:
+            st.caption(
+                f"This session uses {mine['bytes'] / 2**20:.1f} MB of it, "
+                f"{mine['exclusive_bytes'] / 2**20:.2f} MB not shared with other sessions"
+            )
+        st.dataframe(CACHE.stats(), use_container_width=True, hide_index=True)
+        st.dataframe(CACHE.entry_report()[:20], use_container_width=True, hide_index=True)
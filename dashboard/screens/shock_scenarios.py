@@ -0,0 +1,60 @@
+"""
+Scenarios page: Monte Carlo market shocks applied to each firm's product mix.
+"""
+
+import time
+
+import streamlit as st
+
+from perf import instrument
+from scenarios import ASSET_CLASSES, DEFAULT_SHOCKS, DEFAULT_VOLS, Scenario, simulate
+from screens.common import render_figure
+
+
+@instrument("render", "render_scenarios")
+def render(ctx):
+    view = ctx.view
+    st.markdown('<div class="section-title">Market Shock Scenarios</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="section-subtitle">'
+        "Monte Carlo simulation of correlated drawdowns per asset class, applied to each firm's product mix."
+        "</div>",
+        unsafe_allow_html=True,
+    )
+
+    st.markdown("#### Mean shock by asset class (%)")
+    shock_cols = st.columns(len(ASSET_CLASSES))
+    shocks = tuple(
+        float(col.slider(name, -60, 20, int(default), key=f"shock_{name}"))
+        for col, name, default in zip(shock_cols, ASSET_CLASSES, DEFAULT_SHOCKS)
+    )
+    with st.expander("Volatility, correlation and paths"):
+        vol_cols = st.columns(len(ASSET_CLASSES))
+        vols = tuple(
+            float(col.slider(f"{name} vol", 0, 40, int(default), key=f"vol_{name}"))
+            for col, name, default in zip(vol_cols, ASSET_CLASSES, DEFAULT_VOLS)
+        )
+        c1, c2, c3 = st.columns(3)
+        stress = c1.slider("Correlation stress", 0.0, 1.0, 0.0, 0.1)
+        paths = c2.select_slider("Simulated paths", [10_000, 100_000, 250_000, 1_000_000], value=100_000)
+        fat_tails = c3.toggle("Fat tails (Student-t, 4 df)", value=False)
+
+    scenario = Scenario(shocks, vols, stress, paths, 4 if fat_tails else None)
+    started = time.perf_counter()
+    result = simulate(view, scenario)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    capped = f" (capped from {paths:,} for {len(result.summary):,} firms)" if result.paths < paths else ""
+    st.caption(f"{result.paths:,} paths{capped} × {len(result.summary)} firms in {elapsed_ms:.0f} ms")
+
+    render_figure("scenario_distribution", view, scenario=scenario)
+
+    st.markdown("### Impact by Firm")
+    st.dataframe(
+        result.summary.set_index("Company"),
+        use_container_width=True,
+        column_config={col: st.column_config.NumberColumn(format="%.2f") for col in result.summary.columns[1:]},
+    )
+    st.caption(
+        "VaR and expected shortfall (ES) are losses at the 95% level. Revenue is assumed to move with AUM, "
+        "i.e. fee-based revenue at a constant fee yield."
+    )
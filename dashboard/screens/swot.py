@@ -0,0 +1,67 @@
+"""
+SWOT page: themes across every firm's notes, then one firm's SWOT.
+"""
+
+import streamlit as st
+
+from notes import business_models, swot_data, tech_profiles
+from perf import instrument
+from themes import theme_index
+
+
+@instrument("render", "render_swot")
+def render(ctx):
+    view = ctx.view
+    st.markdown('<div class="section-title">SWOT Explorer</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="section-subtitle">'
+        "Themes across every firm's notes, then strengths, weaknesses, opportunities and threats for each firm."
+        "</div>",
+        unsafe_allow_html=True,
+    )
+
+    # Precomputed once per notes version: term postings and k-means themes over every firm's bullets
+    index = theme_index(swot_data, business_models, tech_profiles)
+    themes = index.themes.sort_values(["Firms", "Bullets"], ascending=False)
+    labels = {}
+    for row in themes.itertuples():
+        label = f"{row.Label} ({row.Firms} firms)"
+        labels[label if label not in labels else f"{label} #{row.Theme + 1}"] = row.Theme
+
+    st.markdown("#### Themes Across Firms")
+    col1, col2 = st.columns(2)
+    with col1:
+        theme = labels.get(st.selectbox("Theme", ["All themes", *labels], key="swot_theme"))
+    with col2:
+        term = st.text_input("…or a term in any note", placeholder="fee pressure", key="swot_term").strip()
+
+    ids = index.match(term) if term else (index.theme_bullets(theme) if theme is not None else None)
+    if ids is not None:
+        notes = index.select(ids, view.companies)
+        st.caption(f"{len(notes)} notes from {notes['Company'].nunique()} firms")
+        st.dataframe(notes, hide_index=True, use_container_width=True)
+    st.markdown("---")
+
+    swot_companies = [item["Company"] for item in swot_data if item["Company"] in view.companies]
+    if not swot_companies:
+        st.info("No SWOT analysis for the selected firms.")
+        return
+    comp_choice = st.selectbox("Select a company:", swot_companies, index=0)
+    selected = next(item for item in swot_data if item["Company"] == comp_choice)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("#### ✅ Strengths")
+        for s_item in selected["Strengths"]:
+            st.write(f"- {s_item}")
+        st.markdown("#### ⚠️ Weaknesses")
+        for w_item in selected["Weaknesses"]:
+            st.write(f"- {w_item}")
+
+    with col2:
+        st.markdown("#### 🎯 Opportunities")
+        for o_item in selected["Opportunities"]:
+            st.write(f"- {o_item}")
+        st.markdown("#### ⚡ Threats")
+        for t_item in selected["Threats"]:
+            st.write(f"- {t_item}")
@@ -0,0 +1,47 @@
+"""
+Technology page: technology scores and platform profiles.
+"""
+
+import streamlit as st
+
+from notes import tech_profiles
+from perf import instrument
+from screens.common import render_figure
+
+
+@instrument("render", "render_technology")
+def render(ctx):
+    view = ctx.view
+    st.markdown('<div class="section-title">Technology & Platform Edge</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="section-subtitle">'
+        "Assessing Aladdin, Alpha and Invesco’s embedded tech capabilities."
+        "</div>",
+        unsafe_allow_html=True,
+    )
+
+    col1, col2 = st.columns([1.2, 1])
+    with col1:
+        render_figure("technology_score", view)
+
+    profiled = [c for c in view.companies if c in tech_profiles]
+    with col2:
+        st.markdown("#### Platform Summary")
+        for comp in profiled:
+            st.markdown(f"**{comp}**")
+            st.write(f"- Platform: {tech_profiles[comp]['Platform']}")
+            st.write(f"- Positioning: {tech_profiles[comp]['Positioning']}")
+            st.write("")
+
+    st.markdown("---")
+    st.markdown("#### Platform Highlights by Firm")
+
+    if not profiled:
+        st.info("No platform profiles for the selected firms.")
+        return
+    tech_company = st.selectbox("Select company to view platform details:", profiled, index=0)
+    profile = tech_profiles[tech_company]
+
+    st.markdown(f"**{tech_company} – {profile['Platform']}**")
+    for h in profile["Highlights"]:
+        st.write(f"- {h}")
@@ -0,0 +1,292 @@
+"""
+BM25 full-text search over the page text of every filing in data/filings.json.
+
+Usage:
+    python dashboard/search.py build
+    python dashboard/search.py query "private markets" fee
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SEARCH_DIR = REPO_ROOT / "data" / "processed" / "search"
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.,'’][a-z0-9]+)*")
+PHRASE_RE = re.compile(r'"([^"]+)"')
+# Escaped in snippets so filing text ("$ 20,407 $ 17,859") is not read as markdown/LaTeX
+MARKDOWN_SPECIAL_RE = re.compile(r"([\\`*_\[\]$#<>|~])")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+SNIPPET_CHARS = 220
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+@dataclass(frozen=True)
+class Hit:
+    doc: int
+    score: float
+    source: str
+    company: str
+    fiscal_year: int
+    page: int
+    snippet: str
+
+
+# ----------------------------------------------------
+# OFFLINE BUILD
+# ----------------------------------------------------
+def build_index(out_dir=SEARCH_DIR):
+    from ingest import DATA_DIR, atomic_write, file_sha256, load_manifest, load_page_texts
+
+    docs = []
+    texts = []
+    for filing in load_manifest()["filings"]:
+        path = DATA_DIR / filing["file"]
+        print(f"  {path.name}")
+        for page_no, text in enumerate(load_page_texts(path, file_sha256(path)), start=1):
+            docs.append(
+                {
+                    "source": path.name,
+                    "company": filing["company"],
+                    "fiscal_year": int(filing["fiscal_year"]),
+                    "page": page_no,
+                }
+            )
+            texts.append(text)
+
+    # term -> [(doc, positions)], docs are appended in increasing order
+    postings = defaultdict(list)
+    doc_len = np.zeros(len(texts), dtype=np.int32)
+    for doc, text in enumerate(texts):
+        tokens = tokenize(text)
+        doc_len[doc] = len(tokens)
+        positions = defaultdict(list)
+        for pos, token in enumerate(tokens):
+            positions[token].append(pos)
+        for token, pos_list in positions.items():
+            postings[token].append((doc, pos_list))
+
+    vocab = sorted(postings)
+    term_offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+    posting_docs, posting_tf, pos_offsets, positions = [], [], [0], []
+    for i, term in enumerate(vocab):
+        for doc, pos_list in postings[term]:
+            posting_docs.append(doc)
+            posting_tf.append(len(pos_list))
+            positions.extend(pos_list)
+            pos_offsets.append(len(positions))
+        term_offsets[i + 1] = len(posting_docs)
+
+    encoded = [t.encode("utf-8") for t in texts]
+    text_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    text_offsets[1:] = np.cumsum([len(b) for b in encoded])
+
+    # Each file replaces its old version in one rename: a running app may have it memory-mapped
+    def save(name, array):
+        def write(tmp):
+            with open(tmp, "wb") as f:
+                np.save(f, array)
+
+        atomic_write(out_dir / name, write)
+
+    def dump(name, obj):
+        def write(tmp):
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(obj, f, separators=(",", ":"))
+
+        atomic_write(out_dir / name, write)
+
+    save("term_offsets.npy", term_offsets)
+    save("posting_docs.npy", np.asarray(posting_docs, dtype=np.int32))
+    save("posting_tf.npy", np.asarray(posting_tf, dtype=np.int32))
+    save("position_offsets.npy", np.asarray(pos_offsets, dtype=np.int64))
+    save("positions.npy", np.asarray(positions, dtype=np.int32))
+    save("doc_len.npy", doc_len)
+    save("text_offsets.npy", text_offsets)
+    atomic_write(out_dir / "texts.bin", lambda tmp: tmp.write_bytes(b"".join(encoded)))
+    dump("vocab.json", vocab)
+    dump("docs.json", docs)
+    print(f"Indexed {len(docs)} pages, {len(vocab)} terms, {len(positions)} positions")
+
+
+# ----------------------------------------------------
+# QUERY TIME
+# ----------------------------------------------------
+class SearchIndex:
+    def __init__(self, directory=SEARCH_DIR):
+        load = lambda name: np.load(directory / name, mmap_mode="r")
+        self.term_offsets = load("term_offsets.npy")
+        self.posting_docs = load("posting_docs.npy")
+        self.posting_tf = load("posting_tf.npy")
+        self.position_offsets = load("position_offsets.npy")
+        self.positions = load("positions.npy")
+        self.doc_len = np.asarray(load("doc_len.npy"), dtype=float)
+        self.text_offsets = load("text_offsets.npy")
+        self.texts = np.memmap(directory / "texts.bin", dtype=np.uint8, mode="r")
+        with open(directory / "vocab.json", encoding="utf-8") as f:
+            self.term_ids = {term: i for i, term in enumerate(json.load(f))}
+        with open(directory / "docs.json", encoding="utf-8") as f:
+            self.docs = json.load(f)
+        self.avg_len = float(self.doc_len.mean()) if len(self.doc_len) else 0.0
+        self.doc_ids = {(d["source"], d["page"]): i for i, d in enumerate(self.docs)}
+        self.doc_company = np.array([d["company"] for d in self.docs], dtype=object)
+
+    def __len__(self):
+        return len(self.docs)
+
+    def _postings(self, term):
+        t = self.term_ids.get(term)
+        if t is None:
+            return None
+        return slice(int(self.term_offsets[t]), int(self.term_offsets[t + 1]))
+
+    def _phrase_docs(self, terms):
+        """Docs in which the terms occur as consecutive tokens."""
+        slices = [self._postings(t) for t in terms]
+        if any(s is None for s in slices):
+            return np.empty(0, dtype=np.int32)
+        candidates = self.posting_docs[slices[0]]
+        for s in slices[1:]:
+            candidates = np.intersect1d(candidates, self.posting_docs[s], assume_unique=True)
+        matches = []
+        for doc in candidates:
+            starts = None
+            for offset, s in enumerate(slices):
+                docs = self.posting_docs[s]
+                i = s.start + int(np.searchsorted(docs, doc))
+                pos = self.positions[self.position_offsets[i]:self.position_offsets[i + 1]] - offset
+                starts = pos if starts is None else np.intersect1d(starts, pos, assume_unique=True)
+                if not len(starts):
+                    break
+            if starts is not None and len(starts):
+                matches.append(doc)
+        return np.asarray(matches, dtype=np.int32)
+
+    def search(self, query, k=20, companies=None):
+        phrases = [tokenize(p) for p in PHRASE_RE.findall(query)]
+        phrases = [p for p in phrases if p]
+        terms = tokenize(PHRASE_RE.sub(" ", query)) + [t for p in phrases for t in p]
+        if not terms:
+            return []
+
+        n_docs = len(self.docs)
+        scores = np.zeros(n_docs)
+        for term in set(terms):
+            s = self._postings(term)
+            if s is None:
+                continue
+            docs = self.posting_docs[s]
+            tf = self.posting_tf[s].astype(float)
+            idf = np.log1p((n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_len[docs] / self.avg_len)
+            scores[docs] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        mask = scores > 0
+        for phrase in phrases:
+            in_phrase = np.zeros(n_docs, dtype=bool)
+            in_phrase[self._phrase_docs(phrase)] = True
+            mask &= in_phrase
+        if companies is not None:
+            mask &= np.isin(self.doc_company, list(companies))
+
+        candidates = np.flatnonzero(mask)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        highlight = [" ".join(p) for p in phrases] + terms
+        return [self._hit(int(doc), float(scores[doc]), highlight) for doc in candidates]
+
+    def page_text(self, doc):
+        start, stop = int(self.text_offsets[doc]), int(self.text_offsets[doc + 1])
+        return bytes(self.texts[start:stop]).decode("utf-8")
+
+    def find_doc(self, source, page):
+        return self.doc_ids.get((source, int(page)))
+
+    def snippet(self, text, terms):
+        """Markdown snippet around the first match, phrases take priority over single terms."""
+        flat = " ".join(text.split())
+        lowered = flat.lower()
+        center = next((i for i in (lowered.find(t) for t in terms) if i >= 0), 0)
+        start = max(0, center - SNIPPET_CHARS // 3)
+        snippet = MARKDOWN_SPECIAL_RE.sub(r"\\\1", flat[start:start + SNIPPET_CHARS])
+        for term in sorted(set(terms), key=len, reverse=True):
+            snippet = re.sub(f"(?i)(?<![*\\w])({re.escape(term)})(?![*\\w])", r"**\1**", snippet)
+        return ("…" if start else "") + snippet + ("…" if start + SNIPPET_CHARS < len(flat) else "")
+
+    def _hit(self, doc, score, terms):
+        meta = self.docs[doc]
+        return Hit(
+            doc=doc,
+            score=score,
+            source=meta["source"],
+            company=meta["company"],
+            fiscal_year=meta["fiscal_year"],
+            page=meta["page"],
+            snippet=self.snippet(self.page_text(doc), terms),
+        )
+
+
+_lock = threading.Lock()
+_index = (None, None)
+
+
+def index_available():
+    return (SEARCH_DIR / "docs.json").exists()
+
+
+def load_index():
+    """Memory-mapped index shared by all sessions, reopened when it is rebuilt."""
+    global _index
+    from loader import files_version
+
+    version = files_version(sorted(SEARCH_DIR.iterdir()))
+    if _index[0] != version:
+        with _lock:
+            if _index[0] != version:
+                from perf import timed
+
+                with timed("data_load", "search_index"):
+                    _index = (version, SearchIndex(SEARCH_DIR))
+    return _index[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the filing search index.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="(re)build the index from the filings in data/filings.json")
+    query = sub.add_parser("query", help="run a query against the built index")
+    query.add_argument("terms", nargs="+")
+    query.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_index()
+        return
+
+    index = SearchIndex(SEARCH_DIR)
+    started = time.perf_counter()
+    hits = index.search(" ".join(f'"{t}"' if " " in t else t for t in args.terms), k=args.k)
+    elapsed = (time.perf_counter() - started) * 1000
+    for hit in hits:
+        print(f"{hit.score:7.2f}  {hit.source} p.{hit.page}  {hit.snippet}")
+    print(f"{len(hits)} hits in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
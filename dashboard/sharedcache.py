@@ -0,0 +1,289 @@
+"""
+Process-wide artefact cache with one memory budget, size-aware eviction and per-session usage.
+"""
+
+import os
+import sys
+import threading
+import time
+import types
+from collections import defaultdict
+from dataclasses import dataclass, field, fields, is_dataclass
+
+import numpy as np
+import pandas as pd
+
+
+CACHE_MB = float(os.environ.get("CI_CACHE_MB", "512"))
+# Sessions not seen for this long are dropped from the per-session report
+SESSION_IDLE_SECONDS = 15 * 60
+# Build time assumed for entries stored without one, in seconds
+DEFAULT_COST = 1e-3
+
+
+@dataclass
+class Entry:
+    namespace: str
+    key: object
+    value: object
+    nbytes: int
+    cost: float
+    pinned: bool = False
+    priority: float = 0.0
+    hits: int = 0
+    created: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    sessions: set = field(default_factory=set)
+
+
+# ----------------------------------------------------
+# SIZING
+# ----------------------------------------------------
+def sizeof(obj, skip=frozenset()):
+    """Approximate bytes held by an object graph, not counting objects whose id is in skip."""
+    seen = set(skip)
+
+    def size(o):
+        if id(o) in seen:
+            return 0
+        seen.add(id(o))
+        # Code and modules are shared by the whole process, not held by the entry
+        if isinstance(o, (types.ModuleType, type, types.FunctionType, types.MethodType)):
+            return 0
+        if isinstance(o, np.memmap):
+            return sys.getsizeof(o)
+        if isinstance(o, np.ndarray):
+            if o.base is not None:
+                return sys.getsizeof(o) + size(o.base)
+            n = o.nbytes
+            if o.dtype == object:
+                n += sum(size(item) for item in o.ravel())
+            return n
+        if isinstance(o, pd.DataFrame):
+            return int(o.memory_usage(index=True, deep=True).sum())
+        if isinstance(o, pd.Series):
+            return int(o.memory_usage(index=True, deep=True))
+        if isinstance(o, pd.Index):
+            return int(o.memory_usage(deep=True))
+        if type(o).__module__.startswith("pyarrow") and hasattr(o, "nbytes"):
+            return o.nbytes
+        if isinstance(o, (str, bytes, bytearray, int, float, bool, type(None))):
+            return sys.getsizeof(o)
+        if isinstance(o, dict):
+            return sys.getsizeof(o) + sum(size(k) + size(v) for k, v in o.items())
+        if isinstance(o, (list, tuple, set, frozenset)):
+            return sys.getsizeof(o) + sum(size(item) for item in o)
+        n = sys.getsizeof(o)
+        if is_dataclass(o) and not hasattr(o, "__dict__"):
+            return n + sum(size(getattr(o, f.name)) for f in fields(o))
+        if hasattr(o, "__dict__"):
+            n += size(vars(o))
+        return n
+
+    return size(obj)
+
+
+def current_session():
+    """Streamlit session id of the running script, None outside a session (CLIs, benchmarks)."""
+    if "streamlit" not in sys.modules:
+        return None
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+
+# ----------------------------------------------------
+# CACHE
+# ----------------------------------------------------
+class SharedCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = {}
+        self.size = 0
+        # GreedyDual-Size inflation: priority of the last evicted entry
+        self.inflation = 0.0
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+        self.evictions = defaultdict(int)
+        self.rejected = defaultdict(int)
+        self.sessions = {}
+        self.lock = threading.Lock()
+        # (namespace, key) -> [lock held while building it, threads waiting on or holding the lock]
+        self.building = {}
+
+    def _touch(self, entry, session):
+        entry.priority = self.inflation + entry.cost / max(entry.nbytes, 1)
+        entry.last_used = time.time()
+        if session is not None:
+            entry.sessions.add(session)
+            self.sessions[session] = entry.last_used
+
+    def get(self, namespace, key):
+        session = current_session()
+        with self.lock:
+            entry = self.entries.get((namespace, key))
+            if entry is None:
+                self.misses[namespace] += 1
+                return None
+            entry.hits += 1
+            self.hits[namespace] += 1
+            self._touch(entry, session)
+            return entry.value
+
+    def __contains__(self, item):
+        with self.lock:
+            return item in self.entries
+
+    def put(self, namespace, key, value, cost=DEFAULT_COST, pinned=False):
+        """Store an entry and evict down to the budget; entries above the budget are not kept."""
+        session = current_session()
+        with self.lock:
+            shared = {id(e.value) for e in self.entries.values() if e.key != key or e.namespace != namespace}
+        nbytes = sizeof(value, skip=shared)
+        if nbytes > self.max_bytes and not pinned:
+            with self.lock:
+                self.rejected[namespace] += 1
+            return value
+        entry = Entry(namespace, key, value, nbytes, max(cost, DEFAULT_COST), pinned)
+        with self.lock:
+            self._remove((namespace, key))
+            self.entries[(namespace, key)] = entry
+            self.size += nbytes
+            self._touch(entry, session)
+            self._evict()
+        return value
+
+    def get_or_build(self, namespace, key, build, pinned=False):
+        """Cached value, or build() stored with its build time as the eviction cost.
+
+        Sessions missing the same key wait for the one building it instead of building it again.
+        """
+        value = self.get(namespace, key)
+        if value is not None:
+            return value
+        full_key = (namespace, key)
+        with self.lock:
+            flight = self.building.setdefault(full_key, [threading.Lock(), 0])
+            flight[1] += 1
+        try:
+            with flight[0]:
+                if full_key in self:
+                    value = self.get(namespace, key)
+                if value is None:
+                    started = time.perf_counter()
+                    value = build()
+                    self.put(namespace, key, value, cost=time.perf_counter() - started, pinned=pinned)
+                return value
+        finally:
+            with self.lock:
+                flight[1] -= 1
+                if flight[1] == 0:
+                    del self.building[full_key]
+
+    def _remove(self, full_key):
+        entry = self.entries.pop(full_key, None)
+        if entry is not None:
+            self.size -= entry.nbytes
+        return entry
+
+    def _evict(self):
+        while self.size > self.max_bytes:
+            victims = [e for e in self.entries.values() if not e.pinned]
+            if not victims:
+                return
+            # Ties (equal cost per byte) go to the least recently used
+            victim = min(victims, key=lambda e: (e.priority, e.last_used))
+            self.inflation = victim.priority
+            self._remove((victim.namespace, victim.key))
+            self.evictions[victim.namespace] += 1
+
+    def discard(self, namespace, keep=None):
+        """Drop every entry of a namespace, except those whose key satisfies keep."""
+        with self.lock:
+            for full_key in [k for k in self.entries if k[0] == namespace]:
+                if keep is None or not keep(full_key[1]):
+                    self._remove(full_key)
+
+    def discard_unpinned(self):
+        """Drop every entry except the pinned ones (the current datasets)."""
+        with self.lock:
+            for full_key in [k for k, e in self.entries.items() if not e.pinned]:
+                self._remove(full_key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+            self.inflation = 0.0
+
+    # ----------------------------------------------------
+    # REPORTING
+    # ----------------------------------------------------
+    def stats(self):
+        """Per namespace: entries, bytes, hits, misses, evictions and rejected entries."""
+        with self.lock:
+            entries = list(self.entries.values())
+            counters = {
+                name: dict(getattr(self, name)) for name in ("hits", "misses", "evictions", "rejected")
+            }
+        namespaces = sorted({e.namespace for e in entries} | {ns for c in counters.values() for ns in c})
+        rows = []
+        for namespace in namespaces:
+            members = [e for e in entries if e.namespace == namespace]
+            rows.append(
+                {
+                    "namespace": namespace,
+                    "entries": len(members),
+                    "bytes": sum(e.nbytes for e in members),
+                    **{name: counts.get(namespace, 0) for name, counts in counters.items()},
+                }
+            )
+        return rows
+
+    def entry_report(self):
+        """One row per entry, largest first."""
+        with self.lock:
+            entries = list(self.entries.values())
+        rows = [
+            {
+                "namespace": e.namespace,
+                "key": str(e.key)[:80],
+                "bytes": e.nbytes,
+                "build_ms": round(e.cost * 1000, 1),
+                "hits": e.hits,
+                "sessions": len(e.sessions),
+                "pinned": e.pinned,
+                "idle_s": round(time.time() - e.last_used, 1),
+            }
+            for e in entries
+        ]
+        return sorted(rows, key=lambda r: -r["bytes"])
+
+    def session_usage(self):
+        """Per active session: entries and bytes it uses, and bytes no other session uses."""
+        now = time.time()
+        with self.lock:
+            for session in [s for s, seen in self.sessions.items() if now - seen > SESSION_IDLE_SECONDS]:
+                del self.sessions[session]
+            active = dict(self.sessions)
+            entries = list(self.entries.values())
+        usage = {s: {"session": s, "entries": 0, "bytes": 0, "exclusive_bytes": 0} for s in active}
+        for e in entries:
+            users = [s for s in e.sessions if s in usage]
+            for s in users:
+                usage[s]["entries"] += 1
+                usage[s]["bytes"] += e.nbytes
+            if len(users) == 1:
+                usage[users[0]]["exclusive_bytes"] += e.nbytes
+        for s, row in usage.items():
+            row["idle_s"] = round(now - active[s], 1)
+        return sorted(usage.values(), key=lambda r: -r["bytes"])
+
+
+CACHE = SharedCache(int(CACHE_MB * 1024 * 1024))
+
+
+def cached(namespace, key, build, pinned=False):
+    """Value of build() shared by every session, built once per namespace and key."""
+    return CACHE.get_or_build(namespace, key, build, pinned=pinned)
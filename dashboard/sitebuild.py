@@ -0,0 +1,337 @@
+"""
+Static build of the project website with hashed, minified and precompressed assets.
+
+Usage:
+    python dashboard/sitebuild.py [--out dist] [--year 2024] [--skip-snapshots]
+"""
+
+import argparse
+import gzip
+import hashlib
+import html
+import json
+import math
+import os
+import re
+import time
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+from loader import load_datasets, load_view
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SITE_INDEX = REPO_ROOT / "index.html"
+SITE_DIR = REPO_ROOT / "dist"
+HASH_LENGTH = 10
+# Assets whose names carry their content hash; pages are revalidated on every visit
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+PAGE_CACHE = "public, max-age=0, must-revalidate"
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+# data-fact="name" or data-fact="name:argument": view -> text of the element
+FACTS = {
+    "firms": lambda view, _: f"{len(view.companies)}",
+    "year": lambda view, _: f"{view.fiscal_year}",
+    "aum": lambda view, company: floor_tenths(view.overview.set_index("Company").at[company, "AUM_Tn"]),
+}
+
+FACT_ELEMENT = re.compile(r'<(\w+)([^>]*?)\sdata-fact="([^"]+)"([^>]*)>([^<]*)</\1>')
+LINK_ATTRIBUTE = re.compile(r'\b(href|src)="([^"]*)"')
+STYLESHEET_LINK = re.compile(r'<link rel="stylesheet" href="([^"]+)"\s*/?>')
+# Content the HTML minifier must leave alone
+RAW_ELEMENT = re.compile(r"<(script|style|pre|textarea)\b.*?</\1>", re.S | re.I)
+BLOCK_TAGS = (
+    "html|head|body|meta|link|title|style|script|noscript|header|main|footer|section|div|ul|ol|li|p|h[1-6]"
+)
+
+
+class BuildError(Exception):
+    pass
+
+
+def floor_tenths(value):
+    # Rounded down, as the page states "> $11.5T"
+    return f"{math.floor(value * 10) / 10:.1f}"
+
+
+# ----------------------------------------------------
+# FACTS
+# ----------------------------------------------------
+def fill_facts(text, view):
+    """Replace the text of every data-fact element with the value from the view, dropping the attribute."""
+
+    def fill(match):
+        tag, before, fact, after, _ = match.groups()
+        name, _, argument = fact.partition(":")
+        if name not in FACTS:
+            raise BuildError(f"unknown data-fact {fact!r}")
+        try:
+            value = FACTS[name](view, argument)
+        except KeyError:
+            raise BuildError(f"data-fact {fact!r} has no value for fiscal year {view.fiscal_year}") from None
+        return f"<{tag}{before}{after}>{html.escape(value)}</{tag}>"
+
+    return FACT_ELEMENT.sub(fill, text)
+
+
+# ----------------------------------------------------
+# MINIFY
+# ----------------------------------------------------
+def minify_css(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+def minify_html(text):
+    raw = []
+
+    def stash(match):
+        block = match.group(0)
+        if block[1:6].lower() == "style":
+            open_tag, body = block.split(">", 1)
+            block = f"{open_tag}>{minify_css(body[: -len('</style>')])}</style>"
+        raw.append(block)
+        return f"\0{len(raw) - 1}\0"
+
+    text = RAW_ELEMENT.sub(stash, text)
+    text = re.sub(r"<!--(?!\[if).*?-->", "", text, flags=re.S)
+    text = re.sub(r"\s+", " ", text)
+    # Whitespace next to block-level tags never renders
+    text = re.sub(rf"\s*(</?(?:{BLOCK_TAGS})\b[^>]*>)\s*", r"\1", text, flags=re.I)
+    text = re.sub(r"\s*(\0\d+\0)\s*", r"\1", text)
+    text = re.sub(r"\s*/>", ">", text)
+    return re.sub(r"\0(\d+)\0", lambda m: raw[int(m.group(1))], text).strip()
+
+
+# ----------------------------------------------------
+# CRITICAL CSS
+# ----------------------------------------------------
+def css_rules(css):
+    """Top-level (prelude, body) pairs of minified CSS; bodies of at-rules are nested CSS."""
+    rules, depth, start, prelude = [], 0, 0, ""
+    for i, char in enumerate(css):
+        if char == "{":
+            if depth == 0:
+                prelude, start = css[start:i], i + 1
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                rules.append((prelude, css[start:i]))
+                start = i + 1
+    return rules
+
+
+def selector_matches(selector, classes, tags):
+    """Whether every class and tag a selector names occurs in the HTML; pseudo-classes are ignored."""
+    selector = re.sub(r"::?[\w-]+(\([^)]*\))?", "", selector)
+    if selector.strip() in ("", "*", "html", "body"):
+        return True
+    needed_classes = set(re.findall(r"\.([\w-]+)", selector))
+    needed_tags = set(re.findall(r"(?:^|[\s>+~])([a-z][\w-]*)", selector))
+    return needed_classes <= classes and needed_tags <= tags
+
+
+def critical_css(css, fold_html):
+    """Rules of a minified stylesheet that can apply to the given above-the-fold HTML."""
+    classes = {c for attr in re.findall(r'class="([^"]*)"', fold_html) for c in attr.split()}
+    tags = set(re.findall(r"<([a-z][\w-]*)", fold_html))
+    kept = []
+    for prelude, body in css_rules(css):
+        if prelude.startswith("@media"):
+            inner = critical_css(body, fold_html)
+            if inner:
+                kept.append(f"{prelude}{{{inner}}}")
+        elif prelude.startswith("@") or any(selector_matches(s, classes, tags) for s in prelude.split(",")):
+            kept.append(f"{prelude}{{{body}}}")
+    return "".join(kept)
+
+
+# ----------------------------------------------------
+# BUILD
+# ----------------------------------------------------
+def hashed_name(path, data):
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    return path.with_name(f"{path.stem}.{digest}{path.suffix}")
+
+
+class SiteBuild:
+    def __init__(self, out_dir, view):
+        self.out_dir = out_dir
+        self.view = view
+        # source path -> output path, both relative to the repository root
+        self.assets = {}
+        self.pages = []
+        self.written = set()
+
+    def resolve(self, page, link):
+        """Source file a local link points to, or None for external links and in-page anchors."""
+        if link.startswith(("#", "data:", "mailto:", "//")) or re.match(r"[a-z][a-z0-9+.-]*:", link):
+            return None
+        path = (page.parent / unquote(link.split("#")[0].split("?")[0])).resolve()
+        if REPO_ROOT not in path.parents or not path.is_file():
+            raise BuildError(f"{page.relative_to(REPO_ROOT)}: broken link {link!r}")
+        return path
+
+    def asset(self, path):
+        """Copy an asset under its content-hashed name once (stylesheets minified), returning the output path."""
+        if path not in self.assets:
+            data = path.read_bytes()
+            if path.suffix == ".css":
+                data = minify_css(data.decode("utf-8")).encode()
+            target = hashed_name(path.relative_to(REPO_ROOT), data)
+            self.assets[path] = target
+            self.write(target, data)
+        return self.assets[path]
+
+    def href(self, page, target):
+        return quote(Path(os.path.relpath(target, page.relative_to(REPO_ROOT).parent)).as_posix())
+
+    def inline_stylesheet(self, page, text):
+        """Inline the rules the page header needs and preload the full stylesheet instead of blocking on it."""
+        match = STYLESHEET_LINK.search(text)
+        if match is None:
+            return text
+        href = match.group(1)
+        css = (self.out_dir / page.relative_to(REPO_ROOT).parent / unquote(href)).read_text(encoding="utf-8")
+        fold = text[: text.find("</header>")] if "</header>" in text else ""
+        tags = (
+            f"<style>{critical_css(css, fold)}</style>"
+            f'<link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+            f'<noscript><link rel="stylesheet" href="{href}"></noscript>'
+        )
+        return text[: match.start()] + tags + text[match.end():]
+
+    def page(self, path):
+        """Build an HTML page and, recursively, everything it links to."""
+        rel = path.relative_to(REPO_ROOT)
+        if rel in self.pages:
+            return
+        self.pages.append(rel)
+        text = fill_facts(path.read_text(encoding="utf-8"), self.view)
+
+        def rewrite(match):
+            attribute, link = match.groups()
+            source = self.resolve(path, html.unescape(link))
+            if source is None:
+                return match.group(0)
+            if source.suffix == ".html":
+                self.page(source)
+                return match.group(0)
+            fragment = link[len(link.split("#")[0]):]
+            return f'{attribute}="{self.href(path, self.asset(source))}{fragment}"'
+
+        text = self.inline_stylesheet(path, LINK_ATTRIBUTE.sub(rewrite, text))
+        self.write(rel, minify_html(text).encode())
+
+    def write(self, rel, data):
+        self.written.add(rel)
+        target = self.out_dir / rel
+        # A hashed name from an earlier build already holds these bytes
+        if rel in self.assets.values() and target.exists():
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+
+    def prune(self):
+        """Remove files of earlier builds that this build did not produce."""
+        keep = {self.out_dir / rel for rel in self.written}
+        keep |= {path.with_name(path.name + suffix) for path in keep for suffix in COMPRESSED_SUFFIXES}
+        for path in sorted(self.out_dir.rglob("*"), reverse=True):
+            if path.is_file() and path not in keep:
+                path.unlink()
+            elif path.is_dir() and not any(path.iterdir()):
+                path.rmdir()
+
+    def headers(self):
+        """Cache-Control rules in the _headers format read by Netlify and Cloudflare Pages."""
+        lines = []
+        for rel in self.pages:
+            lines += [f"/{quote(rel.as_posix())}", f"  Cache-Control: {PAGE_CACHE}"]
+        for rel in sorted(self.assets.values()):
+            lines += [f"/{quote(rel.as_posix())}", f"  Cache-Control: {IMMUTABLE_CACHE}"]
+        return "\n".join(lines) + "\n"
+
+
+def precompress(site):
+    """Write .gz and .br next to every file when smaller; (raw, gzip, brotli) byte totals as served.
+
+    Variants of hashed assets are kept from earlier builds: the name pins the content, and
+    brotli at its highest quality takes seconds on the plotly bundle.
+    """
+    try:
+        import brotli
+    except ImportError as exc:
+        raise BuildError("brotli is not installed (pip install -r requirements.txt)") from exc
+    compressors = {
+        ".gz": lambda data: gzip.compress(data, compresslevel=9, mtime=0),
+        ".br": lambda data: brotli.compress(data, quality=11),
+    }
+    immutable = set(site.assets.values())
+    totals = dict.fromkeys(("raw", *COMPRESSED_SUFFIXES), 0)
+    for rel in sorted(site.written):
+        path = site.out_dir / rel
+        data = path.read_bytes()
+        totals["raw"] += len(data)
+        for suffix in COMPRESSED_SUFFIXES:
+            variant = path.with_name(path.name + suffix)
+            if rel in immutable and variant.exists():
+                size = variant.stat().st_size
+            else:
+                compressed = compressors[suffix](data)
+                size = min(len(compressed), len(data))
+                if len(compressed) < len(data):
+                    variant.write_bytes(compressed)
+                else:
+                    # A variant of an earlier build would be served against the new content
+                    variant.unlink(missing_ok=True)
+            totals[suffix] += size
+    return totals["raw"], totals[".gz"], totals[".br"]
+
+
+def build(out_dir=SITE_DIR, fiscal_year=None, snapshots=True):
+    started = time.perf_counter()
+    from snapshot import export, write_bundle
+
+    if snapshots:
+        # Charts come from the same datasets as the facts
+        export(fiscal_year=fiscal_year)
+    else:
+        write_bundle()
+    site = SiteBuild(out_dir, load_view(load_datasets(), fiscal_year))
+
+    site.page(SITE_INDEX)
+    site.write(Path("_headers"), site.headers().encode())
+    manifest = {src.relative_to(REPO_ROOT).as_posix(): out.as_posix() for src, out in site.assets.items()}
+    site.write(Path("manifest.json"), json.dumps(manifest, indent=2, sort_keys=True).encode())
+    raw, gz, br = precompress(site)
+    site.prune()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Built {len(site.pages)} pages and {len(site.assets)} assets into {out_dir} in {elapsed:.1f}s: "
+        f"{raw / 1024:,.0f} KB, {gz / 1024:,.0f} KB gzip, {br / 1024:,.0f} KB brotli"
+    )
+    for source, target in sorted(manifest.items()):
+        print(f"  {source} -> {target}")
+    return site
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the static project site with hashed, precompressed assets.")
+    parser.add_argument("--out", type=Path, default=SITE_DIR, help="output directory (default: dist/)")
+    parser.add_argument("--year", type=int, default=None, help="fiscal year of the facts (default: latest)")
+    parser.add_argument("--skip-snapshots", action="store_true", help="use snapshots/ as is instead of re-exporting")
+    args = parser.parse_args()
+    try:
+        build(args.out, args.year, snapshots=not args.skip_snapshots)
+    except BuildError as exc:
+        parser.exit(1, f"site build failed: {exc}\n")
+
+
+if __name__ == "__main__":
+    main()
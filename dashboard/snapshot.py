@@ -0,0 +1,137 @@
+"""
+Headless export of the dashboard charts to static HTML fragments under snapshots/.
+
+Usage:
+    python dashboard/snapshot.py [--year 2024] [--pages overview risk] [--workers N]
+"""
+
+import argparse
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import plotly.io as pio
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+from figures import get_figure
+from ingest import atomic_write
+from loader import load_datasets, load_view
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SNAPSHOT_DIR = REPO_ROOT / "snapshots"
+PLOTLY_BUNDLE = f"plotly-{get_plotlyjs_version()}.min.js"
+# Same pinned version, for copies of the committed preview page that lack the (uncommitted) bundle
+PLOTLY_CDN = f"https://cdn.plot.ly/{PLOTLY_BUNDLE}"
+PLOTLY_CONFIG = {"displaylogo": False, "responsive": True}
+
+# page: (section title as in screens/, figures rendered by that page)
+SNAPSHOT_PAGES = {
+    "overview": ("Overview & Executive Snapshot", ["overview_aum", "overview_etf_share"]),
+    "financials": (
+        "Financial Performance",
+        ["financials_revenue", "financials_margin", "financials_roe_roa", "financials_net_income"],
+    ),
+    "product_mix": ("Product & AUM Mix", ["product_mix_stack"]),
+    "risk": ("Risk & Regulatory Profile", ["risk_heatmap"]),
+}
+
+
+def render_fragment(page, fiscal_year=None):
+    """HTML fragment with every chart of a page, built by the same code as the dashboard."""
+    view = load_view(load_datasets(), fiscal_year)
+    title, names = SNAPSHOT_PAGES[page]
+    # Node versions hash the figures' input data, so unchanged content keeps its version
+    version = hashlib.sha1("".join(view.node_version(name) for name in names).encode()).hexdigest()[:16]
+    charts = [
+        pio.to_html(
+            get_figure(name, view),
+            full_html=False,
+            include_plotlyjs=False,
+            div_id=f"snapshot-{name}",
+            config=PLOTLY_CONFIG,
+        )
+        for name in names
+    ]
+    body = "\n".join(f'  <div class="snapshot-chart">{chart}</div>' for chart in charts)
+    return page, (
+        f"<!-- Generated by dashboard/snapshot.py, needs {PLOTLY_BUNDLE} loaded once on the page -->\n"
+        f'<section class="snapshot" id="snapshot-{page}" data-version="{version}">\n'
+        f"  <h2>{title}</h2>\n{body}\n</section>\n"
+    )
+
+
+def write_if_changed(path, text):
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    atomic_write(path, lambda tmp: tmp.write_text(text, encoding="utf-8"))
+    return True
+
+
+def write_bundle(out_dir=SNAPSHOT_DIR):
+    """Copy plotly.js from the installed package; it is not committed."""
+    return write_if_changed(out_dir / PLOTLY_BUNDLE, get_plotlyjs())
+
+
+def preview_page(fragments):
+    """Standalone page that loads the shared bundle once (or the pinned CDN copy) and inlines every fragment."""
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8" />
+  <title>Dashboard snapshots</title>
+  <style>body {{ background: #0e1117; color: #fafafa; font-family: sans-serif; margin: 2rem; }}</style>
+  <script src="{PLOTLY_BUNDLE}"></script>
+  <script>window.Plotly || document.write('<script src="{PLOTLY_CDN}"><\\/script>')</script>
+</head>
+<body>
+{"".join(fragments)}</body>
+</html>
+"""
+
+
+def export(out_dir=SNAPSHOT_DIR, pages=None, fiscal_year=None, workers=None):
+    pages = list(pages or SNAPSHOT_PAGES)
+    workers = min(workers or os.cpu_count() or 1, len(pages))
+    started = time.perf_counter()
+
+    if workers == 1:
+        fragments = dict(render_fragment(page, fiscal_year) for page in pages)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            fragments = dict(pool.map(render_fragment, pages, [fiscal_year] * len(pages)))
+
+    written = [PLOTLY_BUNDLE] if write_bundle(out_dir) else []
+    for page in pages:
+        if write_if_changed(out_dir / f"{page}.html", fragments[page]):
+            written.append(f"{page}.html")
+    # Pages not exported this time keep their last export in the preview
+    previews = [
+        fragments[page] if page in fragments else (out_dir / f"{page}.html").read_text(encoding="utf-8")
+        for page in SNAPSHOT_PAGES
+        if page in fragments or (out_dir / f"{page}.html").exists()
+    ]
+    if write_if_changed(out_dir / "index.html", preview_page(previews)):
+        written.append("index.html")
+
+    elapsed = time.perf_counter() - started
+    print(f"Exported {len(pages)} pages to {out_dir} in {elapsed:.1f}s with {workers} workers")
+    for name in written:
+        print(f"+ {name}")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the dashboard charts as static HTML fragments.")
+    parser.add_argument("--out", type=Path, default=SNAPSHOT_DIR, help="output directory (default: snapshots/)")
+    parser.add_argument("--year", type=int, default=None, help="fiscal year (default: latest)")
+    parser.add_argument("--pages", nargs="+", choices=list(SNAPSHOT_PAGES), help="pages to export (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: all cores)")
+    args = parser.parse_args()
+    export(args.out, args.pages, args.year, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Server-side paginated tables over firm-years, backed by Arrow.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+import depgraph
+from sharedcache import cached
+
+
+PAGE_SIZES = (25, 50, 100, 250)
+DEFAULT_PAGE_SIZE = 50
+
+# name: {column: (fact store, metric, divisor)}
+TABLES = {
+    "product_mix_table": {
+        "Equity_Tn": ("facts", "aum_equity", 1e6),
+        "Fixed_Income_Tn": ("facts", "aum_fixed_income", 1e6),
+        "Multi_Asset_Tn": ("facts", "aum_multi_asset", 1e6),
+        "Cash_Tn": ("facts", "aum_cash", 1e6),
+        "Alternatives_Tn": ("facts", "aum_alternatives", 1e6),
+    },
+    "ratios_table": {
+        "Op_Margin_%": ("derived", "op_margin_pct", 1),
+        "ROE_%": ("derived", "roe_pct", 1),
+        "ROA_%": ("derived", "roa_pct", 1),
+        "Fee_Yield_bps": ("derived", "fee_yield_bps", 1),
+        "Revenue_Growth_%": ("derived", "revenue_growth_pct", 1),
+        "Net_Income_Growth_%": ("derived", "net_income_growth_pct", 1),
+    },
+}
+
+for _name, _columns in TABLES.items():
+    depgraph.add_node(_name, [f"{table}:{metric}" for table, metric, _ in _columns.values()], all_years=True)
+
+
+@dataclass(frozen=True)
+class TableQuery:
+    # Case-insensitive substring of the company name
+    search: str = ""
+    # None for every fiscal year
+    year: int = None
+    sort_by: str = "Company"
+    descending: bool = False
+
+
+# ----------------------------------------------------
+# BUILD
+# ----------------------------------------------------
+def firm_year_table(stores, columns, companies=None):
+    """Arrow table of Company, Fiscal_Year and the given columns; firm-years without any value are dropped."""
+    facts = stores["facts"]
+    # Store codes follow the sorted company axis, so the dictionary is sorted too
+    codes = np.sort(facts.company_codes(companies))
+    n_years = len(facts.years)
+    data = {}
+    for column, (store_name, metric, divisor) in columns.items():
+        store = stores[store_name]
+        if metric in store.metric_index:
+            block = store.values[codes, :, store.metric_index.get_loc(metric)]
+            data[column] = (block / divisor).ravel()
+        else:
+            data[column] = np.full(len(codes) * n_years, np.nan)
+
+    present = np.zeros(len(codes) * n_years, dtype=bool)
+    for values in data.values():
+        present |= ~np.isnan(values)
+    rows = np.flatnonzero(present)
+
+    company = pa.DictionaryArray.from_arrays(
+        pa.array((rows // n_years).astype(np.int32)), pa.array(facts.companies[codes].tolist(), pa.string())
+    )
+    year = pa.array(facts.years[rows % n_years])
+    # NaN becomes null, so sorts put missing values last
+    arrays = [pa.array(values[rows], from_pandas=True) for values in data.values()]
+    return pa.Table.from_arrays([company, year, *arrays], names=["Company", "Fiscal_Year", *data])
+
+
+def view_table(view, name):
+    """Table of a view's firms over every fiscal year, rebuilt only when its sources change."""
+    stores = {"facts": view.data.store, "derived": view.data.derived}
+    return cached(
+        "tables",
+        (name, view.node_version(name)),
+        lambda: firm_year_table(stores, TABLES[name], view.companies),
+    )
+
+
+# ----------------------------------------------------
+# QUERY
+# ----------------------------------------------------
+def _sort_key(column):
+    # The Company dictionary is sorted, so names sort by their indices without decoding
+    return column.indices if pa.types.is_dictionary(column.type) else column
+
+
+def _row_order(table, query):
+    # Kernels on zero-chunk columns crash the process (empty firm selection)
+    if table.num_rows == 0:
+        return pa.array([], pa.int64()).to_numpy()
+    column = table.column("Company").combine_chunks()
+    mask = None
+    if query.search:
+        # Match the distinct names once, then map to rows through the dictionary indices
+        names = pc.match_substring(column.dictionary, query.search, ignore_case=True)
+        mask = pc.take(names, column.indices)
+    if query.year is not None:
+        in_year = pc.equal(table.column("Fiscal_Year").combine_chunks(), query.year)
+        mask = in_year if mask is None else pc.and_(mask, in_year)
+    rows = pc.indices_nonzero(mask) if mask is not None else pa.array(np.arange(len(table)))
+
+    key = _sort_key(pc.take(table.column(query.sort_by).combine_chunks(), rows))
+    direction = "descending" if query.descending else "ascending"
+    order = pc.array_sort_indices(key, order=direction, null_placement="at_end")
+    return pc.take(rows, order).to_numpy()
+
+
+def row_order(name, table, table_version, query):
+    """Positions of the rows matching a query, in sort order; cached per table version and query."""
+    return cached("table_queries", (name, table_version, query), lambda: _row_order(table, query))
+
+
+def page_rows(table, order, page, page_size):
+    """One page of rows as a small pandas frame, the only part of the table that is serialized."""
+    window = table.take(pa.array(order[page * page_size:(page + 1) * page_size]))
+    # Decode only this page's names rather than the whole dictionary
+    company = window.column("Company").combine_chunks()
+    window = window.set_column(0, "Company", pc.take(company.dictionary, company.indices))
+    return window.to_pandas()
+
+
+def page_count(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
@@ -0,0 +1,193 @@
+"""
+TF-IDF term index and k-means themes over the SWOT, business model and technology notes.
+"""
+
+import hashlib
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from clustering import kmeans
+from sharedcache import cached
+
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.'’][a-z0-9]+)*")
+STOPWORDS = frozenset(
+    """
+    a an and are as at be by for from in into is it its of on or the to vs via with
+    more less than over under across e.g incl like other others each
+    """.split()
+)
+# Features used for clustering: the most widespread terms, to bound the dense matrix
+MAX_FEATURES = 1024
+MAX_THEMES = 40
+LABEL_TERMS = 3
+# "private market" reads better than "private" and "market"
+BIGRAM_LABEL_BOOST = 1.5
+
+SWOT_SECTIONS = ("Strengths", "Weaknesses", "Opportunities", "Threats")
+
+
+def _stem(token):
+    # Light plural folding: "markets" and "market" are one term
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    return [_stem(t) for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def terms_of(tokens):
+    """Unigrams plus adjacent bigrams of a token list."""
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+def collect_bullets(swot_data, business_models, tech_profiles):
+    """One row per note: Company, Section and Text."""
+    rows = []
+    for item in swot_data:
+        for section in SWOT_SECTIONS:
+            rows += [(item["Company"], section, text) for text in item.get(section, [])]
+    for company, model in business_models.items():
+        rows.append((company, "Business model", model["Model"]))
+        rows += [(company, "Strategic pillar", text) for text in model.get("Key_Pillars", [])]
+    for company, profile in tech_profiles.items():
+        rows.append((company, "Tech platform", f"{profile['Platform']}: {profile['Positioning']}"))
+        rows += [(company, "Tech highlight", text) for text in profile.get("Highlights", [])]
+    return pd.DataFrame(rows, columns=["Company", "Section", "Text"])
+
+
+def notes_version(*notes):
+    return hashlib.sha1(json.dumps(notes, sort_keys=True, ensure_ascii=False).encode()).hexdigest()[:12]
+
+
+@dataclass(frozen=True)
+class ThemeIndex:
+    version: str
+    bullets: pd.DataFrame
+    vocab: pd.Index
+    # Postings of term t are bullet ids posting_bullets[term_offsets[t]:term_offsets[t + 1]]
+    term_offsets: np.ndarray
+    posting_bullets: np.ndarray
+    # Theme of every bullet, and one row per theme: Theme, Label, Bullets, Firms
+    labels: np.ndarray
+    themes: pd.DataFrame
+    _companies: np.ndarray = field(repr=False, compare=False)
+
+    def __len__(self):
+        return len(self.bullets)
+
+    def _postings(self, term):
+        t = self.vocab.get_indexer([term])[0]
+        if t < 0:
+            return np.empty(0, dtype=np.int32)
+        return self.posting_bullets[self.term_offsets[t]:self.term_offsets[t + 1]]
+
+    def match(self, query):
+        """Bullet ids containing every term of the query (words in any order)."""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return np.empty(0, dtype=np.int32)
+        ids = self._postings(tokens[0])
+        for token in tokens[1:]:
+            ids = np.intersect1d(ids, self._postings(token), assume_unique=True)
+        return ids
+
+    def theme_bullets(self, theme):
+        return np.flatnonzero(self.labels == theme)
+
+    def select(self, ids, companies=None):
+        """Bullets by id, restricted to a firm set, with their theme label."""
+        ids = np.asarray(ids, dtype=np.intp)
+        if companies is not None:
+            ids = ids[np.isin(self._companies[ids], list(companies))]
+        rows = self.bullets.iloc[ids].copy()
+        rows["Theme"] = self.themes["Label"].to_numpy()[self.labels[ids]]
+        return rows.reset_index(drop=True)
+
+
+def _build_index(version, bullets):
+    docs = [terms_of(tokenize(text)) for text in bullets["Text"]]
+    df = Counter(term for doc in docs for term in set(doc))
+    vocab = pd.Index(sorted(df))
+
+    # Inverted index: bullet ids per term, in increasing order
+    postings = [[] for _ in vocab]
+    term_ids = {term: i for i, term in enumerate(vocab)}
+    for bullet, doc in enumerate(docs):
+        for term in dict.fromkeys(doc):
+            postings[term_ids[term]].append(bullet)
+    term_offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+    term_offsets[1:] = np.cumsum([len(p) for p in postings])
+    posting_bullets = np.fromiter((b for p in postings for b in p), dtype=np.int32, count=int(term_offsets[-1]))
+
+    # TF-IDF (sublinear tf, smoothed idf) over the most widespread terms, rows L2-normalized
+    features = [term for term, _ in df.most_common(MAX_FEATURES)]
+    feature_ids = {term: i for i, term in enumerate(features)}
+    n = len(docs)
+    idf = np.log((1 + n) / (1 + np.array([df[t] for t in features], dtype=float))) + 1
+    x = np.zeros((n, len(features)), dtype=np.float32)
+    for bullet, doc in enumerate(docs):
+        for term, tf in Counter(doc).items():
+            f = feature_ids.get(term)
+            if f is not None:
+                x[bullet, f] = (1 + np.log(tf)) * idf[f]
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    x = np.divide(x, norms, out=np.zeros_like(x), where=norms > 0)
+
+    if n:
+        k = int(np.clip(round(np.sqrt(n / 2)), 1, MAX_THEMES))
+        labels, centroids = kmeans(x, k)
+    else:
+        labels, centroids = np.zeros(0, dtype=np.int64), np.zeros((0, len(features)))
+
+    companies = bullets["Company"].to_numpy()
+    themes = []
+    for theme, centroid in enumerate(centroids):
+        members = labels == theme
+        themes.append(
+            {
+                "Theme": theme,
+                "Label": _theme_label(centroid, features),
+                "Bullets": int(members.sum()),
+                "Firms": len(set(companies[members])),
+            }
+        )
+    return ThemeIndex(
+        version=version,
+        bullets=bullets,
+        vocab=vocab,
+        term_offsets=term_offsets,
+        posting_bullets=posting_bullets,
+        labels=labels,
+        themes=pd.DataFrame(themes, columns=["Theme", "Label", "Bullets", "Firms"]),
+        _companies=companies,
+    )
+
+
+def _theme_label(centroid, features):
+    """Heaviest centroid terms, bigrams first, skipping words a chosen term already covers."""
+    weights = centroid * np.array([BIGRAM_LABEL_BOOST if " " in t else 1.0 for t in features])
+    chosen = []
+    for f in np.argsort(-weights, kind="stable"):
+        if weights[f] <= 0 or len(chosen) == LABEL_TERMS:
+            break
+        words = set(features[f].split())
+        if any(words & set(c.split()) for c in chosen):
+            continue
+        chosen.append(features[f])
+    return ", ".join(chosen) or "misc"
+
+
+def theme_index(swot_data, business_models, tech_profiles):
+    """Theme index of the notes, built once per notes version."""
+    version = notes_version(swot_data, business_models, tech_profiles)
+    return cached(
+        "themes", version, lambda: _build_index(version, collect_bullets(swot_data, business_models, tech_profiles))
+    )
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The dashboard modules import each other by their flat names, as when run from dashboard/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dashboard"))
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import clustering
+
+
+def blobs(sizes, seed=0):
+    """Rows around well-separated centers, one blob per size, shuffled; also returns each row's blob."""
+    rng = np.random.default_rng(seed)
+    labels = np.repeat(np.arange(len(sizes)), sizes)
+    x = labels[:, None] * 10.0 + rng.normal(scale=0.1, size=(len(labels), 3))
+    order = rng.permutation(len(labels))
+    return x[order], labels[order]
+
+
+def contiguous(labels):
+    """Whether every label appears as one run."""
+    runs = labels[np.r_[True, labels[1:] != labels[:-1]]]
+    return len(runs) == len(set(labels))
+
+
+@pytest.mark.parametrize("order", [clustering.linkage_order, clustering.principal_order])
+def test_orders_keep_clusters_together(order):
+    x, labels = blobs([5, 7, 4])
+    rows = order(x)
+    assert sorted(rows) == list(range(len(x)))
+    assert contiguous(labels[rows])
+
+
+def test_linkage_order_small_inputs():
+    assert list(clustering.linkage_order(np.zeros((0, 2)))) == []
+    assert list(clustering.linkage_order(np.zeros((2, 2)))) == [0, 1]
+
+
+def test_kmeans_groups_by_size():
+    x, labels = blobs([30, 10, 20])
+    groups, centroids = clustering.kmeans(x, 3)
+    # Groups are numbered largest first
+    assert list(np.bincount(groups)) == [30, 20, 10]
+    assert centroids.shape == (3, 3)
+    for group in range(3):
+        assert len(set(labels[groups == group])) == 1
+    np.testing.assert_array_equal(groups, clustering.kmeans(x, 3)[0])
+
+
+def test_kmeans_drops_empty_groups():
+    groups, centroids = clustering.kmeans(np.ones((6, 2)), 4)
+    assert set(groups) == {0}
+    assert len(centroids) == 1
+
+
+@pytest.mark.filterwarnings("ignore:Mean of empty slice")
+def test_filled_values_use_column_means():
+    matrix = pd.DataFrame({"a": [1.0, np.nan, 3.0], "b": [np.nan, np.nan, np.nan]})
+    np.testing.assert_array_equal(clustering.filled_values(matrix), [[1, 0], [2, 0], [3, 0]])
+
+
+def test_matrix_version_follows_content():
+    matrix = pd.DataFrame({"a": [1.0, 2.0]}, index=["x", "y"])
+    assert clustering.matrix_version(matrix) == clustering.matrix_version(matrix.copy())
+    assert clustering.matrix_version(matrix) != clustering.matrix_version(matrix + 1)
+    assert clustering.matrix_version(matrix) != clustering.matrix_version(matrix.rename(columns={"a": "b"}))
+
+
+def test_small_matrix_is_shown_row_by_row():
+    x, _ = blobs([3, 3])
+    layout = clustering.heatmap_layout(pd.DataFrame(x))
+    assert not layout.aggregated
+    assert sorted(layout.row_order) == list(range(6))
+    assert sorted(layout.col_order) == [0, 1, 2]
+
+
+def test_large_matrix_is_aggregated_into_peer_groups(monkeypatch):
+    monkeypatch.setattr(clustering, "HEATMAP_MAX_ROWS", 10)
+    monkeypatch.setattr(clustering, "PEER_GROUPS", 3)
+    x, labels = blobs([12, 8, 5], seed=1)
+    matrix = pd.DataFrame(x)
+    layout = clustering.heatmap_layout(matrix)
+    assert layout.aggregated
+    assert list(layout.group_sizes) == [12, 8, 5]
+    assert sorted(layout.group_order) == [0, 1, 2]
+
+    values = clustering.filled_values(matrix)
+    members = [layout.members(group, values) for group in range(3)]
+    assert sorted(np.concatenate(members)) == list(range(25))
+    assert all(len(set(labels[rows])) == 1 for rows in members)
+    # Member orders are built once and shared
+    assert layout.members(0, values) is members[0]
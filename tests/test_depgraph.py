@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import depgraph
+from factstore import FactStore
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    """An empty dependency graph for the test, the modules' own nodes are left alone."""
+    monkeypatch.setattr(depgraph, "GRAPH", {})
+    monkeypatch.setattr(depgraph, "ALL_YEARS", set())
+    monkeypatch.setattr(depgraph, "_sources", {})
+    depgraph.add_node("derived:margin", ["facts:income", "facts:revenue"])
+    depgraph.add_node("summary", ["derived:margin", "company_info:Model"])
+    depgraph.add_node("chart", ["summary"])
+    depgraph.add_node("risk_chart", ["risk_scores"])
+    return depgraph.GRAPH
+
+
+def test_sources_stop_at_source_tables(graph):
+    assert depgraph.sources("facts:revenue") == ("facts:revenue",)
+    # Derived metrics are a fact store of their own, versioned by content
+    assert depgraph.sources("chart") == ("company_info:Model", "derived:margin")
+
+
+def test_unknown_node_raises(graph):
+    with pytest.raises(KeyError):
+        depgraph.sources("missing")
+
+
+def test_inputs_may_be_declared_later(graph):
+    depgraph.add_node("late", ["later"])
+    with pytest.raises(KeyError):
+        depgraph.sources("late")
+    depgraph.add_node("later", ["facts:revenue"])
+    assert depgraph.sources("late") == ("facts:revenue",)
+
+
+def test_downstream(graph):
+    assert depgraph.downstream({"facts:income"}) == {"derived:margin", "summary", "chart"}
+    assert depgraph.downstream({"company_info:Model"}) == {"summary", "chart"}
+    # A changed column also changes nodes reading its whole table
+    assert depgraph.downstream({"risk_scores:Liquidity"}) == {"risk_chart"}
+
+
+def test_changed_rows_is_nan_aware():
+    old = np.array([[1.0, np.nan], [2.0, 3.0], [np.nan, np.nan]])
+    new = np.array([[1.0, np.nan], [2.0, 4.0], [np.nan, 5.0]])
+    np.testing.assert_array_equal(depgraph.changed_rows(old, new), [1, 2])
+
+
+def make_fingerprints(revenue, model="Active"):
+    companies = ["A", "B"]
+    store = FactStore.from_arrays(companies, [2023], ["income", "revenue"], np.array([[[1.0, revenue]], [[2.0, 20.0]]]))
+    info = pd.DataFrame({"Model": [model, "Passive"]}, index=pd.Index(companies, name="Company"))
+    return depgraph.Fingerprints({"facts": store}, {"company_info": info}, store.companies)
+
+
+def test_node_version_changes_only_with_its_sources(graph):
+    depgraph.add_node("revenue_only", ["facts:revenue"])
+    depgraph.add_node("income_only", ["facts:income"])
+    before, after = make_fingerprints(10.0), make_fingerprints(11.0)
+    codes = np.array([0, 1])
+
+    def version(node, fingerprints, codes=codes):
+        return depgraph.node_version(node, fingerprints, codes, 0, "2023:all")
+
+    assert version("revenue_only", before) != version("revenue_only", after)
+    assert version("income_only", before) == version("income_only", after)
+    # Firm B did not change
+    assert version("revenue_only", before, np.array([1])) == version("revenue_only", after, np.array([1]))
+
+
+def test_fingerprint_changes(graph):
+    changes = make_fingerprints(11.0, model="Passive").changes(make_fingerprints(10.0))
+    assert set(changes) == {"facts:revenue", "company_info:Model"}
+    np.testing.assert_array_equal(changes["facts:revenue"], [0])
+    np.testing.assert_array_equal(changes["company_info:Model"], [0])
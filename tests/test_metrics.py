@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from factstore import FactStore
+from metrics import GROWTH_METRICS, RATIO_METRICS, derive_metrics, update_metrics
+
+
+def make_store(values, years=(2022, 2023), metrics=("net_income", "equity", "revenue")):
+    companies = [f"Firm {i}" for i in range(len(values))]
+    return FactStore.from_arrays(companies, list(years), list(metrics), np.asarray(values, dtype=float))
+
+
+def derived_value(derived, company, year, metric):
+    return derived.values[company, list(derived.years).index(year), derived.metric_index.get_loc(metric)]
+
+
+def test_ratio_is_scaled_quotient():
+    store = make_store([[[10, 100, 50], [20, 100, 80]]])
+    derived = derive_metrics(store)
+    assert derived_value(derived, 0, 2022, "roe_pct") == pytest.approx(10.0)
+    assert derived_value(derived, 0, 2023, "roe_pct") == pytest.approx(20.0)
+    assert list(derived.metrics) == list(RATIO_METRICS) + list(GROWTH_METRICS)
+
+
+def test_zero_denominator_and_missing_inputs_give_nan():
+    store = make_store([[[10, 0, 50], [np.nan, 100, 80]]])
+    derived = derive_metrics(store)
+    assert np.isnan(derived_value(derived, 0, 2022, "roe_pct"))
+    assert np.isnan(derived_value(derived, 0, 2023, "roe_pct"))
+    # aum_total is not in the store at all
+    assert np.isnan(derived.values[:, :, derived.metric_index.get_loc("etf_share_pct")]).all()
+
+
+def test_growth_between_adjacent_years():
+    store = make_store([[[10, 1, 50], [15, 1, 40]]])
+    derived = derive_metrics(store)
+    assert np.isnan(derived_value(derived, 0, 2022, "revenue_growth_pct"))
+    assert derived_value(derived, 0, 2023, "revenue_growth_pct") == pytest.approx(-20.0)
+    assert derived_value(derived, 0, 2023, "net_income_growth_pct") == pytest.approx(50.0)
+
+
+def test_growth_from_a_loss_keeps_its_sign():
+    store = make_store([[[-10, 1, 1], [5, 1, 1]]])
+    derived = derive_metrics(store)
+    # From -10 to 5 is an improvement of 150% of the size of the loss
+    assert derived_value(derived, 0, 2023, "net_income_growth_pct") == pytest.approx(150.0)
+
+
+def test_no_growth_across_a_gap_year():
+    store = make_store([[[10, 1, 50], [15, 1, 60]]], years=(2021, 2023))
+    derived = derive_metrics(store)
+    assert np.isnan(derived_value(derived, 0, 2023, "revenue_growth_pct"))
+
+
+def test_update_metrics_matches_full_derivation():
+    rng = np.random.default_rng(0)
+    values = rng.uniform(1, 100, size=(5, 3, 3))
+    old = make_store(values, years=(2021, 2022, 2023))
+    values = values.copy()
+    values[[1, 3]] *= 2
+    new = make_store(values, years=(2021, 2022, 2023))
+
+    updated = update_metrics(derive_metrics(old), new, np.array([1, 3]))
+    np.testing.assert_array_equal(updated.values, derive_metrics(new).values)
@@ -0,0 +1,59 @@
+import pytest
+
+import ingest
+import search
+
+PAGES = {
+    "alpha.pdf": ["Net revenue grew on higher base fees.", "Operating margin was 38.5% in 2024."],
+    "beta.pdf": ["Revenue fell; fees were lower.", "Technology services revenue ($ 1,200) rose."],
+}
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    filings = [
+        {"file": f"raw/{name}", "company": name.split(".")[0].title(), "fiscal_year": 2024} for name in PAGES
+    ]
+    monkeypatch.setattr(ingest, "load_manifest", lambda: {"filings": filings})
+    monkeypatch.setattr(ingest, "file_sha256", lambda path: path.name)
+    monkeypatch.setattr(ingest, "load_page_texts", lambda path, sha: PAGES[path.name])
+    search.build_index(tmp_path)
+    return search.SearchIndex(tmp_path)
+
+
+def test_tokenize_keeps_numbers_whole():
+    assert search.tokenize("Revenue of $1,200.5 (U.S.) grew 38.5%") == ["revenue", "of", "1,200.5", "u.s", "grew", "38.5"]
+
+
+def test_index_covers_every_page(index):
+    assert len(index) == 4
+    assert index.find_doc("beta.pdf", 2) == 3
+    assert index.page_text(1) == PAGES["alpha.pdf"][1]
+
+
+def test_index_files_are_replaced_without_leftovers(tmp_path, index):
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith(".tmp")]
+
+
+def test_search_ranks_and_filters(index):
+    hits = index.search("revenue")
+    assert {(h.source, h.page) for h in hits} == {("alpha.pdf", 1), ("beta.pdf", 1), ("beta.pdf", 2)}
+    assert hits == sorted(hits, key=lambda h: -h.score)
+    assert [h.company for h in index.search("revenue", companies=["Alpha"])] == ["Alpha"]
+    assert index.search("dividends") == []
+    assert index.search("   ") == []
+
+
+def test_search_limits_results(index):
+    assert len(index.search("revenue", k=2)) == 2
+
+
+def test_phrase_requires_consecutive_terms(index):
+    assert [(h.source, h.page) for h in index.search('"base fees"')] == [("alpha.pdf", 1)]
+    assert index.search('"fees base"') == []
+
+
+def test_snippet_highlights_and_escapes_markdown(index):
+    [hit] = index.search('"technology services"')
+    assert "**Technology services**" in hit.snippet
+    assert r"\$ 1,200" in hit.snippet
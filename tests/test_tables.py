@@ -0,0 +1,81 @@
+from itertools import count
+
+import numpy as np
+import pytest
+
+from factstore import FactStore
+from tables import TableQuery, firm_year_table, page_count, page_rows, row_order
+
+COLUMNS = {
+    "Revenue_Bn": ("facts", "revenue", 1e3),
+    "Margin_%": ("derived", "margin_pct", 1),
+    "Absent": ("facts", "not_in_store", 1),
+}
+
+
+@pytest.fixture
+def stores():
+    companies = ["Alpha", "Beta", "Gamma"]
+    years = [2022, 2023]
+    revenue = np.array([[[1000.0], [2000.0]], [[np.nan], [500.0]], [[np.nan], [np.nan]]])
+    margin = np.array([[[10.0], [12.0]], [[np.nan], [30.0]], [[np.nan], [np.nan]]])
+    return {
+        "facts": FactStore.from_arrays(companies, years, ["revenue"], revenue),
+        "derived": FactStore.from_arrays(companies, years, ["margin_pct"], margin),
+    }
+
+
+@pytest.fixture
+def table(stores):
+    return firm_year_table(stores, COLUMNS)
+
+
+def test_firm_year_table_drops_empty_firm_years(table):
+    frame = table.to_pandas()
+    assert list(zip(frame["Company"], frame["Fiscal_Year"])) == [("Alpha", 2022), ("Alpha", 2023), ("Beta", 2023)]
+    assert list(frame["Revenue_Bn"]) == [1.0, 2.0, 0.5]
+    assert frame["Absent"].isna().all()
+
+
+def test_firm_year_table_restricts_companies(stores):
+    frame = firm_year_table(stores, COLUMNS, companies=["Beta", "Unknown"]).to_pandas()
+    assert list(frame["Company"]) == ["Beta"]
+
+
+# Query results are cached per table version, every call here reads a table of its own
+_versions = count()
+
+
+def order(table, **query):
+    return list(row_order("test_table", table, next(_versions), TableQuery(**query)))
+
+
+def test_row_order_sorts_with_nulls_last(table):
+    assert order(table, sort_by="Margin_%", descending=True) == [2, 1, 0]
+    assert order(table, sort_by="Absent") == [0, 1, 2]
+    assert order(table, sort_by="Company", descending=True) == [2, 0, 1]
+
+
+def test_row_order_filters(table):
+    assert order(table, search="BET") == [2]
+    assert order(table, year=2023) == [1, 2]
+    assert order(table, search="alpha", year=2022) == [0]
+    assert order(table, search="zeta") == []
+
+
+def test_row_order_of_empty_table(stores):
+    empty = firm_year_table(stores, COLUMNS, companies=[])
+    assert empty.num_rows == 0
+    assert order(empty, search="a", sort_by="Revenue_Bn") == []
+
+
+def test_page_rows(table):
+    rows = order(table, sort_by="Revenue_Bn", descending=True)
+    page = page_rows(table, np.asarray(rows), 1, 2)
+    assert list(page["Company"]) == ["Beta"]
+    assert list(page.columns[:2]) == ["Company", "Fiscal_Year"]
+
+
+@pytest.mark.parametrize("n_rows, expected", [(0, 1), (1, 1), (50, 1), (51, 2), (250, 5)])
+def test_page_count(n_rows, expected):
+    assert page_count(n_rows, 50) == expected